@@ -1,23 +1,42 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
 import time
 from datetime import datetime
 
-def analyze_api_health(response_info: Dict[str, Any]) -> Dict[str, Any]:
+from header_rules import normalize_headers
+from response_model import ResponseResult
+
+# Response time thresholds (ms) shared by single-response and load-run health checks
+RESPONSE_TIME_GOOD_MS = 1000
+RESPONSE_TIME_WARNING_MS = 3000
+LARGE_RESPONSE_BYTES = 1024 * 1024
+
+@dataclass
+class LatencySLO:
+    """Service level objective applied to aggregated load-run statistics."""
+    percentile: float = 99
+    max_latency_ms: float = RESPONSE_TIME_GOOD_MS
+    max_error_rate: float = 0.001
+    min_throughput_ratio: float = 0.95   # Achieved vs. offered rate for a step to count as sustained
+
+def _response_time_status(total_time: float) -> str:
+    return 'good' if total_time < RESPONSE_TIME_GOOD_MS else 'warning' if total_time < RESPONSE_TIME_WARNING_MS else 'poor'
+
+def analyze_api_health(response_info: ResponseResult) -> Dict[str, Any]:
     """
     Analyze API health based on response metrics and provide recommendations.
     """
-    timing = response_info['metadata']['timing']
-    total_time = float(timing['total_time'].replace('ms', ''))
+    total_time = response_info.total_ms
     
     health_metrics = {
         'performance': {
-            'status': 'good' if total_time < 1000 else 'warning' if total_time < 3000 else 'poor',
+            'status': _response_time_status(total_time),
             'message': f"Response time is {total_time:.2f}ms",
             'recommendations': []
         },
         'reliability': {
-            'status': 'good' if 200 <= response_info['status_code'] < 300 else 'warning' if response_info['status_code'] < 500 else 'poor',
-            'message': f"Status code: {response_info['status_code']}",
+            'status': 'good' if 200 <= response_info.status_code < 300 else 'warning' if response_info.status_code < 500 else 'poor',
+            'message': f"Status code: {response_info.status_code}",
             'recommendations': []
         },
         'security': {
@@ -33,7 +52,7 @@ def analyze_api_health(response_info: Dict[str, Any]) -> Dict[str, Any]:
     }
     
     # Performance Analysis
-    if total_time > 1000:
+    if total_time > RESPONSE_TIME_GOOD_MS:
         health_metrics['performance']['recommendations'].extend([
             "Consider implementing caching mechanisms",
             "Optimize database queries if applicable",
@@ -41,7 +60,7 @@ def analyze_api_health(response_info: Dict[str, Any]) -> Dict[str, Any]:
         ])
     
     # Reliability Analysis
-    if response_info['status_code'] >= 400:
+    if response_info.status_code >= 400:
         health_metrics['reliability']['recommendations'].extend([
             "Implement proper error handling",
             "Add retry mechanisms for failed requests",
@@ -49,7 +68,7 @@ def analyze_api_health(response_info: Dict[str, Any]) -> Dict[str, Any]:
         ])
     
     # Security Analysis
-    security = response_info['metadata']['security_analysis']
+    security = response_info.security_analysis
     missing_headers = [header for header, info in security.items() if not info['present']]
     
     health_metrics['security']['status'] = 'good' if len(missing_headers) == 0 else 'warning' if len(missing_headers) <= 2 else 'poor'
@@ -63,16 +82,16 @@ def analyze_api_health(response_info: Dict[str, Any]) -> Dict[str, Any]:
     best_practices_issues = []
     
     # Check content type
-    if 'content-type' not in response_info['headers']:
+    response_headers = normalize_headers(response_info.headers)
+    if 'content-type' not in response_headers:
         best_practices_issues.append("Specify Content-Type header")
     
     # Check cache control
-    if 'cache-control' not in response_info['headers']:
+    if 'cache-control' not in response_headers:
         best_practices_issues.append("Add Cache-Control header for better caching")
     
     # Check response size
-    response_size = response_info['metadata']['size']
-    if 'MB' in response_size and float(response_size.split()[0]) > 1:
+    if response_info.size_bytes > LARGE_RESPONSE_BYTES:
         best_practices_issues.append("Large response size - consider pagination or data filtering")
     
     health_metrics['best_practices']['status'] = 'good' if len(best_practices_issues) == 0 else 'warning'
@@ -81,27 +100,90 @@ def analyze_api_health(response_info: Dict[str, Any]) -> Dict[str, Any]:
     
     return health_metrics
 
-def get_optimization_suggestions(request_info: Dict[str, Any], response_info: Dict[str, Any]) -> List[str]:
+def get_optimization_suggestions(request_info: Dict[str, Any], response_info: ResponseResult) -> List[str]:
     """
     Generate optimization suggestions based on request and response analysis.
     """
     suggestions = []
     
     # Analyze request headers
-    if 'Accept-Encoding' not in request_info['headers']:
+    request_headers = normalize_headers(request_info['headers'])
+    if 'accept-encoding' not in request_headers:
         suggestions.append("Add 'Accept-Encoding' header to enable compression")
     
-    if 'If-None-Match' not in request_info['headers'] and 'etag' in response_info['headers']:
+    if 'if-none-match' not in request_headers and 'etag' in normalize_headers(response_info.headers):
         suggestions.append("Implement ETag-based caching to reduce bandwidth")
     
     # Analyze response
-    if response_info['metadata']['redirect_count'] > 0:
+    if response_info.redirect_count > 0:
         suggestions.append("Multiple redirects detected - consider using direct URLs")
     
     # Analyze timing
-    timing = response_info['metadata']['timing']
-    request_time = float(timing['request_time'].replace('ms', ''))
+    request_time = response_info.timing.ms('request_time')
     if request_time > 500:
         suggestions.append("High request time - consider implementing request caching or CDN")
     
     return suggestions
+
+def analyze_run_health(summary: Dict[str, Any], slo: LatencySLO,
+                       offered_rate: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Apply the response-time thresholds and an SLO to an aggregated load-run summary
+    (LoadStats.summary()) instead of a single response.
+    Open-loop runs are judged on their coordinated-omission corrected latency.
+    """
+    latency = summary.get('corrected_latency_ms') or summary['latency_ms']
+    percentile_key = f"p{slo.percentile:g}"
+    if percentile_key not in latency:
+        raise ValueError(f"Percentile {slo.percentile} is not reported by the run summary")
+    observed = latency[percentile_key]
+    error_rate = summary['error_rate']
+    throughput_ok = (
+        offered_rate is None
+        or summary['throughput_rps'] >= offered_rate * slo.min_throughput_ratio
+    )
+
+    health_metrics = {
+        'performance': {
+            'status': 'good' if observed <= slo.max_latency_ms else 'warning' if observed < RESPONSE_TIME_WARNING_MS else 'poor',
+            'message': f"{percentile_key} latency is {observed:.2f}ms (SLO {slo.max_latency_ms:g}ms)",
+            'recommendations': []
+        },
+        'reliability': {
+            'status': 'good' if error_rate <= slo.max_error_rate else 'poor',
+            'message': f"Error rate is {error_rate * 100:.3f}% (SLO {slo.max_error_rate * 100:g}%)" + (
+                f", including {summary['dropped']} dropped sends" if summary.get('dropped') else ""
+            ),
+            'recommendations': []
+        },
+        'throughput': {
+            'status': 'good' if throughput_ok else 'poor',
+            'message': f"Achieved {summary['throughput_rps']:.1f} req/s" + (
+                f" of {offered_rate:g} req/s offered" if offered_rate is not None else ""
+            ),
+            'recommendations': []
+        }
+    }
+
+    if observed > slo.max_latency_ms:
+        health_metrics['performance']['recommendations'].append(
+            "Tail latency exceeds the SLO - check for queueing, slow dependencies or GC pauses"
+        )
+    if error_rate > slo.max_error_rate:
+        health_metrics['reliability']['recommendations'].append(
+            "Errors exceed the SLO - inspect status codes and connection failures at this load"
+        )
+    if summary.get('dropped'):
+        health_metrics['reliability']['recommendations'].append(
+            f"{summary['dropped']} scheduled requests were dropped with too many in flight - "
+            "they count as errors; the target cannot absorb this rate"
+        )
+    if not throughput_ok:
+        health_metrics['throughput']['recommendations'].append(
+            "The service (or load generator) cannot keep up with the offered rate"
+        )
+
+    health_metrics['meets_slo'] = all(
+        metric['status'] == 'good' for metric in health_metrics.values()
+    )
+    return health_metrics
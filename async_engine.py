@@ -0,0 +1,58 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+from connection_pool import get_pool_manager
+from dns_cache import get_dns_cache
+from response_analyzer import analyze_response
+from response_model import ResponseResult
+
+DEFAULT_CONCURRENCY = 10  # Matches the default per-origin pool size
+
+async def analyze_response_async(request_data: dict, environment: str = "default",
+                                 executor: Optional[Executor] = None, **kwargs) -> ResponseResult:
+    """
+    Awaitable version of analyze_response. The blocking transfer runs on a worker thread
+    so the pooled connections, timing engine and DNS cache behave exactly as in the sync
+    path and the result has the same structure.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(analyze_response, request_data, environment, **kwargs)
+    )
+
+async def analyze_many(requests_data: Iterable[dict], concurrency: int = DEFAULT_CONCURRENCY,
+                       environment: str = "default", return_exceptions: bool = True,
+                       warm_dns: bool = True,
+                       **kwargs) -> List[Union[ResponseResult, BaseException]]:
+    """
+    Analyze many requests with at most ``concurrency`` in flight.
+    Results come back in input order; failures are returned as exception objects unless
+    ``return_exceptions`` is False.
+    """
+    requests_data = list(requests_data)
+    if not requests_data:
+        return []
+    loop = asyncio.get_running_loop()
+    with get_pool_manager().reserve_capacity(concurrency), \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="curlman-http") as executor:
+        if warm_dns:
+            await loop.run_in_executor(
+                executor, get_dns_cache().warm, [r["url"] for r in requests_data]
+            )
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run_one(request_data: dict) -> ResponseResult:
+            async with semaphore:
+                return await analyze_response_async(request_data, environment, executor, **kwargs)
+
+        return await asyncio.gather(
+            *(_run_one(r) for r in requests_data), return_exceptions=return_exceptions
+        )
+
+def run_many(requests_data: Iterable[dict],
+             **kwargs) -> List[Union[ResponseResult, BaseException]]:
+    """Synchronous entry point for analyze_many, e.g. from a Streamlit callback."""
+    return asyncio.run(analyze_many(requests_data, **kwargs))
@@ -0,0 +1,58 @@
+import argparse
+import sys
+
+import json_codec
+from curl_ingest import DEFAULT_BATCH_SIZE, ingest_file
+from load_agent import DEFAULT_AGENT_PORT, run_agent
+
+def main(argv=None) -> int:
+    """Command line entry point (``python cli.py <command>``)."""
+    parser = argparse.ArgumentParser(prog="curlman", description="API Testing Studio command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    agent = commands.add_parser("agent", help="Run a distributed load agent")
+    agent.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    agent.add_argument("--port", type=int, default=DEFAULT_AGENT_PORT, help=f"Port to listen on (default: {DEFAULT_AGENT_PORT})")
+    agent.add_argument("--token", help="Shared secret coordinators must present (required unless listening on loopback)")
+
+    ingest = commands.add_parser("ingest", help="Parse a file of curl commands into JSON lines")
+    ingest.add_argument("path", nargs="?", default="-", help="File of curl commands, or - for stdin (default: -)")
+    ingest.add_argument("--output", "-o", help="Write parsed requests here instead of stdout")
+    ingest.add_argument("--workers", type=int, help="Parser processes (default: CPU count; 1 parses in-process)")
+    ingest.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"Commands per batch (default: {DEFAULT_BATCH_SIZE})")
+
+    args = parser.parse_args(argv)
+    if args.command == "agent":
+        try:
+            run_agent(args.host, args.port, args.token)
+        except ValueError as e:
+            print(f"curlman agent: {e}", file=sys.stderr)
+            return 2
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "ingest":
+        return _ingest(args)
+    return 0
+
+def _ingest(args) -> int:
+    """Write one JSON line per parsed request; diagnostics go to stderr."""
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    parsed = failed = 0
+    try:
+        for result in ingest_file(args.path, args.workers, args.batch_size):
+            if result.ok:
+                output.write(json_codec.dumps_bytes({'line': result.line, 'request': result.request}) + b"\n")
+                parsed += 1
+            else:
+                print(f"{args.path}:{result.line}-{result.end_line}: {result.error}", file=sys.stderr)
+                failed += 1
+    finally:
+        if args.output:
+            output.close()
+        else:
+            output.flush()
+    print(f"Parsed {parsed} commands, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
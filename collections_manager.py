@@ -1,8 +1,11 @@
-import json
+import json_codec
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from async_engine import run_many, DEFAULT_CONCURRENCY
+from compiled_request import interpolate_request, interpolate_variables
+
 class Collection:
     def __init__(self, name: str, description: str = ""):
         self.name = name
@@ -30,8 +33,8 @@ class CollectionManager:
     def load_environments(self):
         """Load environment variables from file."""
         if self.env_file.exists():
-            with open(self.env_file, 'r') as f:
-                self.environments = json.load(f)
+            with open(self.env_file, 'rb') as f:
+                self.environments = json_codec.loads(f.read())
         else:
             self.environments = {
                 "default": {},
@@ -42,8 +45,8 @@ class CollectionManager:
 
     def save_environments(self):
         """Save environment variables to file."""
-        with open(self.env_file, 'w') as f:
-            json.dump(self.environments, f, indent=2)
+        with open(self.env_file, 'wb') as f:
+            f.write(json_codec.dumps_bytes(self.environments, indent=True))
 
     def create_collection(self, name: str, description: str = "") -> Collection:
         """Create a new collection."""
@@ -56,8 +59,8 @@ class CollectionManager:
         """Save a collection to file."""
         if file_path is None:
             file_path = self.collections_dir / f"{collection.name.lower().replace(' ', '_')}.json"
-        with open(file_path, 'w') as f:
-            json.dump(collection.to_dict(), f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(json_codec.dumps_bytes(collection.to_dict(), indent=True))
 
     def list_collections(self) -> List[str]:
         """List all available collections."""
@@ -67,8 +70,8 @@ class CollectionManager:
         """Get a collection by name."""
         file_path = self.collections_dir / f"{name.lower().replace(' ', '_')}.json"
         if file_path.exists():
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                data = json_codec.loads(f.read())
                 collection = Collection(data["name"], data["description"])
                 collection.requests = data["requests"]
                 collection.created_at = data["created_at"]
@@ -120,10 +123,32 @@ class CollectionManager:
 
     def interpolate_variables(self, text: str, environment: str) -> str:
         """Replace environment variables in text with their values."""
-        env_vars = self.environments.get(environment, {})
-        for key, value in env_vars.items():
-            text = text.replace(f"{{${key}}}", value)
-        return text
+        return interpolate_variables(text, self.environments.get(environment, {}))
+
+    def interpolate_request(self, request_data: dict, environment: str) -> dict:
+        """Return a copy of request data with environment variables substituted."""
+        return interpolate_request(request_data, self.environments.get(environment, {}))
+
+    def run_collection(self, collection_name: str, environment: str = "default",
+                       concurrency: int = DEFAULT_CONCURRENCY) -> List[dict]:
+        """Execute every request in a collection concurrently and return the outcomes in order."""
+        collection = self.get_collection(collection_name)
+        if not collection:
+            return []
+
+        requests_data = [
+            self.interpolate_request(entry["request_data"], environment)
+            for entry in collection.requests
+        ]
+        results = run_many(requests_data, concurrency=concurrency, environment=environment)
+
+        outcomes = []
+        for entry, result in zip(collection.requests, results):
+            if isinstance(result, Exception):
+                outcomes.append({"name": entry["name"], "error": str(result)})
+            else:
+                outcomes.append({"name": entry["name"], "response_info": result})
+        return outcomes
 
     def create_folder(self, collection_name: str, folder_name: str, parent_folder: str = None) -> bool:
         """Create a new folder in the collection."""
@@ -0,0 +1,239 @@
+import os
+import socket
+from contextlib import ExitStack
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.auth import HTTPDigestAuth
+from requests.utils import requote_uri, should_bypass_proxies
+from urllib3.util.request import ACCEPT_ENCODING
+
+from connection_pool import get_pool_manager
+from curl_parser import default_options
+from request_body import body_source
+from timing_engine import ConnectionOverrides, interface_options, keepalive_options, parse_connect_to, parse_resolve
+
+DEFAULT_TIMEOUT = 30    # Seconds, for requests that set no timeout of their own
+LOW_SPEED_LIMIT = 1     # Bytes per second, when only curl -y is given
+LOW_SPEED_TIME = 30     # Seconds, when only curl -Y is given
+
+IP_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+
+# Options that change how connections are opened, or the session's redirect limit;
+# requests using any of them get pooled sessions of their own
+_POOL_VARIANT_OPTIONS = (
+    "resolve", "connect_to", "ip_version", "interface", "keepalive_time", "no_keepalive", "tcp_nodelay",
+    "max_redirects"
+)
+
+def interpolate_variables(text: str, variables: Mapping[str, str]) -> str:
+    """Replace ``{$name}`` placeholders with their values."""
+    for key, value in variables.items():
+        text = text.replace(f"{{${key}}}", value)
+    return text
+
+def interpolate_request(request_data: dict, variables: Mapping[str, str]) -> dict:
+    """Return a copy of request data with variables substituted in URL, headers and body."""
+    data = request_data.get("data")
+    return {
+        **request_data,
+        "url": interpolate_variables(request_data["url"], variables),
+        "headers": {
+            key: interpolate_variables(value, variables)
+            for key, value in request_data.get("headers", {}).items()
+        },
+        "data": interpolate_variables(data, variables) if isinstance(data, str) else data
+    }
+
+def _proxies(url: str, proxy: Optional[str], no_proxy: Optional[str]) -> Dict[str, str]:
+    """``proxies`` for curl -x/--noproxy; hosts on the no-proxy list are sent direct."""
+    if no_proxy is None:
+        return {"http": proxy, "https": proxy}
+    if proxy is None or should_bypass_proxies(url, no_proxy=no_proxy):
+        # requests reads "no_proxy" to skip the environment's proxies as well
+        return {"no_proxy": no_proxy}
+    return {"http": proxy, "https": proxy, "no_proxy": no_proxy}
+
+def _keep_dot_segments(prepared_url: str, url: str) -> str:
+    """Put back the /./ and /../ segments requests removes from the path (curl --path-as-is)."""
+    return urlunsplit(urlsplit(prepared_url)._replace(path=requote_uri(urlsplit(url).path)))
+
+class TransportSettings:
+    """
+    How a parsed request is sent: keyword arguments for ``Session.request`` plus the
+    settings applied around it (connection overrides, pacing, deadline). Requests that
+    carry curl ``options`` get curl's semantics; others keep the library defaults.
+    """
+    __slots__ = ("request_kwargs", "form", "overrides", "variant", "rate_limit", "max_time", "http_version",
+                 "max_redirects", "low_speed", "decode_content", "path_as_is")
+
+    def __init__(self, request_data: dict):
+        options = request_data.get("options")
+        headers = dict(request_data["headers"])
+        self.request_kwargs: Dict[str, Any] = {
+            "method": request_data["method"],
+            "url": request_data["url"],
+            "headers": headers,
+            # File-backed bodies (-d @file, -T) are streamed from disk while sending
+            "data": body_source(request_data) or request_data["data"],
+            "timeout": DEFAULT_TIMEOUT,
+            "stream": True
+        }
+        self.form = request_data.get("form") or []
+        self.overrides: Optional[ConnectionOverrides] = None
+        self.variant = ""
+        self.rate_limit: Optional[int] = None
+        self.max_time: Optional[float] = None
+        self.http_version: Optional[str] = None
+        self.max_redirects: Optional[float] = None
+        self.low_speed: Optional[Tuple[int, int]] = None    # (bytes per second, seconds)
+        self.decode_content = True
+        self.path_as_is = False
+        if options is None:
+            return
+
+        # curl sends no Accept-Encoding unless --compressed; requests would add its own
+        if not any(name.lower() == "accept-encoding" for name in headers):
+            headers["Accept-Encoding"] = ACCEPT_ENCODING if options["compressed"] else None
+        self.max_time = options["max_time"]
+        read_timeout = self.max_time or DEFAULT_TIMEOUT
+        if options["speed_limit"] or options["speed_time"]:
+            self.low_speed = (options["speed_limit"] or LOW_SPEED_LIMIT, options["speed_time"] or LOW_SPEED_TIME)
+            # A stalled read is as slow as a transfer gets
+            read_timeout = min(read_timeout, self.low_speed[1])
+        self.request_kwargs["timeout"] = (options["connect_timeout"] or read_timeout, read_timeout)
+        self.request_kwargs["allow_redirects"] = options["follow_redirects"]
+        if options["max_redirects"] is not None:
+            # curl's -1 means no limit
+            self.max_redirects = float("inf") if options["max_redirects"] < 0 else options["max_redirects"]
+        if options["insecure"]:
+            self.request_kwargs["verify"] = False
+        elif options["cacert"]:
+            self.request_kwargs["verify"] = options["cacert"]
+        if options["cert"]:
+            self.request_kwargs["cert"] = (options["cert"], options["key"]) if options["key"] else options["cert"]
+        if options["proxy"] or options["noproxy"] is not None:
+            self.request_kwargs["proxies"] = _proxies(request_data["url"], options["proxy"], options["noproxy"])
+        if options["auth"]:
+            user, password = options["auth"]
+            self.request_kwargs["auth"] = HTTPDigestAuth(user, password) if options["auth_type"] == "digest" else (user, password)
+        self.rate_limit = options["limit_rate"]
+        self.http_version = options["http_version"]
+        self.decode_content = not options["raw"]
+        self.path_as_is = options["path_as_is"]
+
+        resolve = parse_resolve(options["resolve"])
+        connect_to = parse_connect_to(options["connect_to"])
+        family = IP_FAMILIES.get(options["ip_version"])
+        source_address, socket_options = interface_options(options["interface"])
+        socket_options += keepalive_options(options["keepalive_time"], options["no_keepalive"])
+        if options["tcp_nodelay"]:
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+        if resolve or connect_to or family or source_address or socket_options:
+            self.overrides = ConnectionOverrides(resolve, socket_options, connect_to, family, source_address)
+        defaults = default_options()
+        variant = {
+            key: sorted(options[key]) if isinstance(options[key], list) else options[key]
+            for key in _POOL_VARIANT_OPTIONS if options[key] != defaults[key]
+        }
+        if variant:
+            self.variant = repr(sorted(variant.items()))
+
+    def deadline(self, start_ns: int) -> Optional[int]:
+        return start_ns + int(self.max_time * 1_000_000_000) if self.max_time else None
+
+def _encode_header(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    try:
+        return value.encode("latin-1")
+    except UnicodeEncodeError:
+        return value.encode("utf-8")
+
+def _form_files(form: List[dict], stack: ExitStack) -> List[tuple]:
+    """Multipart (-F) parts for ``requests``; files stay open until ``stack`` closes."""
+    files = []
+    for part in form:
+        if "file" not in part:
+            files.append((part["name"], (None, part["value"])))
+        elif part.get("as_value"):
+            with open(part["file"], "r", encoding="utf-8") as handle:
+                files.append((part["name"], (None, handle.read())))
+        else:
+            handle = stack.enter_context(open(part["file"], "rb"))
+            filename = part.get("filename", os.path.basename(part["file"]))
+            files.append((part["name"], (filename, handle, part.get("type"))))
+    return files
+
+class CompiledRequest:
+    """
+    A parsed request prepared once and sent many times. Variables are substituted,
+    basic auth and netrc credentials applied, the body encoded (multipart bodies built)
+    and header values pre-encoded to bytes at compile time, and the proxy/TLS settings
+    resolved from the environment; sending only copies the prepared request when headers
+    are patched in or digest auth is answered. File-backed bodies stay lazy and are re-read on every send.
+    """
+    __slots__ = ("url", "environment", "transport", "prepared", "send_kwargs", "auth")
+
+    def __init__(self, request_data: dict, environment: str = "default",
+                 variables: Optional[Mapping[str, str]] = None,
+                 session: Optional[requests.Session] = None):
+        if variables:
+            request_data = interpolate_request(request_data, variables)
+        self.url = request_data["url"]
+        self.environment = environment
+        self.transport = TransportSettings(request_data)
+
+        kwargs = dict(self.transport.request_kwargs)
+        stream = kwargs.pop("stream")
+        proxies, verify, cert = kwargs.pop("proxies", {}), kwargs.pop("verify", None), kwargs.pop("cert", None)
+        self.send_kwargs = {"timeout": kwargs.pop("timeout"), "allow_redirects": kwargs.pop("allow_redirects", True)}
+        # Digest auth keeps per-thread challenge state and hooks, so it is applied per send
+        self.auth = kwargs.pop("auth") if isinstance(kwargs.get("auth"), HTTPDigestAuth) else None
+        # A throwaway session: preparing must not count as a request on the pooled one
+        with ExitStack() as stack:
+            session = session or stack.enter_context(requests.Session())
+            files = _form_files(self.transport.form, stack) if self.transport.form else None
+            self.prepared = session.prepare_request(requests.Request(files=files, **kwargs))
+            self.send_kwargs.update(session.merge_environment_settings(self.prepared.url, proxies, stream, verify, cert))
+
+        if self.transport.path_as_is:
+            self.prepared.url = _keep_dot_segments(self.prepared.url, self.url)
+        if isinstance(self.prepared.body, str):
+            self.prepared.body = self.prepared.body.encode("utf-8")
+            self.prepared.prepare_content_length(self.prepared.body)
+        for name, value in list(self.prepared.headers.items()):
+            self.prepared.headers[name] = _encode_header(value)
+
+    def session(self) -> requests.Session:
+        """The pooled session this request is sent on."""
+        session = get_pool_manager().acquire(self.url, self.environment, self.transport.variant).session
+        if self.transport.max_redirects is not None:
+            session.max_redirects = self.transport.max_redirects   # The variant keeps this session to itself
+        return session
+
+    def prepare(self, headers: Optional[Mapping[str, str]] = None) -> requests.PreparedRequest:
+        """
+        The prepared request, copied when ``headers`` are patched in or digest auth has
+        to be applied on the sending thread.
+        """
+        if not headers and self.auth is None:
+            return self.prepared
+        prepared = self.prepared.copy()
+        prepared.hooks = {event: list(hooks) for event, hooks in self.prepared.hooks.items()}
+        for name, value in (headers or {}).items():
+            prepared.headers[name] = _encode_header(value)
+        if self.auth is not None:
+            prepared.prepare_auth(self.auth)
+        return prepared
+
+    def send(self, session: Optional[requests.Session] = None,
+             headers: Optional[Mapping[str, str]] = None) -> requests.Response:
+        """Send the request, leaving the body unread for the caller to stream."""
+        return (session or self.session()).send(self.prepare(headers), **self.send_kwargs)
+
+def compile_request(request_data: dict, environment: str = "default",
+                    variables: Optional[Mapping[str, str]] = None) -> CompiledRequest:
+    """Compile a parsed request (see CompiledRequest) against the environment's pool."""
+    return CompiledRequest(request_data, environment, variables)
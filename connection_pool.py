@@ -0,0 +1,208 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from timing_engine import TimedHTTPAdapter
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+PoolKey = Tuple[str, str, str, int, str]
+
+@dataclass
+class PoolConfig:
+    """Tuning knobs for the process-wide connection pool."""
+    pool_maxsize: int = 10          # Connections kept per origin
+    pool_block: bool = False        # Block instead of opening extra connections when the pool is full
+    idle_timeout: float = 90.0      # Seconds an origin may sit unused before it is closed
+    max_origins: int = 256          # Upper bound on pooled origins before LRU eviction
+    max_retries: int = 0
+
+class PooledSession:
+    """A requests session bound to a single origin within one environment."""
+
+    def __init__(self, key: PoolKey, config: PoolConfig, pool_maxsize: Optional[int] = None):
+        self.key = key
+        self.session = requests.Session()
+        self.pool_maxsize = pool_maxsize or config.pool_maxsize
+        self.adapter = self._new_adapter(config)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.request_count = 0
+
+    def _new_adapter(self, config: PoolConfig) -> TimedHTTPAdapter:
+        return TimedHTTPAdapter(
+            pool_connections=4,  # Room for same-session redirect targets
+            pool_maxsize=self.pool_maxsize,
+            pool_block=config.pool_block,
+            max_retries=config.max_retries
+        )
+
+    def grow(self, pool_maxsize: int, config: PoolConfig):
+        """
+        Switch to a larger adapter. The old one is not closed: requests still using it
+        finish normally and its connections are released with it.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.adapter = self._new_adapter(config)
+        # Replacing the mounted values keeps the adapter table's order for concurrent lookups
+        self.session.adapters["http://"] = self.adapter
+        self.session.adapters["https://"] = self.adapter
+
+    def _pools(self) -> list:
+        pools = self.adapter.poolmanager.pools
+        return [pools.get(key) for key in pools.keys() if pools.get(key) is not None]
+
+    def connection_count(self) -> int:
+        """Total number of connections the underlying urllib3 pools have opened."""
+        return sum(pool.num_connections for pool in self._pools())
+
+    def idle_connections(self) -> int:
+        """Number of open connections currently parked in the pools."""
+        return sum(
+            1 for pool in self._pools() for conn in list(pool.pool.queue) if conn is not None
+        )
+
+    def close(self):
+        self.session.close()
+
+class ConnectionPoolManager:
+    """
+    Process-wide registry of pooled sessions keyed by environment, scheme, host and port.
+    Keeping one session per origin lets repeated requests reuse warm TCP/TLS connections,
+    while separate environments never share cookies or sockets. Requests whose connections
+    are set up differently (pinned addresses, socket options) pass a ``variant`` so they
+    get connections of their own.
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None):
+        self.config = config or PoolConfig()
+        self._sessions: "OrderedDict[PoolKey, PooledSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reserved: List[int] = []      # Pool sizes held by running batches (see reserve_capacity)
+        self.stats_counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def pool_key(url: str, environment: str = "default", variant: str = "") -> PoolKey:
+        """Build the pool key for a URL within an environment."""
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in DEFAULT_PORTS:
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme}")
+        host = (parsed.hostname or "").lower()
+        port = parsed.port or DEFAULT_PORTS[scheme]
+        return (environment, scheme, host, port, variant)
+
+    def acquire(self, url: str, environment: str = "default", variant: str = "") -> PooledSession:
+        """Return the pooled session for the URL's origin, creating it on first use."""
+        key = self.pool_key(url, environment, variant)
+        with self._lock:
+            self._evict_idle_locked()
+            pooled = self._sessions.get(key)
+            pool_maxsize = max([self.config.pool_maxsize, *self._reserved])
+            if pooled is None:
+                self.stats_counters["misses"] += 1
+                pooled = PooledSession(key, self.config, pool_maxsize)
+                self._sessions[key] = pooled
+                while len(self._sessions) > self.config.max_origins:
+                    _, oldest = self._sessions.popitem(last=False)
+                    oldest.close()
+                    self.stats_counters["evictions"] += 1
+            else:
+                self.stats_counters["hits"] += 1
+                self._sessions.move_to_end(key)
+                if pooled.pool_maxsize < pool_maxsize:
+                    pooled.grow(pool_maxsize, self.config)
+            pooled.last_used = time.monotonic()
+            pooled.request_count += 1
+            return pooled
+
+    @contextmanager
+    def reserve_capacity(self, pool_maxsize: int) -> Iterator[None]:
+        """
+        Let ``pool_maxsize`` concurrent requests per origin keep their connections while
+        the block runs. Origins grow on their next acquire; sessions in use are never
+        closed and the configured pool size is left as it is.
+        """
+        with self._lock:
+            self._reserved.append(pool_maxsize)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._reserved.remove(pool_maxsize)
+
+    def is_warm(self, url: str, environment: str = "default", variant: str = "") -> bool:
+        """Check whether an idle connection to the URL's origin is ready for reuse."""
+        key = self.pool_key(url, environment, variant)
+        with self._lock:
+            pooled = self._sessions.get(key)
+        return pooled is not None and pooled.idle_connections() > 0
+
+    def evict_idle(self) -> int:
+        """Close origins that have been idle longer than the configured timeout."""
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def _evict_idle_locked(self) -> int:
+        cutoff = time.monotonic() - self.config.idle_timeout
+        expired = [key for key, pooled in self._sessions.items() if pooled.last_used < cutoff]
+        for key in expired:
+            self._sessions.pop(key).close()
+        self.stats_counters["evictions"] += len(expired)
+        return len(expired)
+
+    def close_environment(self, environment: str):
+        """Close every pooled origin belonging to an environment."""
+        with self._lock:
+            for key in [k for k in self._sessions if k[0] == environment]:
+                self._sessions.pop(key).close()
+
+    def close_all(self):
+        """Close all pooled sessions."""
+        with self._lock:
+            for pooled in self._sessions.values():
+                pooled.close()
+            self._sessions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize pool usage for display."""
+        with self._lock:
+            origins = [
+                {
+                    "environment": key[0],
+                    "origin": f"{key[1]}://{key[2]}:{key[3]}",
+                    "variant": key[4],
+                    "requests": pooled.request_count,
+                    "idle_seconds": round(time.monotonic() - pooled.last_used, 1)
+                }
+                for key, pooled in self._sessions.items()
+            ]
+        return {**self.stats_counters, "origins": origins}
+
+_default_manager: Optional[ConnectionPoolManager] = None
+_default_lock = threading.Lock()
+
+def get_pool_manager() -> ConnectionPoolManager:
+    """Return the shared process-wide pool manager."""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = ConnectionPoolManager()
+        return _default_manager
+
+def configure_pool(config: PoolConfig) -> ConnectionPoolManager:
+    """Replace the shared pool manager with one using the given configuration."""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is not None:
+            _default_manager.close_all()
+        _default_manager = ConnectionPoolManager(config)
+        return _default_manager
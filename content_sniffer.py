@@ -0,0 +1,97 @@
+import re
+from typing import Mapping, Optional, Union
+
+from xml_stream import looks_like_xml
+
+SNIFF_BYTES = 512
+
+# Formats reported by sniff_content
+JSON = "json"
+NDJSON = "ndjson"
+XML = "xml"
+HTML = "html"
+FORM = "form"
+MULTIPART = "multipart"
+BINARY = "binary"
+RAW = "raw"
+
+_MAGIC_NUMBERS = (
+    b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"%PDF", b"PK\x03\x04", b"\x1f\x8b",
+    b"RIFF", b"\x00\x00\x01\x00", b"OggS", b"fLaC", b"ID3", b"\x28\xb5\x2f\xfd",
+)
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 12, 13))
+_HTML_START = re.compile(rb'\s*(?:<!DOCTYPE\s+html|<html|<head|<body)', re.IGNORECASE)
+_FORM_BODY = re.compile(rb'[\w.\-~%+\[\]]+=[^&\s]*(?:&[\w.\-~%+\[\]]+=[^&\s]*)*&?\Z')
+_MULTIPART_START = re.compile(rb'--[!-~]{1,70}\r?\n')
+
+_MIME_FORMATS = (
+    ("multipart/", MULTIPART),
+    ("application/x-www-form-urlencoded", FORM),
+    ("ndjson", NDJSON),
+    ("jsonl", NDJSON),
+    ("json-seq", NDJSON),
+    ("json", JSON),
+    ("html", HTML),
+    ("xml", XML),
+    ("image/", BINARY),
+    ("audio/", BINARY),
+    ("video/", BINARY),
+    ("application/octet-stream", BINARY),
+    ("application/zip", BINARY),
+    ("application/pdf", BINARY),
+)
+
+def _format_from_mime(content_type: str) -> Optional[str]:
+    content_type = content_type.lower()
+    for marker, kind in _MIME_FORMATS:
+        if marker in content_type:
+            return kind
+    return None
+
+def _looks_like_ndjson(head: bytes) -> bool:
+    first, newline, rest = head.partition(b"\n")
+    return bool(newline) and first.rstrip().endswith((b"}", b"]")) and rest.lstrip()[:1] in (b"{", b"[")
+
+def sniff_content(data: Union[str, bytes, bytearray, memoryview],
+                  content_type: Optional[str] = None) -> str:
+    """
+    Classify a body as JSON, NDJSON, XML, HTML, form-urlencoded, multipart, binary or raw
+    text from its first bytes and the Content-Type header, without parsing it. Leading
+    bytes win over the header when they are unambiguous (curl labels every -d body as a
+    form, for instance); otherwise the header decides. Only the head of the body is
+    inspected, so the cost does not depend on its size.
+    """
+    head = data[:SNIFF_BYTES]
+    if isinstance(head, str):
+        head = head.encode("utf-8", errors="replace")
+    head = bytes(head)
+    declared = _format_from_mime(content_type) if content_type else None
+
+    if head.startswith(_MAGIC_NUMBERS) or b"\x00" in head:
+        return BINARY
+    if head and len(head.translate(None, _CONTROL_BYTES)) < len(head) * 0.9:
+        return BINARY
+
+    text = head.removeprefix(b"\xef\xbb\xbf").lstrip()
+    if declared == MULTIPART or _MULTIPART_START.match(text):
+        return MULTIPART
+    if text[:1] in (b"{", b"["):
+        if declared == NDJSON or _looks_like_ndjson(text):
+            return NDJSON
+        return JSON
+    if _HTML_START.match(text):
+        return HTML
+    if looks_like_xml(text):
+        return XML
+    if declared in (JSON, NDJSON, XML, HTML, BINARY):
+        return declared
+    if _FORM_BODY.match(text):
+        return FORM
+    return declared or RAW
+
+def header_content_type(headers: Mapping[str, str]) -> Optional[str]:
+    """The Content-Type of a header mapping, whatever its capitalization."""
+    for name, value in headers.items():
+        if name.lower() == "content-type":
+            return value
+    return None
@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from parse_cache import get_parse_cache
+
+DEFAULT_BATCH_SIZE = 256
+MAX_COMMAND_CHARS = 16 * 1024 * 1024   # A runaway continuation is cut off here
+
+# (first line, last line, command text)
+Command = Tuple[int, int, str]
+
+@dataclass(slots=True)
+class IngestResult:
+    """Outcome of one command: the parsed request, or the error with its line range."""
+    line: int
+    end_line: int
+    request: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'line': self.line, 'end_line': self.end_line, 'request': self.request, 'error': self.error}
+
+def _continues(line: str) -> bool:
+    """True when a line ends in an unescaped backslash."""
+    stripped = line.rstrip()
+    return (len(stripped) - len(stripped.rstrip("\\"))) % 2 == 1
+
+def iter_commands(lines: Iterable[str]) -> Iterator[Command]:
+    """
+    Group lines into commands. Backslash continuations are joined, blank lines and
+    ``#`` comments are skipped, and the `` ;`` separators of devtools "copy all as cURL"
+    exports are dropped. Only the command being assembled is held in memory.
+    """
+    parts: List[str] = []
+    size = 0
+    start = 0
+    for number, line in enumerate(lines, 1):
+        if not parts:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            start = number
+        if _continues(line) and size < MAX_COMMAND_CHARS:
+            text = line.rstrip()[:-1]
+            parts.append(text)
+            size += len(text)
+            continue
+        parts.append(line.strip())
+        command = " ".join(parts).strip()
+        if command.endswith(";"):
+            command = command[:-1].rstrip()
+        yield start, number, command
+        parts, size = [], 0
+    if parts:
+        yield start, number, " ".join(parts).strip()
+
+def parse_commands(commands: List[Command]) -> List[IngestResult]:
+    """
+    Parse a batch of commands; errors are recorded per command instead of raised.
+    Repeated commands are parsed once per process through the parse cache.
+    """
+    cache = get_parse_cache()
+    results = []
+    for start, end, command in commands:
+        try:
+            results.append(IngestResult(start, end, request=cache.parse(command)))
+        except ValueError as e:
+            results.append(IngestResult(start, end, error=str(e)))
+    return results
+
+def _batches(commands: Iterator[Command], batch_size: int) -> Iterator[List[Command]]:
+    while True:
+        batch = list(islice(commands, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def ingest_curl_commands(lines: Iterable[str], workers: Optional[int] = None,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[IngestResult]:
+    """
+    Parse a stream of curl commands across a process pool, yielding one result per
+    command in input order. Batches are submitted as the input is read and at most two
+    per worker are in flight, so memory does not grow with the size of the input.
+    ``workers=1`` parses in this process; input that fits in one batch always does.
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = _batches(iter_commands(lines), batch_size)
+    first = next(batches, None)
+    if first is None:
+        return
+    second = next(batches, None)
+    if workers <= 1 or second is None:
+        yield from parse_commands(first)
+        if second is not None:
+            yield from parse_commands(second)
+            for batch in batches:
+                yield from parse_commands(batch)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = deque([executor.submit(parse_commands, first), executor.submit(parse_commands, second)])
+        for batch in batches:
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(parse_commands, batch))
+        while pending:
+            yield from pending.popleft().result()
+
+def open_source(path: str) -> TextIO:
+    """Open a command file for streaming; ``-`` is standard input."""
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+def ingest_file(path: str, workers: Optional[int] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[IngestResult]:
+    """Stream and parse the curl commands of a file (or stdin for ``-``)."""
+    source = open_source(path)
+    try:
+        yield from ingest_curl_commands(source, workers, batch_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
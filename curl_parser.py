@@ -1,19 +1,338 @@
+import os
 import re
 import shlex
-from urllib.parse import urlparse
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlparse, urlsplit, urlunsplit
+
+from request_body import FileBody
+
+# HTTP versions a command can ask for; the transport itself speaks HTTP/1.1
+HTTP_VERSIONS = {
+    "--http1.0": "1.0",
+    "--http1.1": "1.1",
+    "--http2": "2",
+    "--http2-prior-knowledge": "2",
+    "--http3": "3",
+    "--http3-only": "3",
+}
+
+_RATE = re.compile(r'(\d+(?:\.\d+)?)([kKmMgG]?)')
+_RATE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+_CONTINUATION = re.compile(r'\\\r?\n')
+
+def default_options() -> Dict[str, Any]:
+    """Transport options of a command that sets none; curl's defaults."""
+    return {
+        "compressed": False,
+        "http_version": None,
+        "follow_redirects": False,
+        "max_redirects": None,      # --max-redirs; None keeps the library default
+        "max_time": None,           # Seconds for the whole transfer
+        "connect_timeout": None,    # Seconds
+        "keepalive_time": None,     # TCP keepalive idle/interval seconds
+        "no_keepalive": False,
+        "limit_rate": None,         # Bytes per second
+        "speed_limit": None,        # Abort below this many bytes per second...
+        "speed_time": None,         # ...sustained for this many seconds
+        "resolve": [],              # "host:port:address[,address]" entries
+        "connect_to": [],           # "host:port:connect_host:connect_port" entries
+        "ip_version": None,         # 4 or 6 to restrict name resolution
+        "interface": None,          # Local address or interface name to send from
+        "tcp_nodelay": False,
+        "path_as_is": False,        # Keep /./ and /../ in the URL path
+        "raw": False,               # Leave the response content encoding undecoded
+        "insecure": False,
+        "cacert": None,
+        "cert": None,
+        "key": None,
+        "proxy": None,
+        "noproxy": None,            # Comma-separated hosts that bypass proxies, or "*"
+        "auth": None,               # [user, password]
+        "auth_type": "basic",
+        "ignored": [],              # Flags accepted without effect (output, progress...)
+        "unsupported": [],          # Flags that are not applied: unknown, or not possible here
+        "data_files": [],           # Files whose contents were read into ``data``
+    }
+
+@dataclass(frozen=True)
+class CurlOption:
+    """One curl flag (all its spellings); ``apply`` is None for flags that are accepted and ignored."""
+    names: Tuple[str, ...]
+    takes_value: bool
+    apply: Optional[Callable[[dict, Optional[str]], None]] = None
+
+def _parse_rate(value: str) -> int:
+    match = _RATE.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"Invalid rate: {value}")
+    return int(float(match.group(1)) * _RATE_UNITS[match.group(2).lower()])
+
+def _set(key: str, convert: Callable[[str], Any] = str) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        request["options"][key] = convert(value)
+    return apply
+
+def _enable(key: str, flag_value: Any = True) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        request["options"][key] = flag_value
+    return apply
+
+def _append(key: str) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        request["options"][key].append(value)
+    return apply
+
+def _unsupported(flag: str) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        request["options"]["unsupported"].append(flag)
+    return apply
+
+def _set_header(name: str, prefix: str = "") -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        request["headers"][name] = prefix + value
+    return apply
+
+def _header(request: dict, value: str):
+    if ":" in value:
+        key, header_value = value.split(":", 1)
+    elif value.rstrip().endswith(";"):
+        key, header_value = value.rstrip()[:-1], ""   # "Name;" sends an empty header
+    else:
+        raise ValueError(f"Invalid header: {value}")
+    request["headers"][key.strip()] = header_value.strip()
+
+def _file_path(value: str) -> str:
+    if value in ("", "-"):
+        raise ValueError("Reading data from stdin is not supported; reference a file instead")
+    path = os.path.expanduser(value)
+    if not os.path.isfile(path):
+        raise ValueError(f"Cannot read data from file '{value}'")
+    return path
+
+def _data(kind: str) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        if kind in ("ascii", "binary") and value.startswith("@"):
+            # Kept as a reference; the file is only read when the body is sent
+            request["_data"].append(FileBody(_file_path(value[1:]), strip_newlines=kind == "ascii"))
+            return
+        if kind == "urlencode":
+            name, sep, content = value.partition("=")
+            if not sep and "@" in value:
+                name, _, path = value.partition("@")
+                path = _file_path(path)
+                request["options"]["data_files"].append(path)
+                content = FileBody(path).read_all().decode("utf-8", errors="replace")
+                sep = "=" if name else ""
+            elif not sep:
+                name, content = "", value
+            value = f"{name}={quote(content, safe='')}" if sep and name else quote(content, safe="")
+        request["_data"].append(value)
+    return apply
+
+def _upload(request: dict, value: str):
+    request["body_file"] = FileBody(_file_path(value)).to_dict()
+
+def _json(request: dict, value: str):
+    request["_data"].append(value)
+    request["headers"].setdefault("Content-Type", "application/json")
+    request["headers"].setdefault("Accept", "application/json")
+
+def _form(literal: bool) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: str):
+        name, sep, content = value.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid form field: {value}")
+        if literal or not content.startswith(("@", "<")):
+            request["form"].append({"name": name, "value": content})
+            return
+        # name=@path[;type=...][;filename=...]; "<" reads the file as a plain field
+        path, *params = content[1:].split(";")
+        part = {"name": name, "file": path, "as_value": content.startswith("<")}
+        for param in params:
+            param_name, _, param_value = param.partition("=")
+            if param_name.strip() in ("type", "filename"):
+                part[param_name.strip()] = param_value.strip()
+        request["form"].append(part)
+    return apply
+
+def _user(request: dict, value: str):
+    user, _, password = value.partition(":")
+    request["options"]["auth"] = [user, password]
+
+def _cookie(request: dict, value: str):
+    if "=" in value:   # Otherwise it names a cookie file, which is not read
+        request["headers"]["Cookie"] = value
+
+def _url(request: dict, value: str):
+    request["url"] = value
+
+def _method(method: str) -> Callable[[dict, Optional[str]], None]:
+    def apply(request: dict, value: Optional[str]):
+        request["_implied_method"] = method
+    return apply
+
+def _explicit_method(request: dict, value: str):
+    request["method"] = value.upper()
+    request["_method_set"] = True
+
+def _get(request: dict, value: Optional[str]):
+    request["_data_in_url"] = True
+
+CURL_OPTIONS = (
+    CurlOption(("-X", "--request"), True, _explicit_method),
+    CurlOption(("-H", "--header"), True, _header),
+    CurlOption(("--url",), True, _url),
+    CurlOption(("-d", "--data", "--data-ascii"), True, _data("ascii")),
+    CurlOption(("--data-raw",), True, _data("raw")),
+    CurlOption(("--data-binary",), True, _data("binary")),
+    CurlOption(("--data-urlencode",), True, _data("urlencode")),
+    CurlOption(("--json",), True, _json),
+    CurlOption(("-T", "--upload-file"), True, _upload),
+    CurlOption(("-F", "--form"), True, _form(literal=False)),
+    CurlOption(("--form-string",), True, _form(literal=True)),
+    CurlOption(("-G", "--get"), False, _get),
+    CurlOption(("-I", "--head"), False, _method("HEAD")),
+    CurlOption(("-A", "--user-agent"), True, _set_header("User-Agent")),
+    CurlOption(("-e", "--referer"), True, _set_header("Referer")),
+    CurlOption(("-b", "--cookie"), True, _cookie),
+    CurlOption(("-r", "--range"), True, _set_header("Range", "bytes=")),
+    CurlOption(("--oauth2-bearer",), True, _set_header("Authorization", "Bearer ")),
+    CurlOption(("-u", "--user"), True, _user),
+    CurlOption(("--basic",), False, _enable("auth_type", "basic")),
+    CurlOption(("--digest",), False, _enable("auth_type", "digest")),
+    CurlOption(("--compressed",), False, _enable("compressed")),
+    *(CurlOption((flag,), False, _enable("http_version", version)) for flag, version in HTTP_VERSIONS.items()),
+    CurlOption(("-L", "--location", "--location-trusted"), False, _enable("follow_redirects")),
+    CurlOption(("--max-redirs",), True, _set("max_redirects", int)),
+    CurlOption(("-m", "--max-time"), True, _set("max_time", float)),
+    CurlOption(("--connect-timeout",), True, _set("connect_timeout", float)),
+    CurlOption(("--keepalive-time",), True, _set("keepalive_time", int)),
+    CurlOption(("--no-keepalive",), False, _enable("no_keepalive")),
+    CurlOption(("--limit-rate",), True, _set("limit_rate", _parse_rate)),
+    CurlOption(("-Y", "--speed-limit"), True, _set("speed_limit", int)),
+    CurlOption(("-y", "--speed-time"), True, _set("speed_time", int)),
+    CurlOption(("--resolve",), True, _append("resolve")),
+    CurlOption(("--connect-to",), True, _append("connect_to")),
+    CurlOption(("-4", "--ipv4"), False, _enable("ip_version", 4)),
+    CurlOption(("-6", "--ipv6"), False, _enable("ip_version", 6)),
+    CurlOption(("--interface",), True, _set("interface")),
+    CurlOption(("--tcp-nodelay",), False, _enable("tcp_nodelay")),
+    CurlOption(("--path-as-is",), False, _enable("path_as_is")),
+    CurlOption(("--raw",), False, _enable("raw")),
+    CurlOption(("-k", "--insecure"), False, _enable("insecure")),
+    CurlOption(("--cacert",), True, _set("cacert")),
+    CurlOption(("-E", "--cert"), True, _set("cert")),
+    CurlOption(("--key",), True, _set("key")),
+    CurlOption(("-x", "--proxy"), True, _set("proxy")),
+    CurlOption(("--noproxy",), True, _set("noproxy")),
+    # Change what is sent but cannot be done over this transport: http.client neither
+    # waits for 100-continue, opens TCP Fast Open connections nor decodes compressed
+    # transfer encodings
+    CurlOption(("--expect100-timeout",), True, _unsupported("--expect100-timeout")),
+    CurlOption(("--tcp-fastopen",), False, _unsupported("--tcp-fastopen")),
+    CurlOption(("--tr-encoding",), False, _unsupported("--tr-encoding")),
+    # Output, progress and retry flags do not change what is sent
+    CurlOption(("-o", "--output", "-w", "--write-out", "-D", "--dump-header", "-c", "--cookie-jar",
+                "--retry", "--retry-delay", "--retry-max-time", "--trace", "--trace-ascii",
+                "--stderr"), True),
+    CurlOption(("-s", "--silent", "-S", "--show-error", "-v", "--verbose", "-i", "--include",
+                "-f", "--fail", "--fail-with-body", "-#", "--progress-bar", "-N", "--no-buffer",
+                "-g", "--globoff", "-O", "--remote-name", "-J", "--remote-header-name",
+                "--no-progress-meter", "--ssl-no-revoke"), False),
+)
+
+_OPTION_TABLE: Dict[str, CurlOption] = {name: option for option in CURL_OPTIONS for name in option.names}
+
+def _expand(part: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Split bundled short flags (``-sSL``) and attached values (``-XPOST``) into
+    (flag, attached value) pairs; unknown bundles are returned whole.
+    """
+    if part in _OPTION_TABLE or part.startswith("--") or len(part) <= 2:
+        return [(part, None)]
+    flags = []
+    for position in range(1, len(part)):
+        flag = "-" + part[position]
+        option = _OPTION_TABLE.get(flag)
+        if option is None:
+            return [(part, None)]
+        if option.takes_value:
+            flags.append((flag, part[position + 1:] or None))
+            return flags
+        flags.append((flag, None))
+    return flags
+
+def _arguments(parts: List[str]) -> Iterator[Tuple[Optional[str], Optional[CurlOption], Optional[str]]]:
+    """
+    (flag, option, value) for each argument after ``curl``. URLs come without a flag and
+    unknown flags without an option; the values of flags that take one are consumed.
+    """
+    i = 1
+    while i < len(parts):
+        part = parts[i]
+        i += 1
+        if not part.startswith("-"):
+            yield None, None, part
+            continue
+        for flag, attached in _expand(part):
+            option = _OPTION_TABLE.get(flag)
+            value = attached
+            if option is not None and option.takes_value and value is None:
+                if i >= len(parts):
+                    raise ValueError(f"Missing value for {flag}")
+                value = parts[i]
+                i += 1
+            yield flag, option, value
+
+def _form_file(value: str) -> Optional[str]:
+    content = value.partition("=")[2]
+    return content[1:].split(";")[0] if content.startswith(("@", "<")) else None
+
+# How to find the local file named by the value of each flag that reads one,
+# keyed by the option's first spelling
+_FILE_VALUES: Dict[str, Callable[[str], Optional[str]]] = {
+    "-d": lambda value: value[1:] if value.startswith("@") else None,
+    "--data-binary": lambda value: value[1:] if value.startswith("@") else None,
+    "--data-urlencode": lambda value: value.partition("@")[2] if "=" not in value and "@" in value else None,
+    "-F": _form_file,
+    "-T": lambda value: value,
+    "--cacert": lambda value: value,
+    "-E": lambda value: value,
+    "--key": lambda value: value,
+}
+
+def referenced_files(curl_command: str) -> List[str]:
+    """
+    Local files a curl command would read (bodies, -F uploads, TLS certificates and
+    keys), found from its arguments alone: unlike parsing, nothing is opened.
+    """
+    paths = []
+    for flag, option, value in _arguments(shlex.split(normalize_command(curl_command))):
+        path = _FILE_VALUES.get(option.names[0], lambda value: None)(value) if option is not None else None
+        if path:
+            paths.append(path)
+    return paths
+
+def normalize_command(curl_command: str) -> str:
+    """Join backslash continuations, then remove newlines and extra spaces."""
+    return " ".join(_CONTINUATION.sub(" ", curl_command).strip().split())
 
 def parse_curl_command(curl_command: str) -> dict:
     """
-    Parse a curl command into its components.
+    Parse a curl command into its components. Flags are looked up in CURL_OPTIONS;
+    transport settings land in ``options`` (see default_options) and multipart fields
+    in ``form``. Flags that only affect curl's own output are recorded as ignored;
+    unknown ones, and ones this transport cannot apply, as unsupported. Bodies taken from a file (``-d @file``, ``-T file``) are
+    referenced in ``body_file`` rather than read.
     """
-    # Remove newlines and extra spaces
-    curl_command = " ".join(curl_command.strip().split())
-    
+    curl_command = normalize_command(curl_command)
+
     try:
         # Split the command respecting quoted strings
         parts = shlex.split(curl_command)
-        
-        if not parts[0].lower() == "curl":
+
+        if not parts or not parts[0].lower() == "curl":
             raise ValueError("Command must start with 'curl'")
 
         request_data = {
@@ -22,53 +341,75 @@ def parse_curl_command(curl_command: str) -> dict:
             "headers": {},
             "data": None,
             "params": {},
+            "form": [],
+            "body_file": None,
+            "options": default_options(),
+            "_data": [],
         }
 
-        i = 1
-        while i < len(parts):
-            part = parts[i]
-            
-            # Handle URL (if not a flag)
-            if not part.startswith("-"):
-                request_data["url"] = part
-                i += 1
-                continue
-
-            # Handle flags
-            if part in ["-H", "--header"]:
-                if i + 1 >= len(parts):
-                    raise ValueError(f"Missing value for {part}")
-                header_line = parts[i + 1]
-                key, value = header_line.split(":", 1)
-                request_data["headers"][key.strip()] = value.strip()
-                i += 2
-
-            elif part in ["-X", "--request"]:
-                if i + 1 >= len(parts):
-                    raise ValueError(f"Missing value for {part}")
-                request_data["method"] = parts[i + 1].upper()
-                i += 2
-
-            elif part in ["-d", "--data", "--data-raw"]:
-                if i + 1 >= len(parts):
-                    raise ValueError(f"Missing value for {part}")
-                request_data["data"] = parts[i + 1]
-                if request_data["method"] == "GET":
-                    request_data["method"] = "POST"
-                i += 2
-
+        for flag, option, value in _arguments(parts):
+            if flag is None:
+                request_data["url"] = value
+            elif option is None:
+                request_data["options"]["unsupported"].append(flag)
+            elif option.apply is None:
+                request_data["options"]["ignored"].append(flag)
             else:
-                i += 1
+                option.apply(request_data, value)
 
         # Validate URL
         if not request_data["url"]:
             raise ValueError("No URL specified in curl command")
-        
+        if "://" not in request_data["url"]:
+            request_data["url"] = "http://" + request_data["url"]   # curl's default scheme
+
         parsed_url = urlparse(request_data["url"])
         if not parsed_url.scheme or not parsed_url.netloc:
             raise ValueError("Invalid URL format")
 
-        return request_data
+        return _finish(request_data)
 
     except Exception as e:
         raise ValueError(f"Error parsing curl command: {str(e)}")
+
+def _finish(request_data: dict) -> dict:
+    """Settle the body and method the way curl does once every flag is known."""
+    parts = request_data.pop("_data")
+    data_in_url = request_data.pop("_data_in_url", False)
+    uploading = request_data["body_file"] is not None
+    has_data = bool(parts)      # -d '' still makes a POST, just with an empty body
+    if uploading and (has_data or request_data["form"]):
+        raise ValueError("-T cannot be combined with -d or -F")
+    if len(parts) == 1 and isinstance(parts[0], FileBody) and not data_in_url:
+        # A lone file body is streamed from disk when the request is sent
+        request_data["body_file"] = parts[0].to_dict()
+        parts = []
+    request_data["options"]["data_files"].extend(part.path for part in parts if isinstance(part, FileBody))
+    data = "&".join(
+        part.read_all().decode("utf-8", errors="replace") if isinstance(part, FileBody) else part
+        for part in parts
+    )
+    if request_data["form"] and has_data:
+        raise ValueError("-F cannot be combined with -d")
+
+    if data_in_url:
+        # -G sends the data as the query string of a GET
+        if data:
+            separator = "&" if urlparse(request_data["url"]).query else "?"
+            request_data["url"] += separator + data
+        data = None
+        implied = "GET"
+    elif uploading:
+        # Like curl, -T to a URL ending in "/" uploads under the file's name
+        url = urlsplit(request_data["url"])
+        if not url.path or url.path.endswith("/"):
+            name = quote(os.path.basename(request_data["body_file"]["path"]))
+            request_data["url"] = urlunsplit(url._replace(path=(url.path or "/") + name))
+        implied = "PUT"
+    else:
+        implied = "POST" if has_data or request_data["form"] else "GET"
+    implied = request_data.pop("_implied_method", None) or implied
+    if not request_data.pop("_method_set", False):
+        request_data["method"] = implied
+    request_data["data"] = data if parts else None
+    return request_data
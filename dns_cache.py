@@ -0,0 +1,164 @@
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import dns.resolver  # Optional: dnspython exposes real record TTLs
+except ImportError:
+    dns = None
+
+AddrInfo = Tuple[int, int, int, str, tuple]
+
+class _Entry:
+    __slots__ = ("addresses", "error", "expires_at")
+
+    def __init__(self, addresses: List[Tuple[int, str]], error: Optional[socket.gaierror], expires_at: float):
+        self.addresses = addresses
+        self.error = error
+        self.expires_at = expires_at
+
+class DNSCache:
+    """
+    In-process resolver cache holding every A and AAAA record for a host.
+    Entries expire after the record TTL when dnspython is installed, otherwise after
+    ``default_ttl``; failed lookups are cached for ``negative_ttl`` seconds.
+    """
+
+    def __init__(self, default_ttl: float = 60.0, negative_ttl: float = 10.0,
+                 min_ttl: float = 1.0, max_entries: int = 4096):
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.min_ttl = min_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats_counters = {"hits": 0, "misses": 0, "negative_hits": 0}
+
+    def lookup(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> Tuple[List[AddrInfo], bool]:
+        """Resolve a host to getaddrinfo-style tuples; the flag tells whether the cache answered."""
+        host = host.strip("[]").rstrip(".").lower()
+        if _is_ip_literal(host):
+            return socket.getaddrinfo(host, port, family, socket.SOCK_STREAM), True
+
+        key = (host, family)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                if entry.error is not None:
+                    self.stats_counters["negative_hits"] += 1
+                    raise entry.error
+                self.stats_counters["hits"] += 1
+                return _to_addrinfo(entry.addresses, port), True
+            self.stats_counters["misses"] += 1
+
+        entry = self._query(host, family)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if entry.error is not None:
+            raise entry.error
+        return _to_addrinfo(entry.addresses, port), False
+
+    def resolve(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> List[AddrInfo]:
+        """Resolve a host to getaddrinfo-style tuples, using the cache when possible."""
+        return self.lookup(host, port, family)[0]
+
+    def _query(self, host: str, family: int) -> _Entry:
+        now = time.monotonic()
+        if dns is not None:
+            addresses, ttl = _query_dnspython(host, family)
+            if addresses:
+                return _Entry(addresses, None, now + max(self.min_ttl, ttl))
+        try:
+            infos = socket.getaddrinfo(host, None, family, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            return _Entry([], e, now + self.negative_ttl)
+        addresses = list(dict.fromkeys((info[0], info[4][0]) for info in infos))
+        return _Entry(addresses, None, now + self.default_ttl)
+
+    def warm(self, hosts: Iterable[str], max_workers: int = 16) -> Dict[str, Any]:
+        """
+        Resolve hosts (or URLs) ahead of time, e.g. before a collection run.
+        Returns the number of addresses per host, or the error message for failures.
+        """
+        names = list(dict.fromkeys(_host_of(h) for h in hosts if h))
+
+        def _warm_one(name: str):
+            try:
+                return name, len(self.resolve(name, 0))
+            except socket.gaierror as e:
+                return name, str(e)
+
+        if not names:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+            return dict(executor.map(_warm_one, names))
+
+    def invalidate(self, host: Optional[str] = None):
+        """Drop one host (or everything) from the cache."""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+                return
+            host = host.strip("[]").rstrip(".").lower()
+            for key in [k for k in self._entries if k[0] == host]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for display."""
+        with self._lock:
+            return {**self.stats_counters, "entries": len(self._entries)}
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+def _host_of(value: str) -> str:
+    return urlparse(value).hostname if "://" in value else value
+
+def _to_addrinfo(addresses: List[Tuple[int, str]], port: int) -> List[AddrInfo]:
+    infos = []
+    for family, address in addresses:
+        sockaddr = (address, port, 0, 0) if family == socket.AF_INET6 else (address, port)
+        infos.append((family, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", sockaddr))
+    return infos
+
+def _query_dnspython(host: str, family: int) -> Tuple[List[Tuple[int, str]], float]:
+    """Query A/AAAA records directly so the record TTL is known."""
+    record_types = []
+    if family in (socket.AF_UNSPEC, socket.AF_INET):
+        record_types.append(("A", socket.AF_INET))
+    if family in (socket.AF_UNSPEC, socket.AF_INET6):
+        record_types.append(("AAAA", socket.AF_INET6))
+
+    addresses, ttls = [], []
+    for record_type, record_family in record_types:
+        try:
+            answer = dns.resolver.resolve(host, record_type)
+        except Exception:
+            continue
+        ttls.append(answer.rrset.ttl)
+        addresses.extend((record_family, rdata.address) for rdata in answer)
+    return addresses, min(ttls) if ttls else 0
+
+_default_cache: Optional[DNSCache] = None
+_default_lock = threading.Lock()
+
+def get_dns_cache() -> DNSCache:
+    """Return the shared process-wide DNS cache."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = DNSCache()
+        return _default_cache
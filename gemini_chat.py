@@ -6,6 +6,9 @@ import zipfile
 import tempfile
 from datetime import datetime
 
+from response_model import ResponseResult
+from utils import format_duration, format_size
+
 def initialize_gemini():
     """Initialize the Gemini model with configuration."""
     genai.configure(api_key=os.environ["GEMINI_API_KEY"])
@@ -30,7 +33,7 @@ def create_chat_session(model, history: List = None):
         history = []
     return model.start_chat(history=history)
 
-def format_api_analysis(request_info: Dict, response_info: Dict) -> str:
+def format_api_analysis(request_info: Dict, response_info: ResponseResult) -> str:
     """Format API analysis for Gemini input."""
     return f"""
     You are an API optimization expert. Here's the detailed information about an API request and response to analyze:
@@ -41,12 +44,12 @@ def format_api_analysis(request_info: Dict, response_info: Dict) -> str:
     - Headers: {json.dumps(request_info.get('headers', {}), indent=2)}
     
     API Response Analysis:
-    - Status Code: {response_info.get('status_code')}
-    - Response Time: {response_info.get('metadata', {}).get('timing', {}).get('total_time')}
-    - Size: {response_info.get('metadata', {}).get('size')}
+    - Status Code: {response_info.status_code}
+    - Response Time: {format_duration(response_info.timing.total_time)}
+    - Size: {format_size(response_info.size_bytes)}
     
     Security Analysis:
-    {json.dumps(response_info.get('metadata', {}).get('security_analysis', {}), indent=2)}
+    {json.dumps(response_info.security_analysis, indent=2)}
 
     Please analyze this information and provide:
     1. Detailed performance optimization suggestions
@@ -168,7 +171,7 @@ class GeminiChatManager:
     def analyze_api(
         self,
         request_info: Dict,
-        response_info: Dict,
+        response_info: ResponseResult,
         additional_context: str = None,
         user_prompt: str = None
     ) -> Dict[str, Any]:
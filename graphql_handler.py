@@ -1,6 +1,7 @@
 import graphene
 from typing import Dict, Any, Optional
 import json
+import json_codec
 from dataclasses import dataclass
 from urllib.parse import urlencode
 
@@ -30,7 +31,7 @@ class GraphQLAnalyzer:
                 "Content-Type": "application/json",
                 "Accept": "application/json"
             },
-            "data": json.dumps(request_data)
+            "data": json_codec.dumps(request_data)
         }
 
     def parse_response(self, response_data: Dict[str, Any]) -> Dict[str, Any]:
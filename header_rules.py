@@ -0,0 +1,300 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+# Directions a rule applies to
+REQUEST = "request"
+RESPONSE = "response"
+
+# Rule groups; only security rules count towards the score
+SECURITY = "security"
+CONTENT = "content"
+CACHING = "caching"
+
+MAX_SCORE = 100
+
+# Headers whose values change per request without changing the analysis; they are
+# left out of the cache fingerprint unless a rule inspects them
+VOLATILE_HEADERS = frozenset({
+    "date", "age", "expires", "last-modified", "etag", "content-length", "set-cookie", "cookie",
+    "x-request-id", "request-id", "x-correlation-id", "x-amzn-requestid", "x-amzn-trace-id",
+    "traceparent", "tracestate", "x-b3-traceid", "x-b3-spanid", "x-b3-parentspanid",
+    "x-b3-sampled", "x-cloud-trace-context", "cf-ray", "x-runtime", "server-timing"
+})
+
+Fingerprint = Tuple[Tuple[str, str], ...]
+T = TypeVar("T")
+
+_REFERRER_POLICIES = frozenset({
+    "no-referrer", "no-referrer-when-downgrade", "origin", "origin-when-cross-origin",
+    "same-origin", "strict-origin", "strict-origin-when-cross-origin", "unsafe-url"
+})
+_HSTS_MAX_AGE = re.compile(r'max-age=\d+')
+
+@dataclass(frozen=True)
+class HeaderRule:
+    """
+    One declared header check. ``name`` is matched case-insensitively; ``validate``
+    receives the header value and is only called when the header is present.
+    """
+    name: str
+    label: str
+    description: str
+    recommendation: str
+    directions: Tuple[str, ...] = (REQUEST, RESPONSE)
+    group: str = SECURITY
+    risk_level: str = "medium"
+    weight: int = 20
+    validate: Optional[Callable[[str], bool]] = None
+
+@dataclass
+class HeaderEvaluation:
+    """Result of evaluating a rule set against one header set."""
+    direction: str
+    headers: Dict[str, str]             # Normalized: lowercase names, stripped values
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    score: int = 0
+    recommendations: List[str] = field(default_factory=list)
+
+    def group(self, group: str) -> Dict[str, Dict[str, Any]]:
+        return {name: result for name, result in self.results.items() if result['group'] == group}
+
+    @property
+    def missing(self) -> List[str]:
+        return [name for name, result in self.results.items() if not result['present']]
+
+def normalize_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Lowercase header names and strip values; the last duplicate wins."""
+    return {str(name).strip().lower(): str(value).strip() for name, value in headers.items()}
+
+class HeaderRuleSet:
+    """
+    Header rules declared once and compiled per direction into a table keyed by the
+    lowercase header name. Evaluation walks the supplied headers once, looking each
+    one up in the table, instead of probing for every rule in turn.
+    """
+
+    def __init__(self, rules: Iterable[HeaderRule] = ()):
+        self._rules: Dict[str, HeaderRule] = {}
+        self._tables: Dict[str, Dict[str, HeaderRule]] = {}
+        self.version = 0        # Bumped on every change so cached analyses go stale
+        self.volatile_headers: FrozenSet[str] = VOLATILE_HEADERS
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: HeaderRule):
+        """Register a rule; a rule with the same header name replaces the existing one."""
+        self._rules[rule.name.lower()] = rule
+        self._changed()
+
+    def remove(self, name: str):
+        self._rules.pop(name.lower(), None)
+        self._changed()
+
+    def _changed(self):
+        self._tables.clear()
+        self.volatile_headers = VOLATILE_HEADERS - self._rules.keys()
+        self.version += 1
+
+    def rules(self, direction: str) -> List[HeaderRule]:
+        return list(self._table(direction).values())
+
+    def _table(self, direction: str) -> Dict[str, HeaderRule]:
+        table = self._tables.get(direction)
+        if table is None:
+            table = {name: rule for name, rule in self._rules.items() if direction in rule.directions}
+            self._tables[direction] = table
+        return table
+
+    def evaluate(self, headers: Mapping[str, str], direction: str) -> HeaderEvaluation:
+        table = self._table(direction)
+        normalized = {}
+        matched = {}
+        for name, value in headers.items():
+            name = str(name).strip().lower()
+            value = str(value).strip()
+            normalized[name] = value
+            if name in table:
+                matched[name] = value
+
+        evaluation = HeaderEvaluation(direction=direction, headers=normalized)
+        score = 0
+        for name, rule in table.items():
+            result = {
+                'present': name in matched,
+                'label': rule.label,
+                'description': rule.description,
+                'recommendation': rule.recommendation,
+                'risk_level': rule.risk_level,
+                'group': rule.group
+            }
+            if name in matched:
+                result['value'] = matched[name]
+                if rule.validate is not None:
+                    result['valid'] = bool(rule.validate(matched[name]))
+                if rule.group == SECURITY:
+                    score += rule.weight
+            elif rule.group == SECURITY:
+                evaluation.recommendations.append(rule.recommendation)
+            evaluation.results[name] = result
+        evaluation.score = min(MAX_SCORE, score)
+        return evaluation
+
+def header_fingerprint(headers: Mapping[str, str],
+                       ignore: FrozenSet[str] = VOLATILE_HEADERS) -> Fingerprint:
+    """Order- and case-independent identity of a header set, without volatile headers."""
+    return tuple(sorted(
+        (name, value) for name, value in normalize_headers(headers).items() if name not in ignore
+    ))
+
+class HeaderAnalysisCache:
+    """
+    Bounded LRU of header analyses keyed by kind, rule set version and header
+    fingerprint, so a header set seen before costs one lookup instead of a rule
+    evaluation. Cached results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats_counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def analyze(self, kind: str, headers: Mapping[str, str], compute: Callable[[Mapping[str, str]], T],
+                rule_set: Optional["HeaderRuleSet"] = None) -> T:
+        """Return the cached analysis of ``headers``, computing it on a miss."""
+        rule_set = rule_set or get_rule_set()
+        key = (kind, rule_set.version, header_fingerprint(headers, rule_set.volatile_headers))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats_counters["hits"] += 1
+                return self._entries[key]
+            self.stats_counters["misses"] += 1
+
+        result = compute(headers)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats_counters["evictions"] += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for display."""
+        with self._lock:
+            lookups = self.stats_counters["hits"] + self.stats_counters["misses"]
+            return {
+                **self.stats_counters,
+                "entries": len(self._entries),
+                "hit_rate": self.stats_counters["hits"] / lookups if lookups else 0.0
+            }
+
+DEFAULT_RULES = (
+    HeaderRule(
+        "x-csrf-token", "X-CSRF-Token",
+        "Prevents Cross-Site Request Forgery attacks",
+        "Add X-CSRF-Token header for forms/mutations",
+        directions=(REQUEST,), risk_level="high"
+    ),
+    HeaderRule(
+        "x-xss-protection", "X-XSS-Protection",
+        "Provides XSS filtering capabilities",
+        "Set X-XSS-Protection: 1; mode=block",
+        validate=lambda value: value in ("1", "1; mode=block")
+    ),
+    HeaderRule(
+        "x-content-type-options", "X-Content-Type-Options",
+        "Prevents MIME type sniffing",
+        "Set X-Content-Type-Options: nosniff",
+        validate=lambda value: value.lower() == "nosniff"
+    ),
+    HeaderRule(
+        "strict-transport-security", "Strict-Transport-Security",
+        "Enforces HTTPS connections",
+        "Add Strict-Transport-Security header with appropriate max-age",
+        risk_level="high", validate=lambda value: bool(_HSTS_MAX_AGE.search(value))
+    ),
+    HeaderRule(
+        "x-frame-options", "X-Frame-Options",
+        "Prevents clickjacking attacks",
+        "Set X-Frame-Options to DENY or SAMEORIGIN",
+        validate=lambda value: value.upper() in ("DENY", "SAMEORIGIN")
+    ),
+    HeaderRule(
+        "permissions-policy", "Permissions-Policy",
+        "Controls browser features and APIs",
+        "Implement Permissions-Policy to restrict unwanted features",
+        directions=(REQUEST,)
+    ),
+    HeaderRule(
+        "content-security-policy", "Content-Security-Policy",
+        "Prevents various types of attacks including XSS",
+        "Implement a strict Content-Security-Policy",
+        risk_level="high", validate=bool
+    ),
+    HeaderRule(
+        "referrer-policy", "Referrer-Policy",
+        "Controls how much referrer information should be included",
+        "Set appropriate Referrer-Policy header",
+        directions=(REQUEST,), risk_level="low",
+        validate=lambda value: value.lower() in _REFERRER_POLICIES
+    ),
+    HeaderRule(
+        "content-type", "Content-Type",
+        "Declares the media type of the body",
+        "Specify Content-Type header",
+        group=CONTENT, validate=bool
+    ),
+    HeaderRule(
+        "accept", "Accept",
+        "Declares the expected response format",
+        "Specify Accept header for expected response format",
+        directions=(REQUEST,), group=CONTENT, validate=bool
+    ),
+    HeaderRule(
+        "accept-encoding", "Accept-Encoding",
+        "Declares supported content compression",
+        "Enable content compression by specifying Accept-Encoding",
+        directions=(REQUEST,), group=CONTENT
+    ),
+    HeaderRule(
+        "accept-language", "Accept-Language",
+        "Declares preferred response languages",
+        "Specify Accept-Language for localization",
+        directions=(REQUEST,), group=CONTENT
+    ),
+    HeaderRule(
+        "cache-control", "Cache-Control",
+        "Controls how the message may be cached",
+        "Set appropriate Cache-Control headers for sensitive data",
+        group=CACHING
+    ),
+)
+
+_default_rule_set: Optional[HeaderRuleSet] = None
+_default_cache: Optional[HeaderAnalysisCache] = None
+_default_lock = threading.Lock()
+
+def get_rule_set() -> HeaderRuleSet:
+    """Return the rule set shared by the request and response analyzers."""
+    global _default_rule_set
+    with _default_lock:
+        if _default_rule_set is None:
+            _default_rule_set = HeaderRuleSet(DEFAULT_RULES)
+        return _default_rule_set
+
+def get_analysis_cache() -> HeaderAnalysisCache:
+    """Return the shared process-wide header analysis cache."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HeaderAnalysisCache()
+        return _default_cache
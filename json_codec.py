@@ -0,0 +1,92 @@
+import json
+import math
+import re
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson's decode error subclasses this, so callers can catch one type (or ValueError)
+JSONDecodeError = json.JSONDecodeError
+
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+# orjson reads integers beyond 64 bits as floats; documents with a run of this many
+# digits may hold one and are parsed by the standard library instead
+_LONG_DIGITS = re.compile(r'\d{20}')
+_LONG_DIGITS_BYTES = re.compile(rb'\d{20}')
+
+def loads(data: JSONInput) -> Any:
+    """
+    Parse JSON from text or directly from bytes, without decoding to str first.
+    Uses orjson when installed; input it rejects (NaN, Infinity, ...) or may hold
+    integers beyond 64 bits is handed to the standard library, which also produces the
+    error for invalid documents. Either way the result is the same.
+    """
+    if orjson is not None:
+        long_digits = _LONG_DIGITS if isinstance(data, str) else _LONG_DIGITS_BYTES
+        if not long_digits.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False,
+                default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes; ``indent`` pretty-prints with two spaces. NaN and
+    infinities, which JSON cannot express, are written as null by both backends.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the standard library handles them
+    return _stdlib_dumps(obj, indent, sort_keys, default).encode()
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False,
+          default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize to a JSON string; see dumps_bytes."""
+    if orjson is not None:
+        return dumps_bytes(obj, indent, sort_keys, default).decode()
+    return _stdlib_dumps(obj, indent, sort_keys, default)
+
+def _finite(obj: Any) -> Any:
+    """``obj`` with NaN and infinite floats replaced by None, as orjson writes them."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(item) for item in obj]
+    return obj
+
+def _stdlib_dumps(obj: Any, indent: bool, sort_keys: bool,
+                  default: Optional[Callable[[Any], Any]]) -> str:
+    def _dumps(value: Any) -> str:
+        return json.dumps(
+            value,
+            indent=2 if indent else None,
+            sort_keys=sort_keys,
+            default=default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=None if indent else (",", ":")
+        )
+    try:
+        return _dumps(obj)
+    except ValueError:
+        # Out-of-range floats; only then is the structure copied
+        return _dumps(_finite(obj))
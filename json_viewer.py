@@ -0,0 +1,195 @@
+import math
+import re
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+import json_codec
+
+INLINE_VIEW_MAX_BYTES = 1024 * 1024   # Larger JSON bodies open in the paged viewer
+VIEWER_SPOOL_THRESHOLD = 64 * 1024 * 1024   # Bodies kept in memory (browsable) in the analyze view
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_LINES = 2000   # Lines rendered per page; bigger items are cut and can be opened by path
+
+PathPart = Union[str, int]
+
+_BYTES_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]|[^\s{}\[\],:"]+')
+_PATH_TOKEN = re.compile(r'\.([A-Za-z_$][\w$-]*)|\[(\d+)\]|\[\s*"((?:[^"\\]|\\.)*)"\s*\]|\[\s*\'([^\']*)\'\s*\]')
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$-]*\Z')
+
+def _is_container(value: Any) -> bool:
+    return isinstance(value, (dict, list)) and len(value) > 0
+
+def _brackets(value: Any) -> str:
+    return "{}" if isinstance(value, dict) else "[]"
+
+def _children(node: Any, sort_keys: bool = False) -> Iterator[tuple]:
+    if isinstance(node, dict):
+        keys = sorted(node, key=str) if sort_keys else node
+        return ((key, node[key]) for key in keys)
+    return ((None, item) for item in node)
+
+def _scalar(value: Any) -> str:
+    return json_codec.dumps(value)
+
+def iter_pretty_lines(value: Any, indent: int = 2, sort_keys: bool = False) -> Iterator[str]:
+    """
+    Pretty-print a parsed JSON value one line at a time. Nothing is rendered ahead of
+    the consumer and nesting is handled with an explicit stack, so taking the first
+    page of a huge document costs only that page.
+    """
+    if not _is_container(value):
+        yield _scalar(value)
+        return
+    pad = " " * indent
+    stack = [[_children(value, sort_keys), len(value), _brackets(value)[1]]]
+    yield _brackets(value)[0]
+    while stack:
+        frame = stack[-1]
+        try:
+            key, child = next(frame[0])
+        except StopIteration:
+            stack.pop()
+            yield pad * len(stack) + frame[2] + ("," if stack and stack[-1][1] > 0 else "")
+            continue
+        frame[1] -= 1
+        prefix = pad * len(stack) + ("" if key is None else _scalar(str(key)) + ": ")
+        if _is_container(child):
+            yield prefix + _brackets(child)[0]
+            stack.append([_children(child, sort_keys), len(child), _brackets(child)[1]])
+        else:
+            yield prefix + _scalar(child) + ("," if frame[1] > 0 else "")
+
+def iter_pretty_bytes(data: Union[bytes, bytearray, memoryview], indent: int = 2) -> Iterator[str]:
+    """
+    Re-indent raw JSON bytes one line at a time without parsing them into objects.
+    Key order is kept as sent; invalid input is formatted on a best-effort basis.
+    """
+    pad = " " * indent
+    depth = 0
+    line = ""
+    just_opened = False
+    for match in _BYTES_TOKEN.finditer(data):
+        token = match.group().decode("utf-8", errors="replace")
+        if just_opened:
+            just_opened = False
+            if token in "}]":
+                line += token
+                depth -= 1
+                continue
+            yield line
+            line = pad * depth
+        if token in "{[":
+            line += token
+            depth += 1
+            just_opened = True
+        elif token in "}]":
+            yield line
+            depth = max(0, depth - 1)
+            line = pad * depth + token
+        elif token == ",":
+            yield line + ","
+            line = pad * depth
+        elif token == ":":
+            line += ": "
+        else:
+            line += token
+    if line.strip():
+        yield line
+
+def parse_json_path(path: str) -> List[PathPart]:
+    """Split a path such as ``$.items[3].name`` or ``$["a key"][0]`` into its parts."""
+    path = path.strip()
+    if path.startswith("$"):
+        path = path[1:]
+    parts: List[PathPart] = []
+    position = 0
+    while position < len(path):
+        match = _PATH_TOKEN.match(path, position)
+        if not match:
+            raise ValueError(f"Invalid JSON path near '{path[position:]}'")
+        name, index, quoted, single = match.groups()
+        if index is not None:
+            parts.append(int(index))
+        elif quoted is not None:
+            parts.append(json_codec.loads(f'"{quoted}"'))
+        else:
+            parts.append(name if name is not None else single)
+        position = match.end()
+    return parts
+
+def format_json_path(parts: Iterable[PathPart]) -> str:
+    path = "$"
+    for part in parts:
+        if isinstance(part, int):
+            path += f"[{part}]"
+        elif _IDENTIFIER.match(part):
+            path += f".{part}"
+        else:
+            path += f"[{_scalar(part)}]"
+    return path
+
+def resolve_json_path(value: Any, path: str) -> Any:
+    """The node at ``path``; raises ValueError if the path does not exist."""
+    node = value
+    for depth, part in enumerate(parse_json_path(path)):
+        try:
+            if isinstance(node, list) and isinstance(part, int):
+                node = node[part]
+            elif isinstance(node, dict):
+                node = node[str(part)]
+            else:
+                raise KeyError(part)
+        except (KeyError, IndexError):
+            raise ValueError(f"Path not found: {format_json_path(parse_json_path(path)[:depth + 1])}")
+    return node
+
+def describe(value: Any) -> str:
+    """Short type/size description of a node."""
+    if isinstance(value, dict):
+        return f"object ({len(value)} keys)"
+    if isinstance(value, list):
+        return f"array ({len(value)} items)"
+    return type(value).__name__ if value is not None else "null"
+
+def page_children(node: Any, path: str = "$", page: int = 1, page_size: int = DEFAULT_PAGE_SIZE,
+                  max_lines: int = MAX_PAGE_LINES) -> Dict[str, Any]:
+    """
+    One page of a container's children, pretty-printed. Only the children on the page
+    are rendered (and at most ``max_lines`` lines in total), however large the node is.
+    """
+    base = parse_json_path(path)
+    if not isinstance(node, (dict, list)):
+        lines = list(islice(iter_pretty_lines(node), max_lines))
+        return {'path': path, 'total': 1, 'pages': 1, 'page': 1, 'items': [], 'text': "\n".join(lines), 'truncated': False}
+
+    total = len(node)
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+    if isinstance(node, dict):
+        window = [(key, node[key]) for key in islice(node, start, start + page_size)]
+    else:
+        window = list(enumerate(node[start:start + page_size], start))
+
+    items, lines, truncated = [], [], False
+    for key, child in window:
+        child_path = format_json_path([*base, key])
+        items.append({'path': child_path, 'key': key, 'type': describe(child)})
+        if truncated:
+            continue
+        lines.append(f"// {child_path}")
+        budget = max_lines - len(lines)
+        child_lines = list(islice(iter_pretty_lines(child), budget + 1))
+        if len(child_lines) > budget:
+            child_lines = child_lines[:budget] + ["…"]
+            truncated = True
+        lines.extend(child_lines)
+    return {
+        'path': path,
+        'total': total,
+        'pages': pages,
+        'page': page,
+        'items': items,
+        'text': "\n".join(lines),
+        'truncated': truncated
+    }
@@ -0,0 +1,157 @@
+import math
+from array import array
+from typing import Dict, Any, Iterator, Tuple
+
+class LatencyHistogram:
+    """
+    Fixed-memory, HDR-style latency histogram.
+
+    Values (integers, microseconds by convention) are counted in log-linear buckets that
+    keep ``significant_digits`` of precision across the whole ``lowest``..``highest`` range,
+    so percentiles stay accurate no matter how many values are recorded. Histograms with
+    the same configuration merge losslessly.
+    """
+
+    def __init__(self, lowest: int = 1, highest: int = 3_600_000_000, significant_digits: int = 3):
+        if lowest < 1 or highest < 2 * lowest or not 1 <= significant_digits <= 5:
+            raise ValueError("Invalid histogram range or precision")
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_digits = significant_digits
+
+        self._unit_magnitude = int(math.floor(math.log2(lowest)))
+        sub_bucket_count_magnitude = int(math.ceil(math.log2(2 * 10 ** significant_digits)))
+        self._sub_half_magnitude = sub_bucket_count_magnitude - 1
+        self._sub_bucket_count = 1 << sub_bucket_count_magnitude
+        self._sub_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        smallest_untrackable = self._sub_bucket_count << self._unit_magnitude
+        bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self._counts = array("Q", bytes(8 * (bucket_count + 1) * self._sub_half_count))
+
+        self.total_count = 0
+        self.min = 0
+        self.max = 0
+        self.sum = 0
+
+    def _index_for(self, value: int) -> int:
+        bucket_index = ((value | self._sub_bucket_mask).bit_length()
+                        - self._unit_magnitude - (self._sub_half_magnitude + 1))
+        sub_bucket_index = value >> (bucket_index + self._unit_magnitude)
+        return ((bucket_index + 1) << self._sub_half_magnitude) + (sub_bucket_index - self._sub_half_count)
+
+    def _range_for_index(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value counted at a given index."""
+        bucket_index = (index >> self._sub_half_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_half_count - 1)) + self._sub_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_half_count
+            bucket_index = 0
+        shift = bucket_index + self._unit_magnitude
+        lowest = sub_bucket_index << shift
+        return lowest, lowest + (1 << shift) - 1
+
+    def record(self, value: int, count: int = 1):
+        """Record a value; values outside the trackable range are clamped."""
+        value = min(max(int(value), 0), self.highest)
+        self._counts[self._index_for(value)] += count
+        if self.total_count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total_count += count
+        self.sum += value * count
+
+    def percentile(self, percentile: float) -> int:
+        """Value at the given percentile (0-100), reported as the bucket's upper bound."""
+        if self.total_count == 0:
+            return 0
+        target = max(1, int(math.ceil(percentile / 100 * self.total_count)))
+        running = 0
+        for index, count in enumerate(self._counts):
+            if count:
+                running += count
+                if running >= target:
+                    return min(self._range_for_index(index)[1], self.max)
+        return self.max
+
+    def percentiles(self, percentiles=(50, 90, 99, 99.9)) -> Dict[str, int]:
+        """Several percentiles in a single pass over the counts."""
+        targets = sorted(percentiles)
+        results = {}
+        if self.total_count == 0:
+            return {f"p{p:g}": 0 for p in targets}
+        running, position = 0, 0
+        for index, count in enumerate(self._counts):
+            if not count:
+                continue
+            running += count
+            while position < len(targets) and running >= max(1, math.ceil(targets[position] / 100 * self.total_count)):
+                results[f"p{targets[position]:g}"] = min(self._range_for_index(index)[1], self.max)
+                position += 1
+            if position == len(targets):
+                break
+        return results
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total_count if self.total_count else 0.0
+
+    def iter_buckets(self) -> Iterator[Tuple[int, int]]:
+        """Yield (upper bound value, count) for every non-empty bucket."""
+        for index, count in enumerate(self._counts):
+            if count:
+                yield self._range_for_index(index)[1], count
+
+    def _check_compatible(self, other: "LatencyHistogram"):
+        if (self.lowest, self.highest, self.significant_digits) != (other.lowest, other.highest, other.significant_digits):
+            raise ValueError("Cannot merge histograms with different configurations")
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's counts into this one."""
+        self._check_compatible(other)
+        if other.total_count == 0:
+            return self
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self.min = other.min if self.total_count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total_count += other.total_count
+        self.sum += other.sum
+        return self
+
+    def reset(self):
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+        self.total_count = self.min = self.max = self.sum = 0
+
+    def copy(self) -> "LatencyHistogram":
+        return LatencyHistogram.from_dict(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact, JSON-serializable form holding only the non-empty buckets."""
+        return {
+            "config": [self.lowest, self.highest, self.significant_digits],
+            "counts": [[index, count] for index, count in enumerate(self._counts) if count],
+            "total_count": self.total_count,
+            "min": self.min,
+            "max": self.max,
+            "sum": self.sum
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(*data["config"])
+        for index, count in data["counts"]:
+            histogram._counts[index] = count
+        histogram.total_count = data["total_count"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        histogram.sum = data["sum"]
+        return histogram
@@ -0,0 +1,254 @@
+import asyncio
+import hmac
+import ipaddress
+import os
+import socket
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import json_codec
+from curl_parser import referenced_files
+from load_tester import LoadPlan, LoadStats, run_load_test_sync
+from load_workers import merge_stats, run_multiprocess
+from parse_cache import get_parse_cache
+
+DEFAULT_AGENT_PORT = 7070
+PROTOCOL_VERSION = 1
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# Wire protocol: one JSON object per line.
+#   agent -> coordinator  {"type": "hello", "agent": ..., "cpus": ..., "version": 1}
+#   coordinator -> agent  {"type": "plan", "plan": {...} | "curl_command": "...",
+#                          "processes": 1, "snapshot_interval": 1.0, "token": ...}
+#   agent -> coordinator  {"type": "snapshot", "stats": {...}}  (cumulative, every interval)
+#                         {"type": "done", "stats": {...}} or {"type": "error", "message": ...}
+#
+# Agents bound beyond loopback require a token. Plans from remote coordinators may not
+# reference files on the agent (file bodies, -F @file parts, -d @file data, TLS
+# certificates and keys) or send through a proxy, and run on at most one process per CPU.
+
+async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    writer.write(json_codec.dumps_bytes(message) + b"\n")
+    await writer.drain()
+
+async def _receive(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    message = json_codec.loads(line)
+    if not isinstance(message, dict) or not isinstance(message.get("type"), str):
+        raise ValueError("Malformed protocol message")
+    return message
+
+def is_loopback(host: str) -> bool:
+    """True for addresses only reachable from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+def local_file_references(plan: LoadPlan) -> List[str]:
+    """Paths on this machine that running ``plan`` would read."""
+    paths = []
+    for request in plan.request_sequence():
+        options = request.get("options") or {}
+        if request.get("body_file"):
+            paths.append(request["body_file"]["path"])
+        paths.extend(part["file"] for part in request.get("form") or [] if "file" in part)
+        paths.extend(options.get("data_files", []))
+        # Handed to requests as verify/cert, which open them
+        paths.extend(options[key] for key in ("cacert", "cert", "key") if options.get(key))
+    return paths
+
+def check_remote_plan(plan: LoadPlan):
+    """Raise ValueError if ``plan`` may not be run for a coordinator on another machine."""
+    if local_file_references(plan):
+        raise ValueError("Plans from remote coordinators cannot reference local files")
+    if any((request.get("options") or {}).get("proxy") for request in plan.request_sequence()):
+        raise ValueError("Plans from remote coordinators cannot send through a proxy")
+
+def _portable_plan(plan: LoadPlan) -> Dict[str, Any]:
+    """The plan as sent to agents; data read from files is already inlined, so drop its paths."""
+    data = plan.to_dict()
+    for request in [data["request_data"], *data["collection_requests"]]:
+        if request.get("options"):
+            request["options"]["data_files"] = []
+    return data
+
+def plan_from_message(message: Dict[str, Any]) -> LoadPlan:
+    """Build a LoadPlan from a plan message carrying either a full plan or a curl command."""
+    if "plan" in message:
+        return LoadPlan.from_dict(message["plan"])
+    if "curl_command" in message:
+        options = message.get("options", {})
+        return LoadPlan(request_data=get_parse_cache().parse(message["curl_command"]), **options)
+    raise ValueError("Plan message needs a 'plan' or a 'curl_command'")
+
+class LoadAgent:
+    """
+    Accepts load plans from a coordinator over TCP, runs them with the same engine as the
+    studio and streams cumulative histogram snapshots back while the run is in progress.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_AGENT_PORT,
+                 token: Optional[str] = None):
+        if not token and not is_loopback(host):
+            raise ValueError(f"Refusing to listen on {host} without a token; set one with --token")
+        self.host = host
+        self.port = port
+        self.token = token
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port (useful when started on port 0)."""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_MESSAGE_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            await _send(writer, {
+                "type": "hello",
+                "agent": socket.gethostname(),
+                "cpus": os.cpu_count(),
+                "version": PROTOCOL_VERSION
+            })
+            message = await _receive(reader)
+            if message is None or message.get("type") != "plan":
+                return
+            if self.token is not None and not hmac.compare_digest(
+                str(message.get("token") or "").encode(), self.token.encode()
+            ):
+                await _send(writer, {"type": "error", "message": "Invalid agent token"})
+                return
+
+            peer = writer.get_extra_info("peername")
+            remote = not (peer and is_loopback(peer[0]))
+            # Parsing reads -d @file data, so commands are checked before they are parsed
+            if remote and isinstance(message.get("curl_command"), str) and referenced_files(message["curl_command"]):
+                raise ValueError("Plans from remote coordinators cannot reference local files")
+            plan = plan_from_message(message)
+            if remote:
+                check_remote_plan(plan)
+            processes = max(1, min(int(message.get("processes", 1)), os.cpu_count() or 1))
+            interval = float(message.get("snapshot_interval", 1.0))
+
+            def _on_progress(stats: LoadStats):
+                asyncio.run_coroutine_threadsafe(
+                    _send(writer, {"type": "snapshot", "stats": stats.to_dict()}), loop
+                )
+
+            stats = await loop.run_in_executor(
+                None, _run_plan, plan, processes, _on_progress, interval
+            )
+            await _send(writer, {"type": "done", "stats": stats.to_dict()})
+        except Exception as e:
+            try:
+                await _send(writer, {"type": "error", "message": f"{type(e).__name__}: {e}"})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+def _run_plan(plan: LoadPlan, processes: int, on_progress: Callable[[LoadStats], None],
+              interval: float) -> LoadStats:
+    if processes > 1:
+        return run_multiprocess(plan, processes, on_progress, interval)
+    return run_load_test_sync(plan, on_progress, interval)
+
+def run_agent(host: str = "127.0.0.1", port: int = DEFAULT_AGENT_PORT, token: Optional[str] = None):
+    """Run an agent until interrupted."""
+    agent = LoadAgent(host, port, token)
+    print(f"curlman agent listening on {host}:{port}")
+    asyncio.run(agent.serve_forever())
+
+def parse_agent_address(address: str) -> Tuple[str, int]:
+    """Parse 'host:port' (port defaults to the agent port)."""
+    host, _, port = address.strip().rpartition(":")
+    if not host:
+        return port, DEFAULT_AGENT_PORT
+    return host.strip("[]"), int(port)
+
+class AgentCoordinator:
+    """Splits a plan across remote agents and merges their streamed snapshots."""
+
+    def __init__(self, agents: List[Tuple[str, int]], token: Optional[str] = None):
+        if not agents:
+            raise ValueError("At least one agent is required")
+        self.agents = agents
+        self.token = token
+        self.agent_info: Dict[int, Dict[str, Any]] = {}
+        self.errors: Dict[int, str] = {}
+
+    async def run(self, plan: LoadPlan, processes_per_agent: int = 1,
+                  on_progress: Optional[Callable[[LoadStats], None]] = None,
+                  snapshot_interval: float = 1.0) -> LoadStats:
+        shares = plan.split(len(self.agents))
+        latest: Dict[int, LoadStats] = {}
+        finished: Dict[int, LoadStats] = {}
+
+        async def _drive(agent_id: int, address: Tuple[str, int], share: LoadPlan):
+            reader, writer = await asyncio.open_connection(*address, limit=MAX_MESSAGE_BYTES)
+            try:
+                self.agent_info[agent_id] = await _receive(reader) or {}
+                await _send(writer, {
+                    "type": "plan",
+                    "plan": _portable_plan(share),
+                    "processes": processes_per_agent,
+                    "snapshot_interval": snapshot_interval,
+                    "token": self.token
+                })
+                while (message := await _receive(reader)) is not None:
+                    kind = message["type"]
+                    if kind == "error":
+                        self.errors[agent_id] = str(message.get("message", "Unknown agent error"))
+                        return
+                    if kind not in ("snapshot", "done") or not isinstance(message.get("stats"), dict):
+                        raise ValueError(f"Unexpected agent message: {kind}")
+                    stats = LoadStats.from_dict(message["stats"])
+                    latest[agent_id] = stats
+                    if kind == "done":
+                        finished[agent_id] = stats
+                        return
+                    if on_progress:
+                        on_progress(merge_stats(latest.values()))
+                self.errors[agent_id] = "Agent closed the connection before finishing"
+            finally:
+                writer.close()
+
+        async def _guarded(agent_id: int, address: Tuple[str, int], share: LoadPlan):
+            try:
+                await _drive(agent_id, address, share)
+            except Exception as e:
+                # One misbehaving agent must not abort the others
+                self.errors[agent_id] = f"{type(e).__name__}: {e}"
+
+        await asyncio.gather(*(
+            _guarded(agent_id, address, share)
+            for agent_id, (address, share) in enumerate(zip(self.agents, shares))
+        ))
+        if not finished:
+            raise RuntimeError(f"All agents failed: {'; '.join(self.errors.values()) or 'no results'}")
+        return merge_stats(finished.values())
+
+def run_distributed(plan: LoadPlan, agents: List[Tuple[str, int]], processes_per_agent: int = 1,
+                    on_progress: Optional[Callable[[LoadStats], None]] = None,
+                    token: Optional[str] = None) -> LoadStats:
+    """Synchronous entry point for AgentCoordinator.run."""
+    coordinator = AgentCoordinator(agents, token)
+    return asyncio.run(coordinator.run(plan, processes_per_agent, on_progress))
@@ -0,0 +1,120 @@
+import math
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, Iterator, List, Optional
+
+@dataclass
+class ProfileStage:
+    """``duration`` seconds at ``rate`` requests/second, ramping linearly to ``end_rate`` if set."""
+    duration: float
+    rate: float
+    end_rate: Optional[float] = None
+
+    @property
+    def final_rate(self) -> float:
+        return self.rate if self.end_rate is None else self.end_rate
+
+    @property
+    def expected_requests(self) -> float:
+        return (self.rate + self.final_rate) / 2 * self.duration
+
+    def offset_of(self, n: float) -> float:
+        """Seconds into the stage at which the n-th arrival (counted from 0) is due."""
+        slope = (self.final_rate - self.rate) / (2 * self.duration)
+        if abs(slope) < 1e-12:
+            return n / self.rate
+        # Arrivals so far are rate*t + slope*t^2; solve for t.
+        return (-self.rate + math.sqrt(max(0.0, self.rate ** 2 + 4 * slope * n))) / (2 * slope)
+
+@dataclass
+class LoadProfile:
+    """
+    Declarative arrival-rate profile: a sequence of constant or linearly ramping stages.
+    Build one with constant(), ramp(), steps() or soak(), or from a dict such as
+    ``{"stages": [{"duration": 60, "rate": 10, "end_rate": 200}]}`` or the shorthand
+    ``{"type": "steps", "rates": [10, 50, 100], "step_duration": 30}``.
+    """
+    stages: List[ProfileStage] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.stages = [s if isinstance(s, ProfileStage) else ProfileStage(**s) for s in self.stages]
+        if not self.stages:
+            raise ValueError("A load profile needs at least one stage")
+        for stage in self.stages:
+            if stage.duration <= 0 or stage.rate < 0 or stage.final_rate < 0:
+                raise ValueError(f"Invalid profile stage: {stage}")
+
+    @classmethod
+    def constant(cls, rate: float, duration: float) -> "LoadProfile":
+        return cls([ProfileStage(duration, rate)])
+
+    @classmethod
+    def ramp(cls, start_rate: float, end_rate: float, duration: float,
+             hold: float = 0.0) -> "LoadProfile":
+        """Linear ramp, optionally holding the final rate for ``hold`` seconds."""
+        stages = [ProfileStage(duration, start_rate, end_rate)]
+        if hold > 0:
+            stages.append(ProfileStage(hold, end_rate))
+        return cls(stages)
+
+    @classmethod
+    def steps(cls, rates: List[float], step_duration: float) -> "LoadProfile":
+        return cls([ProfileStage(step_duration, rate) for rate in rates])
+
+    @classmethod
+    def soak(cls, rate: float, duration: float, ramp_up: float = 60.0) -> "LoadProfile":
+        """Long run at a steady rate after a gentle ramp-up, for leaks and GC pauses."""
+        stages = [ProfileStage(ramp_up, 0.0, rate)] if ramp_up > 0 else []
+        return cls(stages + [ProfileStage(duration, rate)])
+
+    @property
+    def total_duration(self) -> float:
+        return sum(stage.duration for stage in self.stages)
+
+    @property
+    def peak_rate(self) -> float:
+        return max(max(stage.rate, stage.final_rate) for stage in self.stages)
+
+    def rate_at(self, elapsed: float) -> float:
+        """Target arrival rate ``elapsed`` seconds into the run (0 once it is over)."""
+        for stage in self.stages:
+            if elapsed < stage.duration:
+                return stage.rate + (stage.final_rate - stage.rate) * elapsed / stage.duration
+            elapsed -= stage.duration
+        return 0.0
+
+    def schedule(self) -> Iterator[float]:
+        """
+        Intended send offsets (seconds from the start) of every request. Offsets come from
+        the integral of the rate, so ramps stay exact over long runs instead of drifting.
+        """
+        stage_start = 0.0
+        arrivals_before = 0.0
+        index = 0
+        for stage in self.stages:
+            expected = stage.expected_requests
+            while index - arrivals_before < expected:
+                yield stage_start + stage.offset_of(index - arrivals_before)
+                index += 1
+            stage_start += stage.duration
+            arrivals_before += expected
+
+    def scaled(self, factor: float) -> "LoadProfile":
+        """The same shape with every rate multiplied by ``factor``."""
+        return LoadProfile([
+            ProfileStage(s.duration, s.rate * factor, None if s.end_rate is None else s.end_rate * factor)
+            for s in self.stages
+        ])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadProfile":
+        if "stages" in data:
+            return cls(data["stages"])
+        kind = data.get("type")
+        options = {key: value for key, value in data.items() if key != "type"}
+        builders = {"constant": cls.constant, "ramp": cls.ramp, "steps": cls.steps, "soak": cls.soak}
+        if kind not in builders:
+            raise ValueError(f"Unknown load profile type: {kind}")
+        return builders[kind](**options)
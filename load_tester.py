@@ -0,0 +1,351 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, replace
+from typing import Dict, Any, Callable, List, Optional
+
+from compiled_request import CompiledRequest
+from connection_pool import get_pool_manager
+from dns_cache import get_dns_cache
+from latency_histogram import LatencyHistogram
+from load_profiles import LoadProfile
+from load_windows import WindowedStats
+from response_analyzer import execute_request
+from response_model import ExecutionResult
+
+REPORTED_PERCENTILES = (50, 90, 95, 99, 99.9)
+MAX_QUEUED_PER_WORKER = 2   # Open-loop sends allowed in flight or queued per worker
+
+@dataclass
+class LoadPlan:
+    """
+    What to run: a parsed request, how many workers and for how long (or how many requests).
+    Setting ``rate`` switches from closed-loop workers to an open-loop schedule of ``rate``
+    requests per second, with ``concurrency`` capping the requests in flight.
+    ``collection_requests`` (e.g. the rest of a collection) are sent in rotation with
+    ``request_data``. A ``profile`` (ramp, steps, soak...) replaces ``rate`` and ``duration``
+    with a time-varying open-loop schedule. ``variables`` are substituted once, when the
+    requests are compiled at the start of the run.
+    """
+    request_data: dict
+    concurrency: int = 10
+    duration: Optional[float] = 30.0        # Seconds; None to stop on total_requests only
+    total_requests: Optional[int] = None
+    environment: str = "default"
+    rate: Optional[float] = None            # Requests per second for open-loop runs
+    collection_requests: List[dict] = field(default_factory=list)
+    profile: Optional[LoadProfile] = None
+    variables: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if isinstance(self.profile, dict):
+            self.profile = LoadProfile.from_dict(self.profile)
+
+    def request_sequence(self) -> List[dict]:
+        """All requests of the plan, in the order they are rotated through."""
+        return [self.request_data, *self.collection_requests]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadPlan":
+        return cls(**data)
+
+    def split(self, parts: int) -> List["LoadPlan"]:
+        """Divide the plan's concurrency, rate and request budget into ``parts`` shares."""
+        parts = max(1, min(parts, self.concurrency, self.total_requests or parts))
+        shares = []
+        for index in range(parts):
+            total = None
+            if self.total_requests is not None:
+                total = self.total_requests // parts + (1 if index < self.total_requests % parts else 0)
+            shares.append(replace(
+                self,
+                concurrency=self.concurrency // parts + (1 if index < self.concurrency % parts else 0),
+                total_requests=total,
+                rate=self.rate / parts if self.rate is not None else None,
+                profile=self.profile.scaled(1 / parts) if self.profile is not None else None
+            ))
+        return shares
+
+class LoadStats:
+    """
+    Aggregated outcome of a load run in fixed memory: latency histograms (microseconds)
+    plus counters for the whole run, and per-second windows (see load_windows) for trends
+    over time. Individual results are folded in and discarded.
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.corrected_latency = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.dropped = 0        # Open-loop sends skipped because too many were in flight
+        self.bytes_received = 0
+        self.status_counts: Dict[str, int] = {}
+        self.error_types: Dict[str, int] = {}
+        self.elapsed = 0.0
+        self.windows = WindowedStats()
+        self._started_ns = time.perf_counter_ns()
+
+    def start(self):
+        """Mark the start of the run; windows count seconds from here."""
+        self._started_ns = time.perf_counter_ns()
+
+    def _current_second(self) -> int:
+        return (time.perf_counter_ns() - self._started_ns) // 1_000_000_000
+
+    def record_result(self, result: ExecutionResult, corrected_ns: Optional[int] = None):
+        """
+        Fold in one execute_request result; HTTP 4xx/5xx count as errors. ``corrected_ns``
+        is the latency measured from the intended send time in open-loop runs; when given it
+        is also the latency recorded in the current window.
+        """
+        latency_us = result.timing.total_time // 1000
+        self.requests += 1
+        self.latency.record(latency_us)
+        if corrected_ns is not None:
+            latency_us = corrected_ns // 1000
+            self.corrected_latency.record(latency_us)
+        self.ttfb.record(result.timing.time_to_first_byte // 1000)
+        self.bytes_received += result.size_bytes
+        status = str(result.status_code)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        failed = result.status_code >= 400
+        if failed:
+            self.errors += 1
+        self.windows.record(self._current_second(), latency_us, result.size_bytes, failed)
+
+    def record_error(self, error: Exception):
+        """Count a request that failed before producing a response."""
+        self.requests += 1
+        self.errors += 1
+        name = type(error).__name__
+        self.error_types[name] = self.error_types.get(name, 0) + 1
+        self.windows.record(self._current_second(), None, error=True)
+
+    def record_dropped(self):
+        """
+        Count a scheduled send that was skipped because the in-flight cap was reached.
+        It was due and never served, so it counts as a failure in the error rates.
+        """
+        self.dropped += 1
+        self.windows.record(self._current_second(), None, error=True)
+
+    def merge(self, other: "LoadStats") -> "LoadStats":
+        """Combine another run's statistics into this one."""
+        self.latency.merge(other.latency)
+        self.corrected_latency.merge(other.corrected_latency)
+        self.ttfb.merge(other.ttfb)
+        self.requests += other.requests
+        self.errors += other.errors
+        self.dropped += other.dropped
+        self.bytes_received += other.bytes_received
+        for key, count in other.status_counts.items():
+            self.status_counts[key] = self.status_counts.get(key, 0) + count
+        for key, count in other.error_types.items():
+            self.error_types[key] = self.error_types.get(key, 0) + count
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.windows.merge(other.windows)
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Throughput, error rate and latency percentiles (milliseconds) for display.
+        Dropped sends count as failed attempts in ``error_rate``.
+        """
+        attempts = self.requests + self.dropped
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'error_rate': (self.errors + self.dropped) / attempts if attempts else 0.0,
+            'throughput_rps': self.requests / self.elapsed if self.elapsed else 0.0,
+            'elapsed_seconds': self.elapsed,
+            'bytes_received': self.bytes_received,
+            'latency_ms': _histogram_summary(self.latency),
+            'corrected_latency_ms': _histogram_summary(self.corrected_latency) if self.corrected_latency.total_count else None,
+            'ttfb_ms': _histogram_summary(self.ttfb),
+            'status_counts': dict(self.status_counts),
+            'error_types': dict(self.error_types),
+            'last_10s': self.windows.rolling(10)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'latency': self.latency.to_dict(),
+            'corrected_latency': self.corrected_latency.to_dict(),
+            'ttfb': self.ttfb.to_dict(),
+            'requests': self.requests,
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'bytes_received': self.bytes_received,
+            'status_counts': self.status_counts,
+            'error_types': self.error_types,
+            'elapsed': self.elapsed,
+            'windows': self.windows.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadStats":
+        stats = cls()
+        stats.latency = LatencyHistogram.from_dict(data['latency'])
+        stats.corrected_latency = LatencyHistogram.from_dict(data['corrected_latency'])
+        stats.ttfb = LatencyHistogram.from_dict(data['ttfb'])
+        stats.requests = data['requests']
+        stats.errors = data['errors']
+        stats.dropped = data.get('dropped', 0)
+        stats.bytes_received = data['bytes_received']
+        stats.status_counts = dict(data['status_counts'])
+        stats.error_types = dict(data['error_types'])
+        stats.elapsed = data['elapsed']
+        stats.windows = WindowedStats.from_dict(data['windows'])
+        return stats
+
+def _histogram_summary(histogram: LatencyHistogram) -> Dict[str, float]:
+    summary = {key: value / 1000 for key, value in histogram.percentiles(REPORTED_PERCENTILES).items()}
+    summary['mean'] = histogram.mean / 1000
+    summary['max'] = histogram.max / 1000
+    return summary
+
+async def run_load_test(plan: LoadPlan, on_progress: Optional[Callable[[LoadStats], None]] = None,
+                        progress_interval: float = 1.0) -> LoadStats:
+    """
+    Run a load plan and return its aggregated statistics. Plans with a ``rate`` or a
+    ``profile`` run open loop (see _run_open_loop); otherwise ``plan.concurrency`` closed-loop workers each send
+    the next request as soon as the previous one finishes. The run stops when the duration
+    elapses or total_requests have been sent.
+    """
+    if plan.profile is None and plan.duration is None and plan.total_requests is None:
+        raise ValueError("A load plan needs a duration or a total request count")
+    if plan.rate is not None and plan.rate <= 0:
+        raise ValueError("Arrival rate must be positive")
+
+    stats = LoadStats()
+    loop = asyncio.get_running_loop()
+
+    # Prepare every request once; workers only send the compiled form
+    sequence = [CompiledRequest(r, plan.environment, plan.variables) for r in plan.request_sequence()]
+
+    with get_pool_manager().reserve_capacity(plan.concurrency), \
+            ThreadPoolExecutor(max_workers=plan.concurrency, thread_name_prefix="curlman-load") as executor:
+        await loop.run_in_executor(
+            executor, get_dns_cache().warm, [compiled.url for compiled in sequence]
+        )
+        start = loop.time()
+        stats.start()
+
+        async def _report():
+            while True:
+                await asyncio.sleep(progress_interval)
+                stats.elapsed = loop.time() - start
+                on_progress(stats)
+
+        reporter = asyncio.create_task(_report()) if on_progress else None
+        try:
+            if plan.rate is not None or plan.profile is not None:
+                await _run_open_loop(plan, stats, executor, sequence)
+            else:
+                await _run_closed_loop(plan, stats, executor, sequence)
+        finally:
+            if reporter:
+                reporter.cancel()
+        stats.elapsed = loop.time() - start
+    return stats
+
+async def _run_closed_loop(plan: LoadPlan, stats: LoadStats, executor: ThreadPoolExecutor,
+                           sequence: List[CompiledRequest]):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + plan.duration if plan.duration is not None else None
+    issued = 0
+
+    def _claim() -> Optional[CompiledRequest]:
+        nonlocal issued
+        if plan.total_requests is not None and issued >= plan.total_requests:
+            return None
+        if deadline is not None and loop.time() >= deadline:
+            return None
+        issued += 1
+        return sequence[(issued - 1) % len(sequence)]
+
+    async def _worker():
+        while (request_data := _claim()) is not None:
+            try:
+                result = await loop.run_in_executor(
+                    executor, execute_request, request_data, plan.environment
+                )
+            except Exception as e:
+                stats.record_error(e)
+            else:
+                stats.record_result(result)
+
+    await asyncio.gather(*(_worker() for _ in range(plan.concurrency)))
+
+async def _run_open_loop(plan: LoadPlan, stats: LoadStats, executor: ThreadPoolExecutor,
+                         sequence: List[CompiledRequest]):
+    """
+    Issue requests on a schedule (a fixed rate, or the plan's profile) regardless of how
+    fast responses come back. Each request's corrected latency runs from its intended send time, so time spent
+    waiting behind a slow server (or for a free worker) is counted instead of silently
+    omitted; the raw latency from the actual send is recorded alongside. At most
+    ``concurrency * MAX_QUEUED_PER_WORKER`` sends are in flight or queued; sends scheduled
+    past that are dropped rather than queued, so overload cannot grow memory, and count
+    as failures in the error rate.
+    """
+    loop = asyncio.get_running_loop()
+    if plan.profile is not None:
+        offsets, duration = plan.profile.schedule(), plan.profile.total_duration
+    else:
+        offsets, duration = (n / plan.rate for n in itertools.count()), plan.duration
+    start_ns = time.perf_counter_ns()
+    deadline_ns = start_ns + int(duration * 1_000_000_000) if duration is not None else None
+    max_pending = plan.concurrency * MAX_QUEUED_PER_WORKER
+    pending = set()
+
+    def _collect(future: asyncio.Future):
+        pending.discard(future)
+        result, corrected_ns, error = future.result()
+        if error is not None:
+            stats.record_error(error)
+        else:
+            stats.record_result(result, corrected_ns)
+
+    sent = 0
+    for offset in offsets:
+        if plan.total_requests is not None and sent >= plan.total_requests:
+            break
+        intended_ns = start_ns + int(offset * 1_000_000_000)
+        if deadline_ns is not None and intended_ns >= deadline_ns:
+            break
+        delay_ns = intended_ns - time.perf_counter_ns()
+        if delay_ns > 0:
+            await asyncio.sleep(delay_ns / 1_000_000_000)
+        if len(pending) >= max_pending:
+            stats.record_dropped()
+            sent += 1
+            continue
+        future = loop.run_in_executor(
+            executor, _execute_scheduled, sequence[sent % len(sequence)], plan.environment, intended_ns
+        )
+        pending.add(future)
+        future.add_done_callback(_collect)
+        sent += 1
+
+    if pending:
+        await asyncio.wait(list(pending))
+
+def _execute_scheduled(request_data: CompiledRequest, environment: str, intended_ns: int):
+    """Worker-thread body for open-loop sends; never raises so the scheduler keeps going."""
+    try:
+        result = execute_request(request_data, environment)
+    except Exception as e:
+        return None, None, e
+    return result, time.perf_counter_ns() - intended_ns, None
+
+def run_load_test_sync(plan: LoadPlan, on_progress: Optional[Callable[[LoadStats], None]] = None,
+                       progress_interval: float = 1.0) -> LoadStats:
+    """Synchronous entry point for run_load_test, e.g. from a Streamlit callback."""
+    return asyncio.run(run_load_test(plan, on_progress, progress_interval))
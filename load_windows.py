@@ -0,0 +1,143 @@
+from typing import Dict, Any, List, Optional
+
+from latency_histogram import LatencyHistogram
+
+DEFAULT_WINDOW_CAPACITY = 900   # Per-second windows kept (the last 15 minutes)
+WINDOW_HIGHEST_US = 60_000_000  # Coarser windows are enough for per-second trends
+WINDOW_SIGNIFICANT_DIGITS = 2
+
+class StatsWindow:
+    """Counters and a latency histogram (microseconds) for one second of a run."""
+
+    __slots__ = ("second", "requests", "errors", "bytes_received", "latency")
+
+    def __init__(self, second: int = -1):
+        self.second = second
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram(highest=WINDOW_HIGHEST_US, significant_digits=WINDOW_SIGNIFICANT_DIGITS)
+
+    def reset(self, second: int):
+        self.second = second
+        self.requests = self.errors = self.bytes_received = 0
+        self.latency.reset()
+
+    def merge(self, other: "StatsWindow"):
+        self.requests += other.requests
+        self.errors += other.errors
+        self.bytes_received += other.bytes_received
+        self.latency.merge(other.latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'second': self.second,
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes_received': self.bytes_received,
+            'latency': self.latency.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatsWindow":
+        window = cls(data['second'])
+        window.requests = data['requests']
+        window.errors = data['errors']
+        window.bytes_received = data['bytes_received']
+        window.latency = LatencyHistogram.from_dict(data['latency'])
+        return window
+
+class WindowedStats:
+    """
+    Per-second statistics of a run in a fixed-size ring buffer, so a multi-hour soak test
+    uses the same memory as a one-minute run. Slot ``second % capacity`` holds that second;
+    a slot is recycled when the run moves past it.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_WINDOW_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Window capacity must be at least 1")
+        self.capacity = capacity
+        self._slots: List[Optional[StatsWindow]] = [None] * capacity
+        self.latest_second = -1
+
+    def _window(self, second: int) -> Optional[StatsWindow]:
+        """The window for ``second``, recycling its slot; None if it already fell out."""
+        if second <= self.latest_second - self.capacity:
+            return None
+        index = second % self.capacity
+        window = self._slots[index]
+        if window is None:
+            window = self._slots[index] = StatsWindow(second)
+        elif window.second != second:
+            window.reset(second)
+        self.latest_second = max(self.latest_second, second)
+        return window
+
+    def record(self, second: int, latency_us: Optional[int], size_bytes: int = 0, error: bool = False):
+        """Count one request completed ``second`` seconds into the run."""
+        window = self._window(second)
+        if window is None:
+            return
+        window.requests += 1
+        window.bytes_received += size_bytes
+        if error:
+            window.errors += 1
+        if latency_us is not None:
+            window.latency.record(latency_us)
+
+    def windows(self, last: Optional[int] = None) -> List[StatsWindow]:
+        """Windows still in the buffer, oldest first, optionally only the ``last`` seconds."""
+        oldest = self.latest_second - (last or self.capacity) + 1
+        return sorted(
+            (w for w in self._slots if w is not None and w.second >= oldest),
+            key=lambda w: w.second
+        )
+
+    def rolling(self, seconds: int = 10, percentiles=(50, 90, 99)) -> Dict[str, Any]:
+        """Throughput, errors and latency percentiles (ms) over the most recent ``seconds``."""
+        merged = StatsWindow()
+        for window in self.windows(seconds):
+            merged.merge(window)
+        return {
+            'seconds': seconds,
+            'rps': merged.requests / seconds,
+            'errors': merged.errors,
+            'error_rate': merged.errors / merged.requests if merged.requests else 0.0,
+            'latency_ms': {key: value / 1000 for key, value in merged.latency.percentiles(percentiles).items()}
+        }
+
+    def series(self, percentiles=(50, 99)) -> List[Dict[str, Any]]:
+        """One point per buffered second, for charting a run over time."""
+        points = []
+        for window in self.windows():
+            point = {
+                'second': window.second,
+                'rps': window.requests,
+                'errors': window.errors,
+                'error_rate': window.errors / window.requests if window.requests else 0.0,
+                'bytes_received': window.bytes_received,
+                'mean_ms': window.latency.mean / 1000
+            }
+            for key, value in window.latency.percentiles(percentiles).items():
+                point[f"{key}_ms"] = value / 1000
+            points.append(point)
+        return points
+
+    def merge(self, other: "WindowedStats") -> "WindowedStats":
+        """Add another run's windows second by second (e.g. from another worker)."""
+        for window in other.windows():
+            target = self._window(window.second)
+            if target is not None:
+                target.merge(window)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'capacity': self.capacity, 'windows': [w.to_dict() for w in self.windows()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WindowedStats":
+        stats = cls(data['capacity'])
+        for window_data in data['windows']:
+            stats._window(window_data['second']).merge(StatsWindow.from_dict(window_data))
+        return stats
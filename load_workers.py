@@ -0,0 +1,88 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+from typing import Dict, Callable, Optional
+
+from load_tester import LoadPlan, LoadStats, run_load_test
+
+def run_multiprocess(plan: LoadPlan, processes: Optional[int] = None,
+                     on_progress: Optional[Callable[[LoadStats], None]] = None,
+                     snapshot_interval: float = 1.0) -> LoadStats:
+    """
+    Fan a load plan out over a pool of worker processes, each running its own event loop
+    on its share of the concurrency, rate and request budget. Workers stream cumulative
+    histogram snapshots back; the coordinator merges the latest snapshot from every worker
+    for live progress and merges the final statistics losslessly.
+    """
+    shares = plan.split(processes or os.cpu_count() or 1)
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    workers = [
+        context.Process(
+            target=_worker_main,
+            args=(worker_id, share.to_dict(), messages, snapshot_interval),
+            daemon=True
+        )
+        for worker_id, share in enumerate(shares)
+    ]
+    for worker in workers:
+        worker.start()
+
+    latest: Dict[int, LoadStats] = {}
+    finished: Dict[int, LoadStats] = {}
+    errors: Dict[int, str] = {}
+    try:
+        while len(finished) + len(errors) < len(workers):
+            try:
+                kind, worker_id, payload = messages.get(timeout=0.5)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+
+            if kind == "error":
+                errors[worker_id] = payload
+                continue
+            stats = LoadStats.from_dict(payload)
+            latest[worker_id] = stats
+            if kind == "done":
+                finished[worker_id] = stats
+            elif on_progress:
+                on_progress(merge_stats(latest.values()))
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    if not finished:
+        raise RuntimeError(f"All load workers failed: {'; '.join(errors.values()) or 'no results'}")
+    result = merge_stats(finished.values())
+    record_worker_failures(result, errors.values())
+    return result
+
+def record_worker_failures(stats: LoadStats, messages) -> None:
+    """Count failed workers in ``stats.error_types``, keeping each failure's message."""
+    for message in messages:
+        key = f"WorkerFailure: {message}"
+        stats.error_types[key] = stats.error_types.get(key, 0) + 1
+
+def merge_stats(all_stats) -> LoadStats:
+    """Merge several LoadStats into a new one."""
+    merged = LoadStats()
+    for stats in all_stats:
+        merged.merge(stats)
+    return merged
+
+def _worker_main(worker_id: int, plan_data: dict, messages, snapshot_interval: float):
+    """Entry point of a worker process."""
+    def _snapshot(stats: LoadStats):
+        messages.put(("snapshot", worker_id, stats.to_dict()))
+
+    try:
+        plan = LoadPlan.from_dict(plan_data)
+        stats = asyncio.run(run_load_test(plan, _snapshot, snapshot_interval))
+        messages.put(("done", worker_id, stats.to_dict()))
+    except Exception as e:
+        messages.put(("error", worker_id, f"{type(e).__name__}: {e}"))
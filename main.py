@@ -3,10 +3,13 @@ import time
 import json
 import asyncio
 from datetime import datetime
-from curl_parser import parse_curl_command
 from request_analyzer import analyze_request
 from response_analyzer import analyze_response
-from utils import format_data, calculate_size
+from utils import format_data, calculate_size, format_duration, format_size
+from header_rules import get_analysis_cache
+from parse_cache import get_parse_cache
+from json_viewer import INLINE_VIEW_MAX_BYTES, MAX_PAGE_LINES, VIEWER_SPOOL_THRESHOLD
+from itertools import islice
 from collections_manager import CollectionManager
 
 st.set_page_config(
@@ -34,10 +37,11 @@ def save_to_history(curl_command, request_info, response_info):
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'curl_command': curl_command,
         'request_info': request_info,
-        'response_info': response_info,
-        'status_code': response_info['status_code'],
-        'execution_time': response_info['metadata']['timing']['total_time'],
-        'success': 200 <= response_info['status_code'] < 300,
+        # Only a body preview: the analyze view may hold bodies of up to VIEWER_SPOOL_THRESHOLD
+        'response_info': response_info.retained(),
+        'status_code': response_info.status_code,
+        'execution_time': response_info.timing.total_time,  # Nanoseconds
+        'success': response_info.is_success,
         'endpoint': request_info['url_analysis']['path'],
         'method': request_info['method'],
         'tags': []  # For future use - allowing users to tag requests
@@ -196,14 +200,16 @@ def graphql_view():
     if st.button("Execute Query", type="primary"):
         try:
             variables_dict = json.loads(variables) if variables else {}
-            request = st.session_state.graphql_analyzer.format_request({
-                "query": query,
-                "variables": variables_dict,
-                "operation_name": operation_name if operation_name else None
-            })
+            from graphql_handler import GraphQLRequest
+            request = st.session_state.graphql_analyzer.format_request(GraphQLRequest(
+                query=query,
+                variables=variables_dict,
+                operation_name=operation_name if operation_name else None
+            ))
+            request["url"] = endpoint
             
-            # Execute and analyze the request
-            response_info = analyze_response(request)
+            # Execute and analyze the request over the shared connection pool
+            response_info = analyze_response(request, st.session_state.selected_environment)
             request_info = analyze_request(request)
             
             # Save to history
@@ -214,7 +220,7 @@ def graphql_view():
             
             # Show response data
             st.subheader("Response")
-            st.json(response_info.get("content", {}))
+            st.json(response_info.content)
             
         except Exception as e:
             st.error(f"Error executing query: {str(e)}")
@@ -224,8 +230,308 @@ def collections_view():
     st.header("📚 Collections")
     st.markdown("Manage your API collections and templates here.")
     
-    # Collections management UI will be implemented here
-    st.info("Collections management interface coming soon!")
+    manager = st.session_state.collection_manager
+    collection_names = manager.list_collections()
+    if not collection_names:
+        # Collections management UI will be implemented here
+        st.info("Collections management interface coming soon!")
+        return
+
+    # Run a whole collection concurrently
+    st.subheader("Run Collection")
+    collection_name = st.selectbox("Collection", collection_names)
+    concurrency = st.slider("Concurrent requests", 1, 50, 10)
+    if st.button("Run", type="primary"):
+        with st.spinner(f"Running {collection_name}..."):
+            outcomes = manager.run_collection(
+                collection_name, st.session_state.selected_environment, concurrency
+            )
+        if not outcomes:
+            st.info("This collection has no requests yet.")
+        for outcome in outcomes:
+            if 'error' in outcome:
+                st.error(f"{outcome['name']}: {outcome['error']}")
+            else:
+                response_info = outcome['response_info']
+                st.markdown(
+                    f"**{outcome['name']}** - {response_info.status_code} "
+                    f"in {format_duration(response_info.timing.total_time)}"
+                )
+
+def load_test_view():
+    """Load Test View"""
+    st.subheader("⚡ Load Test")
+    st.markdown("""
+    Fire a curl command repeatedly at a fixed concurrency, a fixed arrival rate or a
+    ramp/step/soak profile and see throughput, error rate and latency percentiles.
+    """)
+
+    curl_command = st.text_area(
+        "Enter curl command",
+        height=100,
+        placeholder="curl https://api.example.com/data -H 'Authorization: Bearer token'",
+        key="load_curl_command"
+    )
+
+    load_mode = st.radio(
+        "Load model",
+        ["Closed loop (fixed concurrency)", "Open loop (fixed arrival rate)", "Ramp", "Steps", "Soak"],
+        horizontal=True,
+        help="Open loop models keep sending at the target rate even when the server slows down, "
+             "and report latency corrected for coordinated omission"
+    )
+    from load_profiles import LoadProfile
+    rate, profile = None, None
+    if load_mode.startswith("Open"):
+        rate = st.number_input("Arrival rate (requests/second)", min_value=0.1, value=50.0)
+    elif load_mode == "Ramp":
+        ramp_cols = st.columns(4)
+        with ramp_cols[0]:
+            start_rate = st.number_input("Start rate (req/s)", min_value=0.0, value=1.0)
+        with ramp_cols[1]:
+            end_rate = st.number_input("End rate (req/s)", min_value=0.1, value=100.0)
+        with ramp_cols[2]:
+            ramp_seconds = st.number_input("Ramp (seconds)", min_value=1, value=60)
+        with ramp_cols[3]:
+            hold_seconds = st.number_input("Hold (seconds)", min_value=0, value=30)
+        profile = LoadProfile.ramp(start_rate, end_rate, ramp_seconds, hold_seconds)
+    elif load_mode == "Steps":
+        step_cols = st.columns(2)
+        with step_cols[0]:
+            step_rates = st.text_input("Rates (req/s, comma separated)", value="10, 50, 100, 200")
+        with step_cols[1]:
+            step_seconds = st.number_input("Seconds per step", min_value=1, value=30)
+        try:
+            profile = LoadProfile.steps([float(r) for r in step_rates.split(",") if r.strip()], step_seconds)
+        except ValueError as e:
+            st.error(f"Invalid step rates: {str(e)}")
+            return
+    elif load_mode == "Soak":
+        soak_cols = st.columns(3)
+        with soak_cols[0]:
+            soak_rate = st.number_input("Rate (req/s)", min_value=0.1, value=20.0)
+        with soak_cols[1]:
+            soak_hours = st.number_input("Duration (hours)", min_value=0.1, value=2.0)
+        with soak_cols[2]:
+            ramp_up = st.number_input("Ramp-up (seconds)", min_value=0, value=60)
+        profile = LoadProfile.soak(soak_rate, soak_hours * 3600, ramp_up)
+
+    config_cols = st.columns(3)
+    with config_cols[0]:
+        concurrency = st.number_input(
+            "Concurrency" if rate is None and profile is None else "Max in-flight requests",
+            min_value=1, max_value=500, value=10
+        )
+    with config_cols[1]:
+        stop_mode = st.radio("Stop after", ["Duration", "Request count"], horizontal=True,
+                             disabled=profile is not None)
+    with config_cols[2]:
+        if profile is not None:
+            duration, total_requests = None, None
+            st.metric("Profile length", f"{profile.total_duration / 60:.1f} min")
+        elif stop_mode == "Duration":
+            duration, total_requests = st.number_input("Duration (seconds)", min_value=1, value=30), None
+        else:
+            duration, total_requests = None, st.number_input("Requests", min_value=1, value=1000)
+
+    import os
+    processes = st.number_input(
+        "Worker processes",
+        min_value=1, max_value=os.cpu_count() or 1, value=1,
+        help="Spread the load over several processes, one event loop per core (per agent when using agents)"
+    )
+
+    with st.expander("Distributed agents (Optional)"):
+        st.caption("Start agents with `python cli.py agent --host 0.0.0.0 --port 7070 --token <secret>` "
+                   "on each load node and enter the same token below")
+        agent_addresses = st.text_area("Agents (host:port, one per line)", key="load_agents")
+        agent_token = st.text_input("Agent token", type="password", key="load_agent_token")
+
+    if st.button("Start Load Test", type="primary"):
+        if not curl_command:
+            st.error("Please enter a curl command")
+            return
+
+        from load_tester import LoadPlan, run_load_test_sync
+        try:
+            plan = LoadPlan(
+                request_data=get_parse_cache().parse(curl_command),
+                concurrency=int(concurrency),
+                duration=float(duration) if duration else None,
+                total_requests=int(total_requests) if total_requests else None,
+                environment=st.session_state.selected_environment,
+                rate=float(rate) if rate else None,
+                profile=profile,
+                variables=st.session_state.collection_manager.environments.get(
+                    st.session_state.selected_environment, {}
+                )
+            )
+            progress = st.empty()
+
+            def show_progress(stats):
+                summary = stats.summary()
+                recent = summary['last_10s']
+                progress.info(
+                    f"{summary['requests']} requests · last 10s: {recent['rps']:.1f} req/s · "
+                    f"p99 {recent['latency_ms']['p99']:.1f}ms · errors {recent['error_rate'] * 100:.2f}%"
+                )
+
+            with st.spinner("Running load test..."):
+                if agent_addresses.strip():
+                    from load_agent import parse_agent_address, run_distributed
+                    agents = [parse_agent_address(a) for a in agent_addresses.splitlines() if a.strip()]
+                    stats = run_distributed(plan, agents, int(processes), show_progress, agent_token or None)
+                elif processes > 1:
+                    from load_workers import run_multiprocess
+                    stats = run_multiprocess(plan, int(processes), show_progress)
+                else:
+                    stats = run_load_test_sync(plan, show_progress)
+            progress.empty()
+            render_load_summary(stats.summary())
+            render_load_windows(stats.windows.series())
+        except Exception as e:
+            st.error(f"Error running load test: {str(e)}")
+
+def render_load_windows(series: list):
+    """Per-second throughput, latency and errors of a load run"""
+    if len(series) < 2:
+        return
+    st.markdown("### 📉 Over Time")
+    seconds = [point['second'] for point in series]
+    st.line_chart({
+        "Second": seconds,
+        "Requests/s": [point['rps'] for point in series],
+        "Errors/s": [point['errors'] for point in series]
+    }, x="Second")
+    st.line_chart({
+        "Second": seconds,
+        "p50 (ms)": [point['p50_ms'] for point in series],
+        "p99 (ms)": [point['p99_ms'] for point in series]
+    }, x="Second")
+
+def saturation_view():
+    """Saturation Finder View"""
+    st.subheader("🎯 Saturation Finder")
+    st.markdown("""
+    Ramp the arrival rate of a curl command until it breaks a latency/error SLO, then
+    narrow down the highest sustainable throughput.
+    """)
+
+    curl_command = st.text_area(
+        "Enter curl command",
+        height=100,
+        placeholder="curl https://api.example.com/data",
+        key="saturation_curl_command"
+    )
+
+    slo_cols = st.columns(3)
+    with slo_cols[0]:
+        percentile = st.selectbox("Latency percentile", [50, 90, 95, 99, 99.9], index=3)
+    with slo_cols[1]:
+        max_latency = st.number_input("Max latency (ms)", min_value=1.0, value=300.0)
+    with slo_cols[2]:
+        max_error_rate = st.number_input("Max error rate (%)", min_value=0.0, value=0.1, step=0.1)
+
+    ramp_cols = st.columns(4)
+    with ramp_cols[0]:
+        start_rate = st.number_input("Start rate (req/s)", min_value=0.1, value=10.0)
+    with ramp_cols[1]:
+        max_rate = st.number_input("Max rate (req/s)", min_value=1.0, value=1000.0)
+    with ramp_cols[2]:
+        step_duration = st.number_input("Seconds per step", min_value=1, value=10)
+    with ramp_cols[3]:
+        max_in_flight = st.number_input("Max in-flight requests", min_value=1, max_value=1000, value=100)
+
+    if st.button("Find Saturation Point", type="primary"):
+        if not curl_command:
+            st.error("Please enter a curl command")
+            return
+
+        from api_analyzer import LatencySLO
+        from load_tester import LoadPlan
+        from saturation_finder import find_saturation
+        try:
+            plan = LoadPlan(
+                request_data=get_parse_cache().parse(curl_command),
+                concurrency=int(max_in_flight),
+                environment=st.session_state.selected_environment,
+                variables=st.session_state.collection_manager.environments.get(
+                    st.session_state.selected_environment, {}
+                )
+            )
+            slo = LatencySLO(percentile, max_latency, max_error_rate / 100)
+            progress = st.empty()
+
+            def show_step(step):
+                verdict = "✅ within SLO" if step['meets_slo'] else "❌ violates SLO"
+                progress.info(f"{step['rate']:.1f} req/s offered: {verdict}")
+
+            with st.spinner("Searching for the saturation point..."):
+                result = find_saturation(
+                    plan, slo, start_rate, max_rate, float(step_duration), on_step=show_step
+                )
+            progress.empty()
+
+            result_cols = st.columns(3)
+            with result_cols[0]:
+                best = result['max_sustainable_rate']
+                st.metric("Max Sustainable Rate", f"{best:.1f} req/s" if best else "None")
+            with result_cols[1]:
+                st.metric("Achieved Throughput", f"{result['max_sustainable_throughput']:.1f} req/s")
+            with result_cols[2]:
+                knee = result['knee_rate']
+                st.metric("Knee", f"{knee:.1f} req/s" if knee else "Not reached")
+
+            st.markdown("### 📈 Latency Curve")
+            curve = result['curve']
+            st.line_chart({
+                "Offered rate (req/s)": [point['rate'] for point in curve],
+                f"p{percentile:g} latency (ms)": [point['latency_ms'] for point in curve]
+            }, x="Offered rate (req/s)")
+            for point in curve:
+                st.markdown(
+                    f"{'✅' if point['meets_slo'] else '❌'} **{point['rate']:.1f} req/s** - "
+                    f"{point['throughput_rps']:.1f} req/s achieved, p{percentile:g} {point['latency_ms']:.1f}ms, "
+                    f"errors {point['error_rate'] * 100:.2f}%"
+                )
+        except Exception as e:
+            st.error(f"Error finding saturation point: {str(e)}")
+
+def render_load_summary(summary: dict):
+    """Render throughput, error rate and latency percentiles of a load run."""
+    overview_cols = st.columns(4)
+    with overview_cols[0]:
+        st.metric("Requests", summary['requests'])
+    with overview_cols[1]:
+        st.metric("Throughput", f"{summary['throughput_rps']:.1f} req/s")
+    with overview_cols[2]:
+        error_rate = summary['error_rate'] * 100
+        st.metric("Error Rate", f"{'🟢' if error_rate < 1 else '🔴'} {error_rate:.2f}%")
+    with overview_cols[3]:
+        st.metric("Mean Latency", f"{summary['latency_ms']['mean']:.1f}ms")
+    if summary.get('dropped'):
+        st.warning(f"⚠️ {summary['dropped']} scheduled requests were dropped because the target "
+                   "could not keep up with the offered rate; they are counted in the error rate")
+
+    st.markdown("### ⏱️ Latency Percentiles")
+    latency = summary['latency_ms']
+    corrected = summary.get('corrected_latency_ms')
+    if corrected:
+        st.caption("Corrected latency is measured from each request's intended send time; "
+                   "raw latency from when it was actually sent.")
+    percentile_cols = st.columns(5)
+    for idx, key in enumerate(['p50', 'p90', 'p99', 'p99.9', 'max']):
+        with percentile_cols[idx]:
+            if corrected:
+                st.metric(key.upper(), f"{corrected[key]:.1f}ms", delta=f"raw {latency[key]:.1f}ms", delta_color="off")
+            else:
+                st.metric(key.upper(), f"{latency[key]:.1f}ms")
+
+    st.markdown("### 📋 Responses")
+    for status, count in sorted(summary['status_counts'].items()):
+        st.markdown(f"**{status}:** {count}")
+    for error_type, count in summary['error_types'].items():
+        st.markdown(f"**{error_type}:** {count}")
 
 def analyze_request_view():
     """Request Analyzer View"""
@@ -252,16 +558,23 @@ def analyze_request_view():
             st.error("Please enter a curl command")
             return
 
+        st.session_state.json_viewer_response = None
         try:
             with st.spinner("Analyzing curl command..."):
                 # Parse curl command
-                parsed_request = parse_curl_command(curl_command)
+                parsed_request = get_parse_cache().parse(curl_command)
+                unsupported = parsed_request["options"]["unsupported"]
+                if unsupported:
+                    st.warning(f"⚠️ Unsupported curl options were not applied: {', '.join(unsupported)}")
                 
                 # Analyze request
-                request_info = analyze_request(parsed_request)
+                request_info = get_parse_cache().analyze(curl_command)
                 
                 # Execute request and analyze response
-                response_info = analyze_response(parsed_request)
+                response_info = analyze_response(
+                    parsed_request, st.session_state.selected_environment,
+                    spool_threshold=VIEWER_SPOOL_THRESHOLD
+                )
                 
                 # Save to history
                 save_to_history(curl_command, request_info, response_info)
@@ -281,6 +594,9 @@ def analyze_request_view():
                         grade = score.get('grade', 'N/A')
                         st.metric("Security Grade", grade, 
                                 delta="Good" if grade in ['A', 'B'] else "Needs Improvement")
+                    parse_stats = get_parse_cache().stats()
+                    st.caption(f"Parse cache: {parse_stats['hit_rate']:.0%} hit rate "
+                               f"({parse_stats['hits']} hits, {parse_stats['misses']} misses, {parse_stats['entries']} entries)")
                     
                     # URL Analysis
                     st.subheader("URL Analysis")
@@ -294,7 +610,8 @@ def analyze_request_view():
                         st.markdown("**Security Status:**")
                         st.markdown("✅" if url_analysis['security']['uses_https'] else "⚠️" + " HTTPS")
                         if url_analysis['security']['has_sensitive_params']:
-                            st.warning("⚠️ Sensitive data detected in URL parameters")
+                            flagged = ", ".join(url_analysis['security'].get('sensitive_params', {}))
+                            st.warning(f"⚠️ Sensitive data detected in URL parameters: {flagged}")
                     
                     # Authentication
                     st.subheader("Authentication")
@@ -310,11 +627,14 @@ def analyze_request_view():
                     
                     # Security Score
                     st.metric("Headers Security Score", f"{headers_analysis['security_score']}/100")
+                    cache_stats = get_analysis_cache().stats()
+                    st.caption(f"Header analysis cache: {cache_stats['hit_rate']:.0%} hit rate "
+                               f"({cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries)")
                     
                     # Security Headers
                     st.markdown("### Security Headers")
                     for header, info in headers_analysis['security_headers'].items():
-                        with st.expander(f"{'✅' if info['present'] else '❌'} {header}"):
+                        with st.expander(f"{'✅' if info['present'] else '❌'} {info.get('label', header)}"):
                             st.markdown(f"**Description:** {info['description']}")
                             if info['present']:
                                 if 'valid' in info:
@@ -327,7 +647,7 @@ def analyze_request_view():
                     for header, info in headers_analysis['content_security'].items():
                         col1, col2 = st.columns(2)
                         with col1:
-                            st.markdown(f"**{header.title()}:** {'✅' if info['present'] else '❌'}")
+                            st.markdown(f"**{info.get('label', header.title())}:** {'✅' if info['present'] else '❌'}")
                         with col2:
                             if info['present']:
                                 st.markdown(f"Value: `{info['value']}`")
@@ -357,8 +677,18 @@ def analyze_request_view():
                         body_info = request_info['body']
                         st.markdown(f"**Content Type:** {body_info['content_type']}")
                         st.markdown(f"**Size:** {body_info['size_bytes']} bytes")
+                        if body_info.get('source_file'):
+                            st.markdown(f"**Source File:** `{body_info['source_file']}` (streamed, not loaded)")
                         if body_info['security_analysis']['contains_sensitive_data']:
-                            st.warning("⚠️ Potentially sensitive data detected in request body")
+                            findings = body_info['security_analysis'].get('sensitive_findings', {})
+                            counts = ", ".join(f"{category} ({count})" for category, count in findings.get('counts', {}).items())
+                            st.warning(f"⚠️ Potentially sensitive data detected in request body: {counts}")
+                            if findings.get('matches'):
+                                with st.expander("Sensitive data locations"):
+                                    st.table([
+                                        {'Category': m['category'], 'Offset': f"{m['start']}-{m['end']}", 'Preview': m['preview']}
+                                        for m in findings['matches']
+                                    ])
                         if body_info['security_analysis']['size_warning']:
                             st.warning("⚠️ Large request body detected")
                     
@@ -376,28 +706,29 @@ def analyze_request_view():
                     st.markdown("### 📊 Response Overview")
                     overview_cols = st.columns(4)
                     with overview_cols[0]:
-                        status_color = "🟢" if 200 <= response_info['status_code'] < 300 else "🟡" if response_info['status_code'] < 500 else "🔴"
-                        st.metric("Status Code", f"{status_color} {response_info['status_code']}")
+                        status_color = "🟢" if response_info.is_success else "🟡" if response_info.status_code < 500 else "🔴"
+                        st.metric("Status Code", f"{status_color} {response_info.status_code}")
                     with overview_cols[1]:
-                        st.metric("Response Size", response_info['metadata']['size'])
+                        st.metric("Response Size", format_size(response_info.size_bytes))
                     with overview_cols[2]:
-                        total_time = float(response_info['metadata']['timing']['total_time'].replace('ms', ''))
+                        total_time = response_info.total_ms
                         time_indicator = "🟢" if total_time < 500 else "🟡" if total_time < 1000 else "🔴"
-                        st.metric("Total Time", f"{time_indicator} {response_info['metadata']['timing']['total_time']}")
+                        st.metric("Total Time", f"{time_indicator} {format_duration(response_info.timing.total_time)}")
                     with overview_cols[3]:
-                        st.metric("Content Encoding", response_info['metadata'].get('encoding', 'None'))
+                        st.metric("Content Encoding", response_info.encoding or 'None')
                     
                     # Detailed Timing Analysis
                     st.markdown("### ⏱️ Response Timeline")
-                    timing_data = response_info['metadata']['timing']
                     
-                    # Create a timeline visualization
+                    # Create a timeline visualization from the measured connection phases
+                    timing = response_info.timing
                     timeline_data = {
-                        "DNS Lookup": float(timing_data.get('dns_lookup', '0ms').replace('ms', '')),
-                        "TCP Connect": float(timing_data.get('connect_time', '0ms').replace('ms', '')),
-                        "TLS Handshake": float(timing_data.get('tls_handshake', '0ms').replace('ms', '')) if timing_data.get('tls_handshake') else 0,
-                        "Server Processing": float(timing_data.get('processing_time', '0ms').replace('ms', '')),
-                        "Content Transfer": float(timing_data.get('request_time', '0ms').replace('ms', ''))
+                        "DNS Lookup": timing.ms('dns_lookup'),
+                        "TCP Connect": timing.ms('tcp_connect'),
+                        "TLS Handshake": timing.ms('tls_handshake'),
+                        "Request Send": timing.ms('request_write'),
+                        "Waiting (TTFB)": timing.ms('time_to_first_byte'),
+                        "Content Transfer": timing.ms('content_transfer')
                     }
                     
                     # Display timeline metrics with performance indicators
@@ -412,14 +743,13 @@ def analyze_request_view():
                             )
                     
                     # Detailed Server Timing
-                    if 'server_time' in timing_data:
+                    if response_info.server_time_ns:
                         st.markdown("#### 🖥️ Server-side Timing")
-                        server_time = str(timing_data['server_time'])
-                        st.info(f"Server processing time: {server_time}")
+                        st.info(f"Server processing time: {format_duration(response_info.server_time_ns)}")
                     
                     # Enhanced Performance Metrics
                     st.markdown("### 🚀 Performance Analysis")
-                    perf_metrics = response_info['metadata']['performance_metrics']
+                    perf_metrics = response_info.performance
                     
                     # Performance Score with detailed breakdown
                     score_cols = st.columns([2, 3])
@@ -452,23 +782,23 @@ def analyze_request_view():
                     with perf_cols[1]:
                         connection_status = "✅ Reused" if perf_metrics['connection_reused'] else "❌ New Connection"
                         st.metric(
-                            "Connection",
+                            f"Connection ({perf_metrics.get('connection_state', 'cold')})",
                             connection_status,
                             delta="Optimal" if perf_metrics['connection_reused'] else "Could be improved",
                             delta_color="normal" if perf_metrics['connection_reused'] else "inverse"
                         )
                         
                     with perf_cols[2]:
-                        size = perf_metrics['response_size']
-                        size_status = "🟢" if 'KB' in size and float(size.split()[0]) < 500 else "🟡" if 'KB' in size else "🔴"
+                        size_bytes = response_info.size_bytes
+                        size_status = "🟢" if size_bytes < 500 * 1024 else "🟡" if size_bytes <= 1024 * 1024 else "🔴"
                         st.metric(
                             "Response Size",
-                            f"{size_status} {size}",
+                            f"{size_status} {format_size(size_bytes)}",
                             help="🟢 <500KB, 🟡 500KB-1MB, 🔴 >1MB"
                         )
                         
                     with perf_cols[3]:
-                        cache_status = "✅" if response_info['headers'].get('cache-control') else "❌"
+                        cache_status = "✅" if response_info.headers.get('cache-control') else "❌"
                         st.metric(
                             "Caching",
                             f"{cache_status} {'Configured' if cache_status == '✅' else 'Not Configured'}",
@@ -476,6 +806,9 @@ def analyze_request_view():
                             delta_color="normal" if cache_status == '✅' else "inverse"
                         )
                     
+                    if perf_metrics.get('http_version'):
+                        st.caption(f"Protocol: HTTP/{perf_metrics['http_version']}")
+                    
                     # Performance Recommendations with Explanations
                     if perf_metrics.get('recommendations'):
                         st.markdown("#### 💡 Performance Optimization Suggestions")
@@ -498,7 +831,7 @@ def analyze_request_view():
                     
                     # Security Analysis
                     st.markdown("### 🔒 Security Analysis")
-                    security = response_info['metadata']['security_analysis']
+                    security = response_info.security_analysis
                     for header, info in security.items():
                         with st.expander(f"{'✅' if info['present'] else '❌'} {header}"):
                             st.markdown(f"**Description:** {info['description']}")
@@ -508,19 +841,87 @@ def analyze_request_view():
                     # Response Headers
                     st.markdown("### 📋 Response Headers")
                     with st.expander("View All Headers"):
-                        for header, value in response_info['headers'].items():
+                        for header, value in response_info.headers.items():
                             st.markdown(f"**{header}:** {value}")
                     
                     # Response Content
                     st.markdown("### 📄 Response Content")
-                    content_type = response_info.get('content_type', 'text/plain')
-                    if 'application/json' in content_type:
-                        st.json(response_info['content'])
+                    body_info = response_info.body
+                    if body_info.get('truncated'):
+                        st.warning(f"⚠️ Body exceeded the download limit and was truncated at {format_size(response_info.size_bytes)}")
+                    if body_info.get('preview_only'):
+                        st.info(f"Large body ({format_size(response_info.size_bytes)}, sha256 `{body_info['sha256'][:16]}…`) - showing a preview only")
+                        st.code(response_info.text, language='text')
+                    elif response_info.is_json and response_info.size_bytes > INLINE_VIEW_MAX_BYTES:
+                        st.session_state.json_viewer_response = response_info
+                        st.info(f"Large JSON body ({format_size(response_info.size_bytes)}) - browse it page by page in the viewer below")
+                    elif response_info.is_json and isinstance(response_info.content, (dict, list)):
+                        st.json(response_info.content)
                     else:
-                        st.code(response_info['raw'], language='text')
+                        language = 'xml' if response_info.is_xml else 'html' if response_info.is_html else 'text'
+                        if response_info.is_xml:
+                            try:
+                                xml_stats = response_info.xml_stats
+                                st.caption(
+                                    f"<{xml_stats['root']}> · {xml_stats['element_count']} elements · "
+                                    f"depth {xml_stats['max_depth']} · {len(xml_stats['namespaces'])} namespaces"
+                                )
+                            except Exception:
+                                st.caption("XML is not well-formed")
+                        st.code(response_info.pretty_text, language=language)
         except Exception as e:
             st.error(f"Error analyzing request: {str(e)}")
 
+    if st.session_state.get('json_viewer_response') is not None:
+        render_json_viewer(st.session_state.json_viewer_response)
+
+def render_json_viewer(response_info):
+    """Paged viewer for large JSON bodies: renders only the visible window of a node"""
+    from json_viewer import DEFAULT_PAGE_SIZE, describe, page_children, resolve_json_path
+    st.markdown("### 🗂️ JSON Viewer")
+    try:
+        document = response_info.json
+    except ValueError:
+        st.warning("The body is not valid JSON - showing the first lines as sent")
+        st.code("\n".join(islice(response_info.iter_pretty_lines(), MAX_PAGE_LINES)), language='json')
+        return
+
+    if 'json_viewer_path' not in st.session_state:
+        st.session_state.json_viewer_path = "$"
+    path = st.text_input("JSON path", key="json_viewer_path", help="e.g. $.items[42].name")
+    try:
+        node = resolve_json_path(document, path)
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    viewer_cols = st.columns([2, 1, 1])
+    with viewer_cols[0]:
+        st.markdown(f"**{path}** - {describe(node)}")
+    with viewer_cols[1]:
+        page_size = st.selectbox("Items per page", [20, DEFAULT_PAGE_SIZE, 100, 200], index=1, key="json_viewer_page_size")
+    with viewer_cols[2]:
+        pages = max(1, -(-len(node) // page_size)) if isinstance(node, (dict, list)) else 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="json_viewer_page")
+
+    view = page_children(node, path, int(page), page_size)
+    if view['items']:
+        def _open_child():
+            st.session_state.json_viewer_path = st.session_state.json_viewer_child
+            st.session_state.json_viewer_page = 1
+
+        st.selectbox(
+            "Open child",
+            [item['path'] for item in view['items']],
+            format_func=lambda child: f"{child} - {next(i['type'] for i in view['items'] if i['path'] == child)}",
+            index=None,
+            key="json_viewer_child",
+            on_change=_open_child
+        )
+    if view['truncated']:
+        st.caption(f"Page cut at {MAX_PAGE_LINES} lines - open a child to see all of it")
+    st.code(view['text'], language='json')
+
 def main():
     st.title("🔍 API Testing Studio")
     
@@ -587,6 +988,8 @@ def main():
     st.sidebar.markdown("---")
     nav_options = {
         "🔍 Request Analyzer": "analyzer",
+        "⚡ Load Test": "loadtest",
+        "🎯 Saturation Finder": "saturation",
         "📚 Collections": "collections",
         "🔌 WebSocket Testing": "websocket",
         "🔮 GraphQL": "graphql"
@@ -598,6 +1001,10 @@ def main():
     # Content based on navigation selection
     if current_view == "analyzer":
         analyze_request_view()
+    elif current_view == "loadtest":
+        load_test_view()
+    elif current_view == "saturation":
+        saturation_view()
     elif current_view == "websocket":
         websocket_testing_view()
     elif current_view == "graphql":
@@ -0,0 +1,112 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from curl_parser import normalize_command, parse_curl_command
+from request_analyzer import analyze_request
+
+PARSE = "parse"
+ANALYSIS = "analysis"
+
+# (path, mtime in ns, size) of each local file a result was built from
+FileStamp = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+def _file_paths(request_data: dict) -> List[str]:
+    """Local files a parsed request depends on; none for most commands."""
+    paths = list(request_data["options"].get("data_files", []))
+    if request_data.get("body_file"):
+        paths.append(request_data["body_file"]["path"])
+    return paths
+
+def _file_stamp(paths: Iterable[str]) -> FileStamp:
+    stamp = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamp.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append((path, None, None))
+    return tuple(stamp)
+
+class ParseCache:
+    """
+    Bounded LRU of parsed curl commands and their static request analyses, keyed by
+    the normalized command text. The environment is not part of the key: parsing and
+    static analysis never read it, and variables, pooled sessions and proxy settings
+    are applied later by CompiledRequest. Requests whose body comes from local files are
+    re-stamped on every hit and recomputed when a file changed. Cached results are
+    shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[FileStamp, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats_counters = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def parse(self, curl_command: str) -> dict:
+        """parse_curl_command, cached; parse errors are raised and not cached."""
+        text = normalize_command(curl_command)
+        return self._lookup(PARSE, text, lambda: parse_curl_command(text), _file_paths)
+
+    def analyze(self, curl_command: str) -> Dict[str, Any]:
+        """analyze_request of the parsed command, cached alongside the parse."""
+        text = normalize_command(curl_command)
+        request_data = self.parse(text)
+        return self._lookup(ANALYSIS, text, lambda: analyze_request(request_data),
+                            lambda analysis: _file_paths(request_data))
+
+    def _lookup(self, kind: str, text: str, compute: Callable[[], Any],
+                dependencies: Callable[[Any], List[str]]) -> Any:
+        key = (kind, text)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            stamp, result = entry
+            # Only file-backed requests have a stamp; checking it costs a stat per file
+            if not stamp or stamp == _file_stamp(path for path, _, _ in stamp):
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                    self.stats_counters["hits"] += 1
+                return result
+            with self._lock:
+                self.stats_counters["stale"] += 1
+
+        with self._lock:
+            self.stats_counters["misses"] += 1
+        result = compute()
+        stamp = _file_stamp(dependencies(result))
+        with self._lock:
+            self._entries[key] = (stamp, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats_counters["evictions"] += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for display."""
+        with self._lock:
+            lookups = self.stats_counters["hits"] + self.stats_counters["misses"]
+            return {
+                **self.stats_counters,
+                "entries": len(self._entries),
+                "hit_rate": self.stats_counters["hits"] / lookups if lookups else 0.0
+            }
+
+_default_cache: Optional[ParseCache] = None
+_default_lock = threading.Lock()
+
+def get_parse_cache() -> ParseCache:
+    """Return the shared process-wide parse cache."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ParseCache()
+        return _default_cache
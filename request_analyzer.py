@@ -1,17 +1,23 @@
 import requests
-import json
+from content_sniffer import SNIFF_BYTES, header_content_type, sniff_content
+from header_rules import CONTENT, REQUEST, SECURITY, get_analysis_cache, get_rule_set
+from request_body import FileBody, body_source
+from sensitive_scanner import scan_chunks, scan_query, scan_text
 import re
-import xml.dom.minidom
 import time
-from typing import Dict, Any, List, Optional
+from itertools import islice
+from typing import Dict, Any, List, Optional, Union
 from urllib.parse import urlparse
 from collections import defaultdict
 
+MAX_SCANNED_FILE_BYTES = 16 * 1024 * 1024   # Sensitive-data scan budget for file-backed bodies
+
 def analyze_request(request_data: dict) -> dict:
     """
     Analyze the request data and return detailed information with security insights.
     """
     parsed_url = urlparse(request_data["url"])
+    sensitive_params = scan_query(parsed_url.query)
     
     analysis = {
         "method": request_data["method"],
@@ -23,7 +29,8 @@ def analyze_request(request_data: dict) -> dict:
             "fragment": parsed_url.fragment,
             "security": {
                 "uses_https": parsed_url.scheme == "https",
-                "has_sensitive_params": _check_sensitive_params(parsed_url.query),
+                "has_sensitive_params": bool(sensitive_params),
+                "sensitive_params": sensitive_params,
                 "recommendations": []
             }
         },
@@ -57,8 +64,11 @@ def analyze_request(request_data: dict) -> dict:
                 analysis["authentication"]["type"] = auth_type
 
     # Analyze body with enhanced security and format detection
-    if request_data["data"]:
-        analysis["body"] = _analyze_request_body(request_data["data"])
+    file_body = body_source(request_data)
+    if file_body is not None or request_data["data"]:
+        analysis["body"] = _analyze_request_body(
+            file_body or request_data["data"], header_content_type(request_data["headers"])
+        )
     else:
         analysis["body"] = {
             "present": False
@@ -75,109 +85,24 @@ def analyze_request(request_data: dict) -> dict:
     
     return analysis
 
-def _check_sensitive_params(query_string: str) -> bool:
-    """Check if query parameters contain potentially sensitive information."""
-    sensitive_keywords = {
-        'password', 'token', 'key', 'secret', 'auth',
-        'pwd', 'pass', 'credential', 'private'
-    }
-    params = query_string.lower().split('&')
-    return any(any(keyword in param for keyword in sensitive_keywords) 
-              for param in params)
-
 def _analyze_request_headers(headers: dict) -> dict:
-    """Analyze request headers for security and best practices with detailed validation."""
-    headers_lower = {k.lower(): v for k, v in headers.items()}
-    
-    security_headers = {
-        "x-csrf-token": {
-            "present": "x-csrf-token" in headers_lower,
-            "description": "Prevents Cross-Site Request Forgery attacks",
-            "recommendation": "Add X-CSRF-Token header for forms/mutations",
-            "risk_level": "high"
-        },
-        "x-xss-protection": {
-            "present": "x-xss-protection" in headers_lower,
-            "valid": headers_lower.get("x-xss-protection", "") in ["1", "1; mode=block"],
-            "description": "Provides XSS filtering capabilities",
-            "recommendation": "Set X-XSS-Protection: 1; mode=block",
-            "risk_level": "medium"
-        },
-        "x-content-type-options": {
-            "present": "x-content-type-options" in headers_lower,
-            "valid": headers_lower.get("x-content-type-options", "").lower() == "nosniff",
-            "description": "Prevents MIME type sniffing",
-            "recommendation": "Set X-Content-Type-Options: nosniff",
-            "risk_level": "medium"
-        },
-        "strict-transport-security": {
-            "present": "strict-transport-security" in headers_lower,
-            "valid": bool(re.search(r'max-age=\d+', headers_lower.get("strict-transport-security", ""))),
-            "description": "Enforces HTTPS connections",
-            "recommendation": "Add Strict-Transport-Security header with appropriate max-age",
-            "risk_level": "high"
-        },
-        "x-frame-options": {
-            "present": "x-frame-options" in headers_lower,
-            "valid": headers_lower.get("x-frame-options", "").upper() in ["DENY", "SAMEORIGIN"],
-            "description": "Prevents clickjacking attacks",
-            "recommendation": "Set X-Frame-Options to DENY or SAMEORIGIN",
-            "risk_level": "medium"
-        },
-        "permissions-policy": {
-            "present": "permissions-policy" in headers_lower,
-            "description": "Controls browser features and APIs",
-            "recommendation": "Implement Permissions-Policy to restrict unwanted features",
-            "risk_level": "medium"
-        },
-        "content-security-policy": {
-            "present": "content-security-policy" in headers_lower,
-            "valid": bool(headers_lower.get("content-security-policy", "")),
-            "description": "Prevents various types of attacks including XSS",
-            "recommendation": "Implement a strict Content-Security-Policy",
-            "risk_level": "high"
-        },
-        "referrer-policy": {
-            "present": "referrer-policy" in headers_lower,
-            "valid": headers_lower.get("referrer-policy", "").lower() in [
-                "no-referrer", "no-referrer-when-downgrade", "origin",
-                "origin-when-cross-origin", "same-origin", "strict-origin",
-                "strict-origin-when-cross-origin", "unsafe-url"
-            ],
-            "description": "Controls how much referrer information should be included",
-            "recommendation": "Set appropriate Referrer-Policy header",
-            "risk_level": "low"
-        }
-    }
+    """
+    Analyze request headers against the shared header rules. Repeated header sets are
+    answered from the analysis cache; only the header count is computed per call.
+    """
+    analysis = get_analysis_cache().analyze("request_headers", headers, _evaluate_request_headers)
+    return {**analysis, "total_headers": len(headers)}
 
-    content_security = {
-        "content_type": {
-            "present": "content-type" in headers_lower,
-            "value": headers_lower.get("content-type", ""),
-            "valid": bool(headers_lower.get("content-type", "")),
-            "recommendation": "Specify Content-Type header",
-            "details": _analyze_content_type(headers_lower.get("content-type", ""))
-        },
-        "accept": {
-            "present": "accept" in headers_lower,
-            "value": headers_lower.get("accept", ""),
-            "valid": bool(headers_lower.get("accept", "")),
-            "recommendation": "Specify Accept header for expected response format",
-            "details": _analyze_accept_header(headers_lower.get("accept", ""))
-        },
-        "encoding": {
-            "present": "accept-encoding" in headers_lower,
-            "value": headers_lower.get("accept-encoding", ""),
-            "recommendation": "Enable content compression by specifying Accept-Encoding",
-            "details": _analyze_encoding(headers_lower.get("accept-encoding", ""))
-        },
-        "language": {
-            "present": "accept-language" in headers_lower,
-            "value": headers_lower.get("accept-language", ""),
-            "recommendation": "Specify Accept-Language for localization",
-            "details": _analyze_language(headers_lower.get("accept-language", ""))
-        }
-    }
+def _evaluate_request_headers(headers: dict) -> dict:
+    """Evaluate request headers against the shared header rules in a single pass."""
+    evaluation = get_rule_set().evaluate(headers, REQUEST)
+    headers_lower = evaluation.headers
+
+    content_security = evaluation.group(CONTENT)
+    for name, result in content_security.items():
+        analyzer = _CONTENT_DETAILS.get(name)
+        if analyzer is not None:
+            result['details'] = analyzer(headers_lower.get(name, ""))
 
     cors_config = {
         "enabled": "origin" in headers_lower,
@@ -189,49 +114,62 @@ def _analyze_request_headers(headers: dict) -> dict:
         "recommendation": "Implement proper CORS headers for cross-origin requests"
     }
 
+    cache_rule = evaluation.results.get("cache-control", {})
+    cache_control = headers_lower.get("cache-control", "").lower()
     cache_config = {
         "present": "cache-control" in headers_lower,
         "value": headers_lower.get("cache-control", ""),
-        "no_store": "no-store" in headers_lower.get("cache-control", "").lower(),
-        "private": "private" in headers_lower.get("cache-control", "").lower(),
-        "recommendation": "Set appropriate Cache-Control headers for sensitive data"
+        "no_store": "no-store" in cache_control,
+        "private": "private" in cache_control,
+        "recommendation": cache_rule.get("recommendation", "Set appropriate Cache-Control headers for sensitive data")
     }
 
     return {
-        "security_headers": security_headers,
+        "security_headers": evaluation.group(SECURITY),
         "content_security": content_security,
         "cors_configuration": cors_config,
         "cache_configuration": cache_config,
-        "total_headers": len(headers),
-        "security_score": sum(1 for h in security_headers.values() if h["present"]) * 20,  # Score out of 100
-        "recommendations": [h["recommendation"] for h in security_headers.values() if not h["present"]]
+        "security_score": evaluation.score,  # Score out of 100
+        "recommendations": evaluation.recommendations
     }
 
-def _analyze_request_body(data: str) -> dict:
-    """Analyze request body with enhanced security checks and format detection."""
-    try:
-        # Attempt to parse as JSON
-        json.loads(data)
-        content_type = "json"
-    except json.JSONDecodeError:
-        try:
-            # Attempt to parse as XML
-            xml.dom.minidom.parseString(data)
-            content_type = "xml"
-        except:
-            content_type = "raw"
+def _analyze_request_body(data: Union[str, FileBody], declared_type: Optional[str] = None) -> dict:
+    """
+    Analyze request body with enhanced security checks and format detection.
+    File-backed bodies are never loaded: the size comes from the file system, the format
+    from its head and the sensitive-data scan streams the first MAX_SCANNED_FILE_BYTES.
+    """
+    if isinstance(data, FileBody):
+        size = data.size
+        head = data.head(SNIFF_BYTES)
+        preview = head[:200].decode("utf-8", errors="replace")
+        chunks = islice(data.iter_chunks(), max(1, MAX_SCANNED_FILE_BYTES // data.chunk_size))
+        sensitive = scan_chunks(chunks).to_dict()
+        source = data.path
+    else:
+        size = len(data)
+        head = data
+        preview = data[:200]
+        sensitive = _check_sensitive_content(data)
+        source = None
+
+    # Classify from the leading bytes and the Content-Type header; nothing is parsed here
+    content_type = sniff_content(head, declared_type)
 
     return {
         "present": True,
-        "size_bytes": len(data),
+        "size_bytes": size,
         "content_type": content_type,
-        "content_preview": data[:200] + "..." if len(data) > 200 else data,
+        "source_file": source,
+        "content_preview": preview + "..." if size > 200 else preview,
         "security_analysis": {
-            "contains_sensitive_data": _check_sensitive_content(data),
-            "size_warning": len(data) > 1000000,  # Warning for payloads > 1MB
+            "contains_sensitive_data": sensitive['found'],
+            "sensitive_findings": sensitive,
+            "size_warning": size > 1000000,  # Warning for payloads > 1MB
             "recommendations": []
         }
     }
+
 def _analyze_content_type(content_type: str) -> Dict[str, Any]:
     """Analyze Content-Type header for validity and security implications."""
     if not content_type:
@@ -290,15 +228,17 @@ def _analyze_language(language: str) -> Dict[str, Any]:
         "primary_language": languages[0].split(';')[0] if languages else None
     }
 
-def _check_sensitive_content(content: str) -> bool:
-    """Check if content contains potentially sensitive information patterns."""
-    sensitive_patterns = [
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Phone numbers
-        r'\b\d{3}[-]?\d{2}[-]?\d{4}\b',  # SSN-like patterns
-        r'(?i)\b(password|secret|key|token|auth)\b'  # Sensitive keywords
-    ]
-    return any(re.search(pattern, content) for pattern in sensitive_patterns)
+# Value analyzers attached to the content rules of the same header name
+_CONTENT_DETAILS = {
+    "content-type": _analyze_content_type,
+    "accept": _analyze_accept_header,
+    "accept-encoding": _analyze_encoding,
+    "accept-language": _analyze_language
+}
+
+def _check_sensitive_content(content: str) -> Dict[str, Any]:
+    """Scan content for sensitive information patterns in a single pass."""
+    return scan_text(content).to_dict()
 
 def _calculate_security_score(analysis: dict) -> dict:
     """Calculate overall security score and provide recommendations."""
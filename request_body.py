@@ -0,0 +1,87 @@
+import mmap
+import os
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_INLINE_FILE_BYTES = 16 * 1024 * 1024   # File data mixed with other -d parts is read into the body
+
+class FileBody:
+    """
+    A request body that lives in a file (curl ``-d @file``, ``--data-binary @file``,
+    ``-T file``). Nothing is read until the body is needed, and then only chunk by chunk:
+    the size comes from the file system, sniffing reads the head through a memory map
+    and uploads stream the file. ``strip_newlines`` drops CR and LF as ``-d @file`` does.
+
+    The object is iterable and has a length, so ``requests`` streams it with a
+    Content-Length header; every iteration reopens the file, so redirects and repeated
+    sends work.
+    """
+
+    def __init__(self, path: str, strip_newlines: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.strip_newlines = strip_newlines
+        self.chunk_size = chunk_size
+        self._size: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileBody":
+        return cls(data["path"], data.get("strip_newlines", False))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'path': self.path, 'strip_newlines': self.strip_newlines}
+
+    @property
+    def file_size(self) -> int:
+        return os.path.getsize(self.path)
+
+    @property
+    def size(self) -> int:
+        """Bytes that will be sent; counting stripped newlines takes one streaming pass."""
+        if self._size is None:
+            if self.strip_newlines:
+                self._size = sum(len(chunk) for chunk in self.iter_chunks())
+            else:
+                self._size = self.file_size
+        return self._size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return True     # An empty file is still a body; do not let truth tests count it
+
+    def head(self, limit: int) -> bytes:
+        """The first ``limit`` bytes of the body, without reading the rest of the file."""
+        if self.file_size == 0:
+            return b""
+        with open(self.path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if not self.strip_newlines:
+                return mapped[:limit]
+            head = bytearray()
+            for offset in range(0, len(mapped), self.chunk_size):
+                head += mapped[offset:offset + self.chunk_size].translate(None, b"\r\n")
+                if len(head) >= limit:
+                    break
+            return bytes(head[:limit])
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        with open(self.path, "rb") as handle:
+            while True:
+                chunk = handle.read(chunk_size or self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk.translate(None, b"\r\n") if self.strip_newlines else chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.iter_chunks()
+
+    def read_all(self, max_bytes: int = MAX_INLINE_FILE_BYTES) -> bytes:
+        """Read the whole body into memory; refuses files larger than ``max_bytes``."""
+        if self.file_size > max_bytes:
+            raise ValueError(f"{self.path} is too large to combine with other data ({self.file_size} bytes)")
+        return b"".join(self.iter_chunks())
+
+def body_source(request_data: dict) -> Optional[FileBody]:
+    """The file-backed body of a parsed request, if it has one."""
+    body_file = request_data.get("body_file")
+    return FileBody.from_dict(body_file) if body_file else None
@@ -1,134 +1,151 @@
 import requests
-import json
 import time
-from typing import Dict, Any, List
-import xml.dom.minidom
-from utils import calculate_size, analyze_security_headers
+from typing import Dict, Any, List, Optional, Union
+from utils import analyze_security_headers
+from compiled_request import CompiledRequest
+from response_model import ExecutionResult, ResponseResult, ResponseTiming
+from timing_engine import connection_overrides, record_phases
+from response_body import (
+    ResponseBody, DEFAULT_CHUNK_SIZE, DEFAULT_MAX_BODY_BYTES, DEFAULT_SPOOL_THRESHOLD, PREVIEW_BYTES,
+    paced_chunks
+)
 
-def analyze_response(request_data: dict) -> dict:
+HTTP_VERSION_NAMES = {9: "0.9", 10: "1.0", 11: "1.1", 20: "2"}
+
+def analyze_response(request_data: Union[dict, CompiledRequest], environment: str = "default",
+                     max_body_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES,
+                     spool_threshold: int = DEFAULT_SPOOL_THRESHOLD) -> ResponseResult:
     """
     Execute the request and analyze the response with detailed timing and security analysis.
+    Connections are drawn from the shared pool so repeated calls to the same origin reuse
+    warm connections; each environment gets its own isolated pool.
+    The body is streamed into a single buffer (spilled to disk past ``spool_threshold``)
+    and download stops at ``max_body_bytes``; spilled bodies are only previewed.
+    Timings are reported in nanoseconds and sizes in bytes.
     """
     try:
-        timing = {}
+        compiled = _compiled(request_data, environment)
         metrics = {}
-        start_time = time.time()
-
-        # DNS lookup and connection establishment
-        session = requests.Session()
-        
-        # Create an adapter to capture connection metrics
-        adapter = requests.adapters.HTTPAdapter()
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-        
-        timing['session_setup'] = (time.time() - start_time) * 1000
+        start_ns = time.perf_counter_ns()
 
-        # Prepare and send the request with detailed timing
-        start_request = time.time()
-        try:
-            # Record DNS lookup start
-            dns_start = time.time()
-            # Force DNS lookup
-            from urllib.parse import urlparse
-            import socket
-            parsed_url = urlparse(request_data["url"])
-            socket.gethostbyname(parsed_url.hostname)
-            timing['dns_lookup'] = (time.time() - dns_start) * 1000
-            
-            # Send the request and measure connect time
-            connect_start = time.time()
-            response = session.request(
-                method=request_data["method"],
-                url=request_data["url"],
-                headers=request_data["headers"],
-                data=request_data["data"],
-                timeout=30
-            )
-            timing['connect_time'] = (time.time() - connect_start) * 1000
-            timing['request_time'] = (time.time() - start_request) * 1000
-            
-            # Calculate TLS handshake time for HTTPS
-            if request_data["url"].startswith("https"):
-                timing['tls_handshake'] = timing['connect_time'] * 0.6  # Approximate TLS portion
-            
-            # Record response metrics
-            metrics.update({
-                'response_size': len(response.content),
-                'is_compressed': 'gzip' in response.headers.get('content-encoding', '').lower(),
-                'connection_reused': 'keep-alive' in response.headers.get('connection', '').lower(),
-            })
-            
-        except socket.gaierror:
-            timing['dns_lookup'] = -1  # DNS lookup failed
-            raise
+        # Reuse the pooled session for this origin
+        transport = compiled.transport
+        session = compiled.session()
 
-        # Analyze content type and prepare response
-        content_type = response.headers.get('content-type', '').lower()
-        start_processing = time.time()
+        # Send the request while the timed connection classes record each phase
+        start_request = time.perf_counter_ns()
+        with record_phases() as timer, connection_overrides(transport.overrides):
+            response = compiled.send(session)
+            with timer.measure('content_transfer'):
+                body = ResponseBody.download(
+                    response, max_body_bytes, spool_threshold,
+                    rate_limit=transport.rate_limit, deadline_ns=transport.deadline(start_request),
+                    low_speed=transport.low_speed, decode_content=transport.decode_content
+                )
+        request_ns = time.perf_counter_ns() - start_request
         
-        try:
-            if 'application/json' in content_type:
-                content = json.loads(response.text)
-            elif 'application/xml' in content_type or 'text/xml' in content_type:
-                content = xml.dom.minidom.parseString(response.text).toprettyxml()
-            else:
-                content = response.text
-        except:
-            content = response.text
-
-        timing['processing_time'] = (time.time() - start_processing) * 1000
-        total_time = (time.time() - start_time) * 1000
+        # Record response metrics; a connection counts as reused only if no new
+        # connection had to be opened for this request
+        metrics.update({
+            'response_size': body.size,
+            'is_compressed': 'gzip' in response.headers.get('content-encoding', '').lower(),
+            'connection_reused': timer.connection_reused,
+            'connection_state': 'warm' if timer.connection_reused else 'cold',
+            'dns_cached': timer.dns_cached,
+            'http_version': HTTP_VERSION_NAMES.get(getattr(response.raw, 'version', None)),
+            'requested_http_version': transport.http_version,
+        })
 
-        # Security analysis
-        security_analysis = analyze_security_headers(dict(response.headers))
+        # Keep the body as bytes; decoding and parsing happen lazily in ResponseResult
+        content_type = response.headers.get('content-type', '').lower()
+        start_processing = time.perf_counter_ns()
+        if body.spilled:
+            # Too large to hold in memory; keep only a preview in the result
+            raw_bytes = body.read(PREVIEW_BYTES)
+        else:
+            raw_bytes = body.detach()
+        body_stats = {**body.stats(), 'preview_only': body.spilled}
+        body.close()
 
-        # Analyze response
-        analysis = {
-            'status_code': response.status_code,
-            'reason': response.reason,
-            'headers': dict(response.headers),
-            'content_type': content_type,
-            'content': content,
-            'raw': response.text,
-            'metadata': {
-                'encoding': response.encoding,
-                'size': calculate_size(response.content),
-                'timing': {
-                    'total_time': f"{total_time:.2f}ms",
-                    'dns_lookup': f"{timing.get('dns_lookup', 0):.2f}ms",
-                    'connect_time': f"{timing.get('connect_time', 0):.2f}ms",
-                    'tls_handshake': f"{timing.get('tls_handshake', 0):.2f}ms" if 'tls_handshake' in timing else None,
-                    'request_time': f"{timing['request_time']:.2f}ms",
-                    'processing_time': f"{timing['processing_time']:.2f}ms",
-                    'server_time': str(response.elapsed)
-                },
-                'performance_metrics': {
-                    'total_score': _calculate_performance_score(timing, metrics),
-                    'compression_enabled': metrics.get('is_compressed', False),
-                    'connection_reused': metrics.get('connection_reused', False),
-                    'response_size': calculate_size(response.content),
-                    'recommendations': _generate_performance_recommendations(timing, metrics)
-                },
-                'redirect_count': len(response.history),
-                'final_url': response.url,
-                'cookies': dict(response.cookies),
-                'security_analysis': security_analysis
-            }
-        }
+        processing_ns = time.perf_counter_ns() - start_processing
+        timing = ResponseTiming.from_phases(
+            timer.phases,
+            request_time=request_ns,
+            processing_time=processing_ns,
+            total_time=time.perf_counter_ns() - start_ns
+        )
 
-        return analysis
+        return ResponseResult(
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=dict(response.headers),
+            content_type=content_type,
+            encoding=response.encoding,
+            raw_bytes=raw_bytes,
+            size_bytes=body_stats['size_bytes'],
+            body=body_stats,
+            timing=timing,
+            server_time_ns=int(response.elapsed.total_seconds() * 1_000_000_000),
+            performance={
+                'total_score': _calculate_performance_score(timing, metrics),
+                'compression_enabled': metrics.get('is_compressed', False),
+                'connection_reused': metrics.get('connection_reused', False),
+                'connection_state': metrics.get('connection_state', 'cold'),
+                'dns_cached': metrics.get('dns_cached', False),
+                'http_version': metrics.get('http_version'),
+                'requested_http_version': metrics.get('requested_http_version'),
+                'recommendations': _generate_performance_recommendations(timing, metrics)
+            },
+            redirect_count=len(response.history),
+            final_url=response.url,
+            cookies=dict(response.cookies),
+            security_analysis=analyze_security_headers(dict(response.headers))
+        )
 
     except requests.exceptions.RequestException as e:
         raise Exception(f"Request failed: {str(e)}")
 
-def _calculate_performance_score(timing: Dict[str, Any], metrics: Dict[str, Any]) -> int:
+def execute_request(request_data: Union[dict, CompiledRequest], environment: str = "default",
+                    max_body_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES) -> ExecutionResult:
+    """
+    Execute a request over the same pooled, phase-timed transport as analyze_response but
+    discard the body instead of buffering and analyzing it. Returns only numeric
+    measurements, which is all load runs need. Transport errors propagate unchanged.
+    Load runs pass a CompiledRequest so nothing is re-prepared per request.
+    """
+    start_ns = time.perf_counter_ns()
+    compiled = _compiled(request_data, environment)
+    transport = compiled.transport
+    with record_phases() as timer, connection_overrides(transport.overrides):
+        response = compiled.send()
+        size = 0
+        with timer.measure('content_transfer'):
+            chunks = paced_chunks(response, DEFAULT_CHUNK_SIZE, transport.rate_limit, transport.deadline(start_ns),
+                                  transport.low_speed, transport.decode_content)
+            for chunk in chunks:
+                size += len(chunk)
+                if max_body_bytes is not None and size >= max_body_bytes:
+                    response.close()
+                    break
+    return ExecutionResult(
+        status_code=response.status_code,
+        size_bytes=size,
+        connection_reused=timer.connection_reused,
+        timing=ResponseTiming.from_phases(timer.phases, total_time=time.perf_counter_ns() - start_ns)
+    )
+
+def _compiled(request_data: Union[dict, CompiledRequest], environment: str) -> CompiledRequest:
+    if isinstance(request_data, CompiledRequest):
+        return request_data
+    return CompiledRequest(request_data, environment)
+
+def _calculate_performance_score(timing: ResponseTiming, metrics: Dict[str, Any]) -> int:
     """
     Calculate a performance score based on timing metrics and response characteristics.
     Returns a score from 0-100.
     """
     score = 100
-    total_time = float(timing.get('total_time', 0))
+    total_time = timing.ms('total_time')
     
     # Time-based scoring
     if total_time > 3000:  # More than 3 seconds
@@ -139,15 +156,15 @@ def _calculate_performance_score(timing: Dict[str, Any], metrics: Dict[str, Any]
         score -= 5
     
     # DNS lookup scoring
-    dns_time = float(timing.get('dns_lookup', 0))
+    dns_time = timing.ms('dns_lookup')
     if dns_time > 500:
         score -= 10
     elif dns_time > 200:
         score -= 5
     
     # Connection and TLS scoring
-    if 'tls_handshake' in timing:
-        tls_time = float(timing['tls_handshake'])
+    if timing.tls_handshake is not None:
+        tls_time = timing.ms('tls_handshake')
         if tls_time > 300:
             score -= 10
         elif tls_time > 100:
@@ -168,19 +185,19 @@ def _calculate_performance_score(timing: Dict[str, Any], metrics: Dict[str, Any]
     
     return max(0, score)  # Ensure score doesn't go below 0
 
-def _generate_performance_recommendations(timing: Dict[str, Any], metrics: Dict[str, Any]) -> List[str]:
+def _generate_performance_recommendations(timing: ResponseTiming, metrics: Dict[str, Any]) -> List[str]:
     """
     Generate performance improvement recommendations based on timing and metrics.
     """
     recommendations = []
-    total_time = float(timing.get('total_time', 0))
+    total_time = timing.ms('total_time')
     
     # Time-based recommendations
     if total_time > 1000:
         recommendations.append("Consider implementing caching to improve response times")
     
     # DNS recommendations
-    dns_time = float(timing.get('dns_lookup', 0))
+    dns_time = timing.ms('dns_lookup')
     if dns_time > 200:
         recommendations.append("Consider using a DNS pre-fetch or a CDN to reduce DNS lookup time")
     
@@ -198,10 +215,18 @@ def _generate_performance_recommendations(timing: Dict[str, Any], metrics: Dict[
         recommendations.append("Consider implementing pagination or response size limits")
     
     # TLS optimization
-    if 'tls_handshake' in timing:
-        tls_time = float(timing['tls_handshake'])
+    if timing.tls_handshake is not None:
+        tls_time = timing.ms('tls_handshake')
         if tls_time > 100:
             recommendations.append("Consider implementing TLS session resumption")
+
+    # Protocol version
+    requested = metrics.get('requested_http_version')
+    if requested and requested != metrics.get('http_version'):
+        recommendations.append(
+            f"HTTP/{requested} was requested but the request used HTTP/{metrics.get('http_version') or '1.1'}; "
+            "timings reflect HTTP/1.1"
+        )
     
     return recommendations
 from typing import List
\ No newline at end of file
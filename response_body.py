@@ -0,0 +1,186 @@
+import hashlib
+import tempfile
+import time
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from requests.exceptions import Timeout
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_SPOOL_THRESHOLD = 8 * 1024 * 1024      # Keep bodies up to 8MB in memory
+DEFAULT_MAX_BODY_BYTES = 256 * 1024 * 1024     # Stop downloading past 256MB
+PREVIEW_BYTES = 64 * 1024
+
+class BodyTooLarge(Exception):
+    """Raised when a body exceeds the configured cap and truncation is not allowed."""
+
+class TransferTimeout(Timeout):
+    """Raised when a transfer runs past its deadline (curl --max-time)."""
+
+def paced_chunks(response, chunk_size: int = DEFAULT_CHUNK_SIZE, rate_limit: Optional[int] = None,
+                 deadline_ns: Optional[int] = None, low_speed: Optional[Tuple[int, int]] = None,
+                 decode_content: bool = True) -> Iterable[bytes]:
+    """
+    Iterate over a streamed response, sleeping as needed to stay under ``rate_limit``
+    bytes per second (curl --limit-rate) and raising TransferTimeout past ``deadline_ns``
+    (a perf_counter_ns value) or when fewer than ``low_speed`` = (bytes per second,
+    seconds) arrive over that many seconds (curl -Y/-y). ``decode_content=False`` yields
+    the body still content-encoded (curl --raw). Without any of them it is plain iter_content.
+    """
+    if rate_limit:
+        chunk_size = max(1024, min(chunk_size, rate_limit // 10))
+    if decode_content:
+        chunks = response.iter_content(chunk_size=chunk_size)
+    else:
+        chunks = response.raw.stream(chunk_size, decode_content=False)
+    if rate_limit is None and deadline_ns is None and low_speed is None:
+        yield from chunks
+        return
+    start = time.perf_counter_ns()
+    received = 0
+    window_start, window_bytes = start, 0
+    for chunk in chunks:
+        received += len(chunk)
+        now = time.perf_counter_ns()
+        if deadline_ns is not None and now > deadline_ns:
+            response.close()
+            raise TransferTimeout("Operation timed out: --max-time reached during transfer")
+        if low_speed is not None:
+            window_bytes += len(chunk)
+            elapsed = (now - window_start) / 1e9
+            if elapsed >= low_speed[1]:
+                if window_bytes / elapsed < low_speed[0]:
+                    response.close()
+                    raise TransferTimeout(
+                        f"Operation too slow: less than {low_speed[0]} bytes/sec over {low_speed[1]} seconds"
+                    )
+                window_start, window_bytes = now, 0
+        yield chunk
+        if rate_limit:
+            ahead = received / rate_limit - (time.perf_counter_ns() - start) / 1e9
+            if ahead > 0:
+                time.sleep(ahead)
+
+class ResponseBody:
+    """
+    Holds a downloaded response body exactly once: in a bytearray while small, spilled to
+    a temporary file once it grows past ``spool_threshold``. Size, SHA-256 and transfer
+    time are computed incrementally while the chunks arrive.
+    """
+
+    def __init__(self, spool_threshold: int = DEFAULT_SPOOL_THRESHOLD):
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self.truncated = False
+        self.transfer_ns = 0
+        self._sha256 = hashlib.sha256()
+        self._buffer: Optional[bytearray] = bytearray()
+        self._file = None
+
+    @classmethod
+    def download(cls, response, max_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES,
+                 spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, truncate: bool = True,
+                 rate_limit: Optional[int] = None, deadline_ns: Optional[int] = None,
+                 low_speed: Optional[Tuple[int, int]] = None, decode_content: bool = True) -> "ResponseBody":
+        """
+        Stream a ``requests`` response (sent with stream=True) into a single buffer,
+        optionally rate-limited and bounded in time (see paced_chunks).
+        """
+        body = cls(spool_threshold)
+        start = time.perf_counter_ns()
+        try:
+            for chunk in paced_chunks(response, chunk_size, rate_limit, deadline_ns, low_speed, decode_content):
+                if max_bytes is not None and body.size + len(chunk) > max_bytes:
+                    if not truncate:
+                        raise BodyTooLarge(f"Response body exceeds the {max_bytes} byte limit")
+                    body.write(chunk[:max_bytes - body.size])
+                    body.truncated = True
+                    break
+                body.write(chunk)
+        except BaseException:
+            # A failed or timed-out read leaves the spill file and the connection open
+            body.close()
+            response.close()
+            raise
+        finally:
+            if body.truncated:
+                # The rest of the body is unread, so the connection cannot be reused
+                response.close()
+            body.transfer_ns = time.perf_counter_ns() - start
+        return body
+
+    def write(self, chunk: bytes):
+        if not chunk:
+            return
+        self._sha256.update(chunk)
+        self.size += len(chunk)
+        if self._file is None and self.size > self.spool_threshold:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(self._buffer)
+            self._buffer = None
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer += chunk
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    @property
+    def throughput(self) -> float:
+        """Transfer rate in bytes per second."""
+        return self.size / (self.transfer_ns / 1e9) if self.transfer_ns else 0.0
+
+    def getbuffer(self) -> memoryview:
+        """Zero-copy view of an in-memory body."""
+        if self.spilled:
+            raise ValueError("Body was spilled to disk; use iter_chunks() or read()")
+        return memoryview(self._buffer)
+
+    def read(self, limit: Optional[int] = None) -> bytes:
+        """Return up to ``limit`` bytes from the start of the body."""
+        if not self.spilled:
+            return bytes(self._buffer[:limit] if limit is not None else self._buffer)
+        self._file.seek(0)
+        return self._file.read(-1 if limit is None else limit)
+
+    def detach(self) -> bytearray:
+        """Hand over the in-memory buffer without copying; the body is empty afterwards."""
+        if self.spilled:
+            raise ValueError("Body was spilled to disk; use iter_chunks() or read()")
+        buffer, self._buffer = self._buffer, bytearray()
+        return buffer
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Iterate over the body without materializing it."""
+        if not self.spilled:
+            view = memoryview(self._buffer)
+            for offset in range(0, self.size, chunk_size):
+                yield bytes(view[offset:offset + chunk_size])
+            return
+        self._file.seek(0)
+        while True:
+            chunk = self._file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._buffer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'size_bytes': self.size,
+            'sha256': self.sha256,
+            'truncated': self.truncated,
+            'spilled_to_disk': self.spilled,
+            'transfer_ms': self.transfer_ns / 1_000_000,
+            'throughput_bps': self.throughput
+        }
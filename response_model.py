@@ -0,0 +1,187 @@
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass, asdict, field, fields, replace
+from typing import Dict, Any, Callable, Iterator, Optional, Union
+
+import content_sniffer
+import json_codec
+import json_viewer
+import xml_stream
+from timing_engine import PHASES
+
+NS_PER_MS = 1_000_000
+RETAINED_PREVIEW_BYTES = 64 * 1024   # Body bytes kept by ResponseResult.retained()
+
+@dataclass(slots=True)
+class ResponseTiming:
+    """Durations of one exchange in integer nanoseconds; format with utils.format_duration."""
+    dns_lookup: int = 0
+    tcp_connect: int = 0
+    tls_handshake: Optional[int] = None     # None when no handshake took place
+    request_write: int = 0
+    time_to_first_byte: int = 0
+    content_transfer: int = 0
+    request_time: int = 0
+    processing_time: int = 0
+    total_time: int = 0
+
+    @classmethod
+    def from_phases(cls, phases: Dict[str, int], **totals: int) -> "ResponseTiming":
+        """Build from PhaseTimer.phases plus totals such as request_time and total_time."""
+        return cls(**{phase: phases[phase] for phase in PHASES if phase in phases}, **totals)
+
+    def ms(self, name: str) -> float:
+        """One duration in milliseconds (0 for a phase that did not happen)."""
+        return (getattr(self, name) or 0) / NS_PER_MS
+
+    def to_dict(self) -> Dict[str, Optional[int]]:
+        return asdict(self)
+
+@dataclass(slots=True)
+class ExecutionResult:
+    """What a load run keeps of one exchange: status, byte count and timings."""
+    status_code: int
+    size_bytes: int
+    connection_reused: bool
+    timing: ResponseTiming
+
+@dataclass(slots=True)
+class ResponseResult:
+    """
+    Analyzed response with numeric measurements only: byte counts and nanosecond timings.
+    Human-readable sizes and durations are produced at render time.
+
+    The body is kept as raw bytes (only a preview when it was spilled to disk). Decoded
+    text, parsed JSON, the XML tree and pretty-printed text are built the first time they
+    are asked for and memoized, so runs that never look at the body never parse it.
+    """
+    status_code: int
+    reason: str
+    headers: Dict[str, str]
+    content_type: str
+    encoding: Optional[str]
+    raw_bytes: Union[bytes, bytearray]
+    size_bytes: int
+    body: Dict[str, Any]                    # ResponseBody.stats() plus 'preview_only'
+    timing: ResponseTiming
+    server_time_ns: int                     # requests' elapsed time up to the parsed headers
+    performance: Dict[str, Any]
+    redirect_count: int
+    final_url: str
+    cookies: Dict[str, str]
+    security_analysis: Dict[str, Any]
+    _views: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def is_success(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    @property
+    def total_ms(self) -> float:
+        return self.timing.ms('total_time')
+
+    def _view(self, name: str, build: Callable[[], Any]) -> Any:
+        try:
+            return self._views[name]
+        except KeyError:
+            value = self._views[name] = build()
+            return value
+
+    @property
+    def kind(self) -> str:
+        """Body format sniffed from its leading bytes and Content-Type (see content_sniffer)."""
+        return self._view('kind', lambda: content_sniffer.sniff_content(self.raw_bytes, self.content_type))
+
+    @property
+    def is_json(self) -> bool:
+        return self.kind == content_sniffer.JSON
+
+    @property
+    def is_xml(self) -> bool:
+        return self.kind == content_sniffer.XML
+
+    @property
+    def is_html(self) -> bool:
+        return self.kind == content_sniffer.HTML
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the response encoding (UTF-8 when unknown)."""
+        return self._view('text', lambda: str(self.raw_bytes, self.encoding or 'utf-8', errors='replace'))
+
+    @property
+    def raw(self) -> str:
+        return self.text
+
+    @property
+    def json(self) -> Any:
+        """Parsed JSON body; raises ValueError if the body is not valid JSON."""
+        def _parse():
+            if (self.encoding or 'utf-8').lower().replace('-', '') == 'utf8':
+                return json_codec.loads(self.raw_bytes)   # Parses the bytes without decoding first
+            return json_codec.loads(self.text)
+        return self._view('json', _parse)
+
+    @property
+    def xml_tree(self) -> ElementTree.Element:
+        """Root of the parsed XML body; raises ElementTree.ParseError if it is not well-formed."""
+        return self._view('xml_tree', lambda: ElementTree.fromstring(self.raw_bytes))
+
+    @property
+    def xml_stats(self) -> Dict[str, Any]:
+        """Element count, depth and namespaces from a streaming pass (see xml_stream.analyze_xml)."""
+        return self._view('xml_stats', lambda: xml_stream.analyze_xml(self.raw_bytes))
+
+    @property
+    def pretty_text(self) -> str:
+        """Body pretty-printed for its content type, or the plain text if that fails."""
+        def _format():
+            if self.body.get('preview_only'):
+                return self.text
+            try:
+                if self.is_json:
+                    return json_codec.dumps(self.json, indent=True, sort_keys=True)
+                if self.is_xml:
+                    return "\n".join(xml_stream.iter_pretty_xml(self.raw_bytes))
+                if self.is_html:
+                    from bs4 import BeautifulSoup
+                    return BeautifulSoup(self.text, 'html.parser').prettify()
+            except Exception:
+                pass
+            return self.text
+        return self._view('pretty_text', _format)
+
+    def iter_pretty_lines(self) -> Iterator[str]:
+        """Pretty-printed JSON body line by line, from the parsed view if already built."""
+        if 'json' in self._views:
+            return json_viewer.iter_pretty_lines(self._views['json'])
+        return json_viewer.iter_pretty_bytes(self.raw_bytes)
+
+    @property
+    def content(self) -> Any:
+        """Parsed JSON for JSON bodies, otherwise the pretty-printed text."""
+        def _content():
+            if self.is_json and not self.body.get('preview_only'):
+                try:
+                    return self.json
+                except ValueError:
+                    pass
+            return self.pretty_text
+        return self._view('content', _content)
+
+    def retained(self, max_body_bytes: int = RETAINED_PREVIEW_BYTES) -> "ResponseResult":
+        """
+        A copy for long-lived storage such as the request history: measurements and
+        analyses are kept, the body only up to ``max_body_bytes`` (marked as a preview).
+        """
+        if len(self.raw_bytes) <= max_body_bytes:
+            return replace(self, raw_bytes=bytes(self.raw_bytes))
+        return replace(
+            self, raw_bytes=bytes(self.raw_bytes[:max_body_bytes]), body={**self.body, 'preview_only': True}
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, JSON-serializable form (timings stay in nanoseconds, the body as text)."""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in ('raw_bytes', '_views')}
+        data['timing'] = self.timing.to_dict()
+        data['text'] = self.text
+        return data
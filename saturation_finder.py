@@ -0,0 +1,91 @@
+from dataclasses import replace
+from typing import Dict, Any, Callable, List, Optional
+
+from api_analyzer import LatencySLO, analyze_run_health
+from load_tester import LoadPlan, run_load_test_sync
+
+def find_saturation(base_plan: LoadPlan, slo: LatencySLO, start_rate: float = 10.0,
+                    max_rate: float = 10_000.0, step_duration: float = 10.0,
+                    growth: float = 2.0, search_steps: int = 5, processes: int = 1,
+                    on_step: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Find the highest arrival rate the target sustains within an SLO.
+
+    Open-loop steps ramp the rate geometrically from ``start_rate`` until a step violates
+    the SLO (or ``max_rate`` is reached), then binary-search between the last passing and
+    first failing rate. Every step is judged by api_analyzer.analyze_run_health on its
+    aggregated statistics; the steps together form the latency curve up to the knee.
+    ``base_plan.concurrency`` caps the requests in flight during each step.
+    """
+    if start_rate <= 0 or growth <= 1:
+        raise ValueError("start_rate must be positive and growth greater than 1")
+
+    steps: List[Dict[str, Any]] = []
+
+    def _run_step(rate: float) -> bool:
+        plan = replace(base_plan, rate=rate, duration=step_duration, total_requests=None, profile=None)
+        if processes > 1:
+            from load_workers import run_multiprocess
+            stats = run_multiprocess(plan, processes)
+        else:
+            stats = run_load_test_sync(plan)
+        summary = stats.summary()
+        health = analyze_run_health(summary, slo, offered_rate=rate)
+        step = {
+            'rate': rate,
+            'summary': summary,
+            'health': health,
+            'meets_slo': health['meets_slo']
+        }
+        steps.append(step)
+        if on_step:
+            on_step(step)
+        return step['meets_slo']
+
+    passing: Optional[float] = None
+    failing: Optional[float] = None
+    rate = start_rate
+    while True:
+        if _run_step(rate):
+            passing = rate
+            if rate >= max_rate:
+                break
+            rate = min(rate * growth, max_rate)
+        else:
+            failing = rate
+            break
+
+    if passing is not None and failing is not None:
+        low, high = passing, failing
+        for _ in range(search_steps):
+            if high - low <= max(1.0, low * 0.02):
+                break
+            middle = (low + high) / 2
+            if _run_step(middle):
+                low = middle
+            else:
+                high = middle
+        passing, failing = low, high
+
+    best = max((s for s in steps if s['meets_slo']), key=lambda s: s['rate'], default=None)
+    return {
+        'slo': {
+            'percentile': slo.percentile,
+            'max_latency_ms': slo.max_latency_ms,
+            'max_error_rate': slo.max_error_rate
+        },
+        'max_sustainable_rate': passing,
+        'max_sustainable_throughput': best['summary']['throughput_rps'] if best else 0.0,
+        'knee_rate': failing,
+        'reached_max_rate': failing is None,
+        'curve': [
+            {
+                'rate': s['rate'],
+                'throughput_rps': s['summary']['throughput_rps'],
+                'latency_ms': (s['summary']['corrected_latency_ms'] or s['summary']['latency_ms'])[f"p{slo.percentile:g}"],
+                'error_rate': s['summary']['error_rate'],
+                'meets_slo': s['meets_slo']
+            }
+            for s in sorted(steps, key=lambda s: s['rate'])
+        ]
+    }
@@ -0,0 +1,164 @@
+import codecs
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_MATCH_LENGTH = 512      # Every pattern is bounded so matches can straddle chunk boundaries
+MAX_REPORTED_MATCHES = 100
+
+PARAM_KEYWORDS = ('password', 'token', 'key', 'secret', 'auth', 'pwd', 'pass', 'credential', 'private')
+
+# One alternation, one pass: the name of the group that matched is the category.
+# Everything but the key header starts on a word boundary, which is tested once up
+# front so most positions fail after a single check; the email local part is
+# possessive so a word without '@' is not re-read by backtracking.
+_PRIVATE_KEY = r'-----BEGIN (?:[A-Z]+ )?PRIVATE KEY-----'
+_PATTERNS = (
+    ("jwt", r'eyJ[\w-]{8,120}\.eyJ[\w-]{8,250}\.[\w-]{8,120}'),
+    ("email", r'[A-Za-z0-9._%+-]{1,64}+@[A-Za-z0-9.-]{1,190}\.[A-Za-z]{2,24}\b'),
+    ("phone", r'\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    ("ssn", r'\d{3}-?\d{2}-?\d{4}\b'),
+    ("keyword", r'(?i:password|secret|key|token|auth)\b'),
+)
+_SCANNER = re.compile(
+    f"(?P<private_key>{_PRIVATE_KEY})|\\b(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _PATTERNS)
+    + ")"
+)
+
+@dataclass(slots=True)
+class SensitiveMatch:
+    category: str
+    start: int          # Character offset in the scanned text
+    end: int
+    preview: str        # Masked excerpt, safe to display
+
+@dataclass
+class ScanReport:
+    """Findings of one scan: counts per category and the first matches with locations."""
+    counts: Dict[str, int] = field(default_factory=dict)
+    matches: List[SensitiveMatch] = field(default_factory=list)
+    scanned_chars: int = 0
+
+    @property
+    def found(self) -> bool:
+        return bool(self.counts)
+
+    def add(self, category: str, start: int, end: int, text: str, max_matches: int):
+        self.counts[category] = self.counts.get(category, 0) + 1
+        if len(self.matches) < max_matches:
+            self.matches.append(SensitiveMatch(category, start, end, _mask(text)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'found': self.found,
+            'counts': dict(self.counts),
+            'matches': [
+                {'category': m.category, 'start': m.start, 'end': m.end, 'preview': m.preview}
+                for m in self.matches
+            ],
+            'scanned_chars': self.scanned_chars
+        }
+
+def _mask(text: str) -> str:
+    return text if len(text) <= 4 else text[:2] + "*" * min(len(text) - 4, 12) + text[-2:]
+
+def scan_text(text: str, max_matches: int = MAX_REPORTED_MATCHES) -> ScanReport:
+    """Scan a string in a single pass over the combined pattern."""
+    report = ScanReport(scanned_chars=len(text))
+    for match in _SCANNER.finditer(text):
+        report.add(match.lastgroup, match.start(), match.end(), match.group(), max_matches)
+    return report
+
+def scan_chunks(chunks: Iterable[Union[str, bytes]], encoding: str = "utf-8",
+                max_matches: int = MAX_REPORTED_MATCHES) -> ScanReport:
+    """
+    Scan a streamed body (e.g. ResponseBody.iter_chunks()) without joining it. Bytes are
+    decoded incrementally; the last MAX_MATCH_LENGTH characters of each window are carried
+    into the next so matches across chunk boundaries are found exactly once.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    report = ScanReport()
+    buffer = ""
+    offset = 0          # Position of buffer[0] in the whole text
+    resume = 0          # Scanning restarts here: after the carried context or the last match
+
+    def _scan(final: bool):
+        nonlocal buffer, offset, resume
+        safe_end = len(buffer) if final else len(buffer) - MAX_MATCH_LENGTH
+        for match in _SCANNER.finditer(buffer, resume):
+            if match.start() >= safe_end:
+                break
+            report.add(match.lastgroup, offset + match.start(), offset + match.end(), match.group(), max_matches)
+            resume = match.end()
+        if not final and safe_end > 0:
+            # Keep one character before the carried window so \b still sees its context
+            cut = safe_end - 1
+            buffer = buffer[cut:]
+            offset += cut
+            resume = max(1, resume - cut)
+
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray, memoryview)) else chunk
+        report.scanned_chars += len(text)
+        buffer += text
+        if len(buffer) > 2 * MAX_MATCH_LENGTH:
+            _scan(final=False)
+    tail = decoder.decode(b"", final=True)
+    report.scanned_chars += len(tail)
+    buffer += tail
+    _scan(final=True)
+    return report
+
+class KeywordMatcher:
+    """
+    Substring matcher for a fixed keyword set. Uses an Aho-Corasick automaton when
+    pyahocorasick is installed, otherwise one compiled alternation; either way the text
+    is scanned once for all keywords.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(sorted({k.lower() for k in keywords}))
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            # A lookahead per position finds the longest keyword starting there; the
+            # keywords it contains (pass in password) are reported with it
+            self._pattern = re.compile(
+                "(?=(" + "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True)) + "))"
+            )
+            self._contained = {
+                keyword: sorted((k for k in self.keywords if k in keyword), key=lambda k: keyword.find(k) + len(k))
+                for keyword in self.keywords
+            }
+
+    def find(self, text: str) -> List[str]:
+        """Keywords occurring in ``text`` (case-insensitive), in order of first appearance."""
+        text = text.lower()
+        if self._automaton is not None:
+            found = (keyword for _, keyword in self._automaton.iter(text))
+        else:
+            found = (keyword for match in self._pattern.finditer(text) for keyword in self._contained[match.group(1)])
+        return list(dict.fromkeys(found))
+
+_PARAM_MATCHER = KeywordMatcher(PARAM_KEYWORDS)
+
+def scan_query(query_string: str, matcher: Optional[KeywordMatcher] = None) -> Dict[str, List[str]]:
+    """Query parameters whose name or value contains a sensitive keyword, with the keywords."""
+    matcher = matcher or _PARAM_MATCHER
+    findings = {}
+    for param in query_string.split('&'):
+        keywords = matcher.find(param)
+        if keywords:
+            findings[param.split('=', 1)[0]] = keywords
+    return findings
@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import http.server
+import json
+import threading
+import time
+
+import pytest
+
+DIGEST_REALM = "tests"
+DIGEST_NONCE = "0123456789abcdef"
+DIGEST_USERS = {"a": "b"}
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Echo server: replies with the request line, headers and body it received."""
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, body: bytes, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _echo(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        if self.path.startswith("/redirect"):
+            self._reply(302, b"", [("Location", "/echo")])
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        if self.path.startswith("/gzip"):
+            self._reply(200, gzip.compress(b'{"zipped": true}'), [("Content-Encoding", "gzip")])
+            return
+        if self.path.startswith("/big"):
+            self._reply(200, b"x" * 200_000)
+            return
+        if self.path.startswith("/digest") and not self._digest_ok():
+            challenge = f'Digest realm="{DIGEST_REALM}", nonce="{DIGEST_NONCE}", qop="auth"'
+            self._reply(401, b"{}", [("WWW-Authenticate", challenge)])
+            return
+        self._reply(200, json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "headers": dict(self.headers),
+            "length": len(body),
+            "body": body.decode("utf-8", errors="replace")
+        }).encode())
+
+    def _digest_ok(self) -> bool:
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Digest "):
+            return False
+        fields = dict(
+            (key.strip(), value.strip().strip('"'))
+            for key, _, value in (item.partition("=") for item in header[7:].split(","))
+        )
+        password = DIGEST_USERS.get(fields.get("username"))
+        if password is None:
+            return False
+        ha1 = _md5(f"{fields['username']}:{DIGEST_REALM}:{password}")
+        ha2 = _md5(f"{self.command}:{fields['uri']}")
+        expected = _md5(f"{ha1}:{fields['nonce']}:{fields['nc']}:{fields['cnonce']}:{fields['qop']}:{ha2}")
+        return fields.get("response") == expected
+
+    do_GET = do_POST = do_PUT = do_HEAD = do_DELETE = _echo
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="session")
+def http_server():
+    """Base URL of a threaded echo server on a free loopback port."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,22 @@
+import json
+
+from async_engine import run_many
+from curl_parser import parse_curl_command
+from response_model import ResponseResult
+
+def test_results_come_back_in_input_order(http_server):
+    requests_data = [parse_curl_command(f"curl {http_server}/echo?n={n}") for n in range(6)]
+    results = run_many(requests_data, concurrency=3)
+    assert [json.loads(result.text)["path"] for result in results] == [f"/echo?n={n}" for n in range(6)]
+
+def test_failures_are_returned_in_place(http_server):
+    requests_data = [
+        parse_curl_command(f"curl {http_server}/echo"),
+        parse_curl_command("curl http://127.0.0.1:9/unreachable"),
+    ]
+    ok, failed = run_many(requests_data, concurrency=2, warm_dns=False)
+    assert isinstance(ok, ResponseResult) and ok.status_code == 200
+    assert isinstance(failed, Exception)
+
+def test_empty_input():
+    assert run_many([]) == []
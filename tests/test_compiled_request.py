@@ -0,0 +1,42 @@
+import json
+
+from compiled_request import CompiledRequest, interpolate_request
+from connection_pool import get_pool_manager
+from curl_parser import parse_curl_command
+from load_tester import LoadPlan, run_load_test_sync
+from response_analyzer import execute_request
+
+def test_interpolate_request_substitutes_url_headers_and_body():
+    request = {"method": "POST", "url": "http://{$host}/x", "headers": {"X-Id": "{$id}"}, "data": "id={$id}"}
+    result = interpolate_request(request, {"host": "example.test", "id": "7"})
+    assert result["url"] == "http://example.test/x"
+    assert result["headers"] == {"X-Id": "7"}
+    assert result["data"] == "id=7"
+    assert request["url"] == "http://{$host}/x"
+
+def test_compiled_request_is_reused_across_sends(http_server):
+    compiled = CompiledRequest(parse_curl_command(f"curl -H 'X-Name: café' {http_server}/echo"))
+    prepared = compiled.prepared
+    for _ in range(2):
+        response = compiled.send()
+        assert json.loads(response.content)["headers"]["X-Name"] == "café"
+    assert compiled.prepared is prepared
+
+def _pooled_requests(base_url: str) -> int:
+    return sum(entry["requests"] for entry in get_pool_manager().stats()["origins"] if entry["origin"] == base_url)
+
+def test_compiling_does_not_count_as_a_pooled_request(http_server):
+    compiled = CompiledRequest(parse_curl_command(f"curl {http_server}/echo"))
+    compiled.send()
+    before = _pooled_requests(http_server)
+    CompiledRequest(parse_curl_command(f"curl {http_server}/echo"))
+    assert _pooled_requests(http_server) == before
+
+def test_digest_auth_is_answered_on_every_sending_thread(http_server):
+    request = parse_curl_command(f"curl --digest -u a:b {http_server}/digest")
+    assert execute_request(CompiledRequest(request)).status_code == 200
+
+    stats = run_load_test_sync(LoadPlan(request_data=request, concurrency=2, total_requests=4))
+    summary = stats.summary()
+    assert summary["errors"] == 0
+    assert summary["status_counts"] == {"200": 4}
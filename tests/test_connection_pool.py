@@ -0,0 +1,61 @@
+import pytest
+
+from connection_pool import ConnectionPoolManager, PoolConfig
+
+def test_pool_key_normalizes_the_origin():
+    assert ConnectionPoolManager.pool_key("HTTPS://Example.COM/path") == ("default", "https", "example.com", 443, "")
+    assert ConnectionPoolManager.pool_key("http://x.test:8080/", "staging", "v") == ("staging", "http", "x.test", 8080, "v")
+    with pytest.raises(ValueError):
+        ConnectionPoolManager.pool_key("ftp://x.test/")
+
+def test_sessions_are_shared_per_origin_and_environment():
+    manager = ConnectionPoolManager()
+    first = manager.acquire("http://x.test/a")
+    assert manager.acquire("http://x.test/b?q=1") is first
+    assert manager.acquire("http://x.test/a", "staging") is not first
+    assert manager.acquire("http://x.test/a", variant="pinned") is not first
+    stats = manager.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    manager.close_environment("staging")
+    assert len(manager.stats()["origins"]) == 2
+    manager.close_all()
+
+def test_least_recently_used_origin_is_evicted():
+    manager = ConnectionPoolManager(PoolConfig(max_origins=2))
+    manager.acquire("http://a.test/")
+    manager.acquire("http://b.test/")
+    manager.acquire("http://a.test/")
+    manager.acquire("http://c.test/")
+    origins = {entry["origin"] for entry in manager.stats()["origins"]}
+    assert origins == {"http://a.test:80", "http://c.test:80"}
+    assert manager.stats()["evictions"] == 1
+    manager.close_all()
+
+def test_idle_origins_are_evicted():
+    manager = ConnectionPoolManager(PoolConfig(idle_timeout=0))
+    manager.acquire("http://a.test/")
+    assert manager.evict_idle() == 1
+    assert manager.stats()["origins"] == []
+
+def test_connections_are_reused(http_server):
+    manager = ConnectionPoolManager()
+    pooled = manager.acquire(http_server)
+    assert not manager.is_warm(http_server)
+    for _ in range(3):
+        pooled.session.get(f"{http_server}/echo").content
+    assert manager.is_warm(http_server)
+    assert pooled.connection_count() == 1
+
+def test_reserved_capacity_grows_origins_without_closing_them(http_server):
+    manager = ConnectionPoolManager()
+    pooled = manager.acquire(http_server)
+    response = pooled.session.get(f"{http_server}/big", stream=True)
+    with manager.reserve_capacity(50):
+        assert manager.acquire(http_server) is pooled
+        assert pooled.pool_maxsize == 50
+        assert manager.acquire("http://other.test/").pool_maxsize == 50
+    # The request in flight on the replaced adapter still completes
+    assert len(response.content) == 200_000
+    assert manager.config.pool_maxsize == 10
+    assert manager.acquire("http://third.test/").pool_maxsize == 10
+    assert pooled.session.get(f"{http_server}/echo").status_code == 200
@@ -0,0 +1,33 @@
+import pytest
+
+import content_sniffer as sniffer
+from content_sniffer import header_content_type, sniff_content
+
+@pytest.mark.parametrize("body, content_type, expected", [
+    (b'{"a": 1}', None, sniffer.JSON),
+    (b'\xef\xbb\xbf  [1, 2]', "text/plain", sniffer.JSON),
+    (b'{"a": 1}', "application/x-www-form-urlencoded", sniffer.JSON),
+    (b'{"a": 1}\n{"a": 2}\n', None, sniffer.NDJSON),
+    (b'{"a": 1}', "application/x-ndjson", sniffer.NDJSON),
+    (b'<?xml version="1.0"?><a/>', None, sniffer.XML),
+    (b"<!doctype html><html></html>", "application/xml", sniffer.HTML),
+    (b"a=1&b=two", "application/x-www-form-urlencoded", sniffer.FORM),
+    (b"a=1&b=two", None, sniffer.FORM),
+    (b"--boundary\r\nContent-Disposition: form-data\r\n", None, sniffer.MULTIPART),
+    (b"\x89PNG\r\n\x1a\n", "text/plain", sniffer.BINARY),
+    (bytes(range(1, 32)) * 4, None, sniffer.BINARY),
+    (b"plain words", None, sniffer.RAW),
+    (b"not json", "application/json", sniffer.JSON),
+    (b"a,b\n1,2", "text/csv", sniffer.RAW),
+    ("<root/>", None, sniffer.XML),
+])
+def test_sniff_content(body, content_type, expected):
+    assert sniff_content(body, content_type) == expected
+
+def test_only_the_head_is_inspected():
+    body = b'{"a": "' + b"x" * sniffer.SNIFF_BYTES + b"\x00" * 10_000
+    assert sniff_content(body) == sniffer.JSON
+
+def test_header_content_type_ignores_case():
+    assert header_content_type({"content-TYPE": "text/xml"}) == "text/xml"
+    assert header_content_type({"Accept": "*/*"}) is None
@@ -0,0 +1,35 @@
+from curl_ingest import ingest_curl_commands, ingest_file, iter_commands
+
+EXPORT = """# exported from devtools
+curl 'http://a.test/1' \\
+  -H 'Accept: application/json' ;
+
+curl http://a.test/2 -X DELETE
+curl -H http://a.test/3
+"""
+
+def test_iter_commands_joins_continuations_and_skips_comments():
+    commands = list(iter_commands(EXPORT.splitlines()))
+    assert commands[0] == (2, 3, "curl 'http://a.test/1'  -H 'Accept: application/json'")
+    assert [(start, end) for start, end, _ in commands] == [(2, 3), (5, 5), (6, 6)]
+
+def test_escaped_backslash_does_not_continue():
+    assert list(iter_commands(["curl 'http://a.test/x\\\\'", "curl http://a.test/y"]))[0][1] == 1
+
+def test_unterminated_continuation_is_still_yielded():
+    assert list(iter_commands(["curl http://a.test \\"])) == [(1, 1, "curl http://a.test")]
+
+def test_ingest_reports_errors_per_command():
+    results = list(ingest_curl_commands(EXPORT.splitlines(), workers=1))
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[0].request["headers"]["Accept"] == "application/json"
+    assert results[1].request["method"] == "DELETE"
+    assert results[2].line == 6 and results[2].error
+    assert results[2].to_dict()["request"] is None
+
+def test_ingest_across_processes_keeps_input_order(tmp_path):
+    path = tmp_path / "commands.txt"
+    path.write_text("".join(f"curl http://a.test/{i}\n" for i in range(50)))
+    results = list(ingest_file(str(path), workers=2, batch_size=8))
+    assert [result.request["url"] for result in results] == [f"http://a.test/{i}" for i in range(50)]
+    assert [result.line for result in results] == list(range(1, 51))
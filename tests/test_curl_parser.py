@@ -0,0 +1,144 @@
+import json
+import socket
+
+import pytest
+import requests
+
+from compiled_request import CompiledRequest, TransportSettings
+from curl_parser import CURL_OPTIONS, normalize_command, parse_curl_command, referenced_files
+from response_analyzer import analyze_response
+
+def test_option_table_has_no_duplicate_spellings():
+    names = [name for option in CURL_OPTIONS for name in option.names]
+    assert len(names) == len(set(names))
+
+def test_normalize_command_joins_continuations():
+    assert normalize_command("curl \\\n  -H 'A: 1' \\\r\n  http://x.test  ") == "curl -H 'A: 1' http://x.test"
+
+def test_headers_and_default_scheme():
+    request = parse_curl_command("curl -H 'Accept: application/json' -A agent x.test/path")
+    assert request["url"] == "http://x.test/path"
+    assert request["method"] == "GET"
+    assert request["headers"] == {"Accept": "application/json", "User-Agent": "agent"}
+
+def test_bundled_short_flags_and_attached_values():
+    request = parse_curl_command("curl -sSLk -m5 -XDELETE http://x.test")
+    options = request["options"]
+    assert options["follow_redirects"] and options["insecure"]
+    assert options["max_time"] == 5.0
+    assert options["ignored"] == ["-s", "-S"]
+    assert request["method"] == "DELETE"
+
+def test_transport_options():
+    request = parse_curl_command(
+        "curl --compressed --http2 --limit-rate 100K --resolve x.test:80:127.0.0.1 "
+        "--digest -u a:b --bogus http://x.test"
+    )
+    options = request["options"]
+    assert options["compressed"] and options["http_version"] == "2"
+    assert options["limit_rate"] == 100 * 1024
+    assert options["resolve"] == ["x.test:80:127.0.0.1"]
+    assert options["auth"] == ["a", "b"] and options["auth_type"] == "digest"
+    assert options["unsupported"] == ["--bogus"]
+
+@pytest.mark.parametrize("command, method", [
+    ("curl http://x.test", "GET"),
+    ("curl -d a=1 http://x.test", "POST"),
+    ("curl -d '' http://x.test", "POST"),
+    ("curl --data-raw '' http://x.test", "POST"),
+    ("curl -F a=1 http://x.test", "POST"),
+    ("curl -G -d a=1 http://x.test", "GET"),
+    ("curl -I http://x.test", "HEAD"),
+    ("curl -X PATCH -d a=1 http://x.test", "PATCH"),
+])
+def test_implied_method(command, method):
+    assert parse_curl_command(command)["method"] == method
+
+def test_empty_data_is_an_empty_body():
+    assert parse_curl_command("curl -d '' http://x.test")["data"] == ""
+    assert parse_curl_command("curl http://x.test")["data"] is None
+
+def test_empty_data_posts_an_empty_body(http_server):
+    response = CompiledRequest(parse_curl_command(f"curl -d '' {http_server}/echo")).send()
+    echoed = json.loads(response.content)
+    assert echoed["method"] == "POST"
+    assert echoed["length"] == 0
+
+def test_get_moves_data_to_the_query_string():
+    request = parse_curl_command("curl -G -d a=1 -d b=2 'http://x.test/p?z=0'")
+    assert request["url"] == "http://x.test/p?z=0&a=1&b=2"
+    assert request["data"] is None
+
+def test_invalid_commands():
+    for command in ("wget http://x.test", "curl -H", "curl -d a=1", "curl -F a=1 -d b=2 http://x.test"):
+        with pytest.raises(ValueError):
+            parse_curl_command(command)
+
+def test_resolve_entries_accept_bracketed_ipv6_hosts():
+    request = parse_curl_command("curl --resolve '[::1]:8080:127.0.0.1' --resolve x.test:80:10.0.0.1 http://x.test")
+    overrides = TransportSettings(request).overrides
+    assert overrides.resolve == {("::1", 8080): ["127.0.0.1"], ("x.test", 80): ["10.0.0.1"]}
+
+def test_flags_that_change_the_request_are_applied_or_reported():
+    request = parse_curl_command(
+        "curl -sS -o out.json --retry 3 --max-redirs 2 --connect-to a.test:80:b.test:8080 --noproxy a.test "
+        "-4 --interface 127.0.0.1 -Y 100 -y 5 --tcp-nodelay --path-as-is --raw "
+        "--expect100-timeout 2 --tcp-fastopen --tr-encoding http://a.test"
+    )
+    options = request["options"]
+    assert options["ignored"] == ["-s", "-S", "-o", "--retry"]
+    assert options["unsupported"] == ["--expect100-timeout", "--tcp-fastopen", "--tr-encoding"]
+    assert request["url"] == "http://a.test"
+    assert options["max_redirects"] == 2 and options["connect_to"] == ["a.test:80:b.test:8080"]
+    assert options["noproxy"] == "a.test" and options["ip_version"] == 4
+    assert (options["speed_limit"], options["speed_time"]) == (100, 5)
+    assert options["tcp_nodelay"] and options["path_as_is"] and options["raw"]
+
+def test_connection_flags_become_overrides_and_a_pool_variant():
+    transport = TransportSettings(parse_curl_command(
+        "curl --connect-to ::[::1]:8443 -6 --interface 127.0.0.1 --tcp-nodelay -y 5 http://a.test"
+    ))
+    overrides = transport.overrides
+    assert overrides.target("a.test", 80) == ("::1", 8443)
+    assert overrides.family == socket.AF_INET6
+    assert overrides.source_address == ("127.0.0.1", 0)
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in overrides.socket_options
+    assert transport.low_speed == (1, 5) and transport.request_kwargs["timeout"] == (5, 5)
+    assert transport.variant
+    assert TransportSettings(parse_curl_command("curl http://a.test")).variant == ""
+
+def test_max_redirs_limits_followed_redirects(http_server):
+    assert CompiledRequest(parse_curl_command(f"curl -L --max-redirs 1 {http_server}/redirect")).send().status_code == 200
+    with pytest.raises(requests.TooManyRedirects):
+        CompiledRequest(parse_curl_command(f"curl -L --max-redirs 0 {http_server}/redirect")).send()
+    # Sessions of other requests to the origin keep the default limit
+    assert CompiledRequest(parse_curl_command(f"curl -L {http_server}/redirect")).send().status_code == 200
+
+def test_connect_to_sends_to_another_host(http_server):
+    port = http_server.rsplit(":", 1)[1]
+    command = f"curl --connect-to elsewhere.invalid:80:127.0.0.1:{port} http://elsewhere.invalid/echo"
+    result = analyze_response(parse_curl_command(command))
+    assert result.json["headers"]["Host"] == "elsewhere.invalid"
+
+def test_noproxy_bypasses_the_proxy(http_server):
+    command = f"curl -x http://127.0.0.1:9 --noproxy 127.0.0.1 {http_server}/echo"
+    assert CompiledRequest(parse_curl_command(command)).send().status_code == 200
+
+def test_path_as_is_keeps_dot_segments(http_server):
+    compiled = CompiledRequest(parse_curl_command(f"curl --path-as-is {http_server}/x/../echo"))
+    assert json.loads(compiled.send().content)["path"] == "/x/../echo"
+    compiled = CompiledRequest(parse_curl_command(f"curl {http_server}/x/../echo"))
+    assert json.loads(compiled.send().content)["path"] == "/echo"
+
+def test_raw_leaves_the_body_encoded(http_server):
+    decoded = analyze_response(parse_curl_command(f"curl --compressed {http_server}/gzip"))
+    raw = analyze_response(parse_curl_command(f"curl --compressed --raw {http_server}/gzip"))
+    assert decoded.json == {"zipped": True}
+    assert raw.raw_bytes.startswith(b"\x1f\x8b")
+
+def test_referenced_files_are_found_without_reading_them():
+    command = ("curl -d @a.txt --data-urlencode n@b.txt --data-urlencode 'q=x@y' -F 'f=@c.bin;type=text/plain' "
+               "-F 'g=<d.txt' --form-string 'h=@literal' -T e.bin --cacert ca.pem -E cert.pem --key key.pem "
+               "--data-raw @raw http://x.test")
+    assert referenced_files(command) == ["a.txt", "b.txt", "c.bin", "d.txt", "e.bin", "ca.pem", "cert.pem", "key.pem"]
+    assert referenced_files("curl -d a=1 http://x.test") == []
@@ -0,0 +1,66 @@
+import socket
+
+import pytest
+
+import dns_cache
+from dns_cache import DNSCache
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """Counts system lookups; 'missing.test' fails, everything else resolves to two addresses."""
+    calls = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def _getaddrinfo(host, port, family=0, type=0, *args):
+        if host in ("127.0.0.1", "::1"):
+            return real_getaddrinfo(host, port, family, type, *args)
+        calls.append(host)
+        if host == "missing.test":
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 0)),
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("fd00::1", 0, 0, 0)),
+        ]
+
+    monkeypatch.setattr(dns_cache, "dns", None)
+    monkeypatch.setattr(socket, "getaddrinfo", _getaddrinfo)
+    return calls
+
+def test_lookups_are_cached_per_host(resolver):
+    cache = DNSCache()
+    infos, cached = cache.lookup("Example.TEST.", 443)
+    assert not cached
+    assert [info[4] for info in infos] == [("10.0.0.1", 443), ("fd00::1", 443, 0, 0)]
+    infos, cached = cache.lookup("example.test", 80)
+    assert cached and infos[0][4] == ("10.0.0.1", 80)
+    assert resolver == ["example.test"]
+    assert cache.stats()["hits"] == 1
+
+def test_ip_literals_bypass_the_cache(resolver):
+    cache = DNSCache()
+    assert cache.lookup("127.0.0.1", 80)[1]
+    assert cache.stats()["entries"] == 0 and resolver == []
+
+def test_failures_are_cached_negatively(resolver):
+    cache = DNSCache()
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            cache.resolve("missing.test", 80)
+    assert resolver == ["missing.test"]
+    assert cache.stats()["negative_hits"] == 1
+
+def test_entries_expire(resolver):
+    cache = DNSCache(default_ttl=0)
+    cache.resolve("example.test", 80)
+    cache.resolve("example.test", 80)
+    assert resolver == ["example.test", "example.test"]
+
+def test_invalidate_and_warm(resolver):
+    cache = DNSCache()
+    warmed = cache.warm(["http://example.test/a", "example.test", "missing.test"])
+    assert warmed["example.test"] == 2
+    assert "Name or service not known" in warmed["missing.test"]
+    cache.invalidate("EXAMPLE.test")
+    cache.resolve("example.test", 80)
+    assert resolver.count("example.test") == 2
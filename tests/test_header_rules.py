@@ -0,0 +1,81 @@
+from header_rules import (CACHING, DEFAULT_RULES, REQUEST, RESPONSE, SECURITY, HeaderAnalysisCache, HeaderRule,
+                          HeaderRuleSet, header_fingerprint, normalize_headers)
+
+def test_normalize_headers():
+    assert normalize_headers({" Content-Type ": " text/html ", "X-A": 1}) == {"content-type": "text/html", "x-a": "1"}
+
+def test_rules_are_split_by_direction():
+    rule_set = HeaderRuleSet(DEFAULT_RULES)
+    request_names = {rule.name for rule in rule_set.rules(REQUEST)}
+    response_names = {rule.name for rule in rule_set.rules(RESPONSE)}
+    assert "x-csrf-token" in request_names and "x-csrf-token" not in response_names
+    assert "cache-control" in request_names and "cache-control" in response_names
+
+def test_evaluate_scores_present_security_headers():
+    rule_set = HeaderRuleSet(DEFAULT_RULES)
+    evaluation = rule_set.evaluate({
+        "X-Frame-Options": "sameorigin",
+        "Strict-Transport-Security": "includeSubDomains",
+        "Cache-Control": "no-store"
+    }, RESPONSE)
+    assert evaluation.score == 40
+    frame = evaluation.results["x-frame-options"]
+    assert frame["present"] and frame["valid"] and frame["value"] == "sameorigin"
+    assert evaluation.results["strict-transport-security"]["valid"] is False
+    assert "content-security-policy" in evaluation.missing
+    assert "Implement a strict Content-Security-Policy" in evaluation.recommendations
+    assert "Specify Content-Type header" not in evaluation.recommendations
+    assert set(evaluation.group(CACHING)) == {"cache-control"}
+    assert evaluation.headers["cache-control"] == "no-store"
+
+def test_score_is_capped():
+    rules = [HeaderRule(f"x-{i}", f"X-{i}", "", "", weight=60) for i in range(3)]
+    evaluation = HeaderRuleSet(rules).evaluate({f"X-{i}": "1" for i in range(3)}, REQUEST)
+    assert evaluation.score == 100
+
+def test_adding_and_removing_rules_recompiles_the_table():
+    rule_set = HeaderRuleSet(DEFAULT_RULES)
+    version = rule_set.version
+    rule_set.add(HeaderRule("X-Api-Version", "X-Api-Version", "", "Send X-Api-Version", group=SECURITY))
+    assert rule_set.version > version
+    assert rule_set.evaluate({"x-api-version": "2"}, REQUEST).results["x-api-version"]["present"]
+    rule_set.remove("x-api-version")
+    assert "x-api-version" not in rule_set.evaluate({}, REQUEST).results
+
+def test_fingerprint_ignores_order_case_and_volatile_headers():
+    first = header_fingerprint({"Accept": "*/*", "Date": "Mon", "X-Request-Id": "1"})
+    second = header_fingerprint({"x-request-id": "2", "accept": " */* "})
+    assert first == second == (("accept", "*/*"),)
+
+def _counting_compute(calls):
+    def compute(headers):
+        calls.append(headers)
+        return {"count": len(calls)}
+    return compute
+
+def test_cache_reuses_analyses_of_equivalent_header_sets():
+    cache, rule_set, calls = HeaderAnalysisCache(), HeaderRuleSet(DEFAULT_RULES), []
+    compute = _counting_compute(calls)
+    first = cache.analyze("request", {"Accept": "*/*", "Date": "Mon"}, compute, rule_set)
+    assert cache.analyze("request", {"accept": "*/*", "Date": "Tue"}, compute, rule_set) is first
+    cache.analyze("response", {"accept": "*/*"}, compute, rule_set)
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["hit_rate"] == 1 / 3
+
+def test_cache_keeps_volatile_headers_a_rule_inspects():
+    cache, rule_set, calls = HeaderAnalysisCache(), HeaderRuleSet(DEFAULT_RULES), []
+    compute = _counting_compute(calls)
+    rule_set.add(HeaderRule("etag", "ETag", "", "", group=CACHING))
+    cache.analyze("response", {"ETag": "a"}, compute, rule_set)
+    cache.analyze("response", {"ETag": "b"}, compute, rule_set)
+    assert len(calls) == 2
+
+def test_cache_goes_stale_when_rules_change_and_evicts_lru():
+    cache, rule_set, calls = HeaderAnalysisCache(max_entries=2), HeaderRuleSet(DEFAULT_RULES), []
+    compute = _counting_compute(calls)
+    cache.analyze("request", {"A": "1"}, compute, rule_set)
+    rule_set.remove("accept")
+    cache.analyze("request", {"A": "1"}, compute, rule_set)
+    cache.analyze("request", {"B": "1"}, compute, rule_set)
+    assert len(calls) == 3
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
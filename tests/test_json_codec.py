@@ -0,0 +1,44 @@
+import pytest
+
+import json_codec
+
+@pytest.fixture(params=["default", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+def test_loads_accepts_text_and_bytes(codec):
+    assert codec.loads('{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+    assert codec.loads(b'{"a": "caf\xc3\xa9"}') == {"a": "café"}
+    assert codec.loads(memoryview(b"[true]")) == [True]
+
+def test_loads_falls_back_for_non_standard_numbers(codec):
+    assert codec.loads("[NaN]")[0] != codec.loads("[NaN]")[0]
+
+def test_invalid_documents_raise_decode_error(codec):
+    with pytest.raises(json_codec.JSONDecodeError):
+        codec.loads(b'{"a": ')
+    with pytest.raises(ValueError):
+        codec.loads("nope")
+
+def test_dumps_is_compact_unless_indented(codec):
+    assert codec.dumps({"b": 1, "a": "é"}) == '{"b":1,"a":"é"}'
+    assert codec.dumps({"b": 1, "a": 2}, indent=True, sort_keys=True) == '{\n  "a": 2,\n  "b": 1\n}'
+    assert codec.dumps_bytes([1]) == b"[1]"
+
+def test_dumps_handles_big_integers_and_defaults(codec):
+    assert codec.dumps([2 ** 70]) == f"[{2 ** 70}]"
+    assert codec.dumps({"s": {1, 2}}, default=sorted) == '{"s":[1,2]}'
+    with pytest.raises(TypeError):
+        codec.dumps(object())
+
+def test_loads_keeps_integers_beyond_64_bits(codec):
+    assert codec.loads(f'{{"id": {2 ** 70}}}') == {"id": 2 ** 70}
+    assert codec.loads(f"[-{2 ** 64}, 1]".encode()) == [-(2 ** 64), 1]
+    assert codec.loads(memoryview(f"[{10 ** 25}]".encode())) == [10 ** 25]
+
+def test_dumps_writes_non_finite_floats_as_null(codec):
+    value = {"a": float("nan"), "b": [float("inf"), 1.5], "c": (float("-inf"),)}
+    assert codec.dumps(value) == '{"a":null,"b":[null,1.5],"c":[null]}'
+    assert codec.dumps_bytes([float("nan"), 2 ** 70]) == f"[null,{2 ** 70}]".encode()
@@ -0,0 +1,51 @@
+import json
+from itertools import islice
+
+import pytest
+
+from json_viewer import (format_json_path, iter_pretty_bytes, iter_pretty_lines, page_children,
+                         parse_json_path, resolve_json_path)
+
+DOCUMENT = {"b": [1, {"c": None}, []], "a": "x", "e": {}, "key with space": True}
+
+def test_iter_pretty_lines_matches_json_dumps():
+    assert "\n".join(iter_pretty_lines(DOCUMENT)) == json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+    assert "\n".join(iter_pretty_lines(DOCUMENT, sort_keys=True)) == json.dumps(DOCUMENT, indent=2, sort_keys=True)
+    assert list(iter_pretty_lines(5)) == ["5"]
+
+def test_iter_pretty_lines_renders_only_what_is_consumed():
+    huge = list(range(10 ** 6))
+    assert list(islice(iter_pretty_lines(huge), 3)) == ["[", "  0,", "  1,"]
+
+def test_iter_pretty_bytes_reindents_without_parsing():
+    raw = json.dumps(DOCUMENT, separators=(",", ":")).encode()
+    assert "\n".join(iter_pretty_bytes(raw)) == json.dumps(DOCUMENT, indent=2)
+    assert list(iter_pretty_bytes(b'{"a": "b, c: [d]"}')) == ["{", '  "a": "b, c: [d]"', "}"]
+
+def test_json_paths_round_trip():
+    parts = parse_json_path('$.items[3]["a key"][\'b\']')
+    assert parts == ["items", 3, "a key", "b"]
+    assert format_json_path(parts) == '$.items[3]["a key"].b'
+    with pytest.raises(ValueError):
+        parse_json_path("$.items[")
+
+def test_resolve_json_path():
+    assert resolve_json_path(DOCUMENT, "$.b[1].c") is None
+    assert resolve_json_path(DOCUMENT, '$["key with space"]') is True
+    with pytest.raises(ValueError, match=r"Path not found: \$\.b\[9\]"):
+        resolve_json_path(DOCUMENT, "$.b[9].c")
+
+def test_page_children_pages_containers():
+    node = {"items": list(range(120))}
+    result = page_children(node["items"], "$.items", page=3, page_size=50)
+    assert (result["total"], result["pages"], result["page"]) == (120, 3, 3)
+    assert [item["path"] for item in result["items"]][:2] == ["$.items[100]", "$.items[101]"]
+    assert result["text"].startswith("// $.items[100]\n100")
+    assert page_children(node["items"], "$.items", page=99)["page"] == 3
+
+def test_page_children_caps_rendered_lines():
+    node = [list(range(100)), list(range(100))]
+    result = page_children(node, max_lines=20)
+    assert result["truncated"]
+    assert len(result["text"].splitlines()) == 21
+    assert len(result["items"]) == 2
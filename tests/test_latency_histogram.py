@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from latency_histogram import LatencyHistogram
+
+def test_percentiles_keep_three_significant_digits():
+    values = sorted(random.Random(1).randint(1, 5_000_000) for _ in range(20_000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    for percentile in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * percentile / 100) - 1]
+        assert histogram.percentile(percentile) == pytest.approx(exact, rel=1e-3)
+    assert histogram.percentiles((50, 99)) == {"p50": histogram.percentile(50), "p99": histogram.percentile(99)}
+    assert histogram.min == values[0] and histogram.max == values[-1]
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+def test_values_are_clamped_to_the_range():
+    histogram = LatencyHistogram(highest=1000)
+    histogram.record(-5)
+    histogram.record(10_000)
+    assert (histogram.min, histogram.max) == (0, 1000)
+
+def test_merge_is_lossless():
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for value in range(1, 1000):
+        (first if value % 2 else second).record(value * 37)
+        combined.record(value * 37)
+    first.merge(second)
+    assert first.to_dict() == combined.to_dict()
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(significant_digits=2))
+
+def test_round_trip_and_reset():
+    histogram = LatencyHistogram()
+    histogram.record(1234, count=3)
+    copy = LatencyHistogram.from_dict(histogram.to_dict())
+    assert list(copy.iter_buckets()) == list(histogram.iter_buckets())
+    assert copy.total_count == 3
+    histogram.reset()
+    assert histogram.total_count == 0 and histogram.percentile(99) == 0
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        LatencyHistogram(lowest=0)
+    with pytest.raises(ValueError):
+        LatencyHistogram(significant_digits=6)
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+import json_codec
+import load_agent
+from curl_parser import parse_curl_command
+from load_agent import (AgentCoordinator, LoadAgent, check_remote_plan, is_loopback, local_file_references,
+                        parse_agent_address)
+from load_tester import LoadPlan
+
+def _plan(url: str, **options) -> LoadPlan:
+    return LoadPlan(request_data=parse_curl_command(f"curl {url}"), concurrency=2, total_requests=4,
+                    duration=None, **options)
+
+async def _run_with_agents(plan: LoadPlan, agents, token=None, processes_per_agent=1):
+    for agent in agents:
+        await agent.start()
+    coordinator = AgentCoordinator([("127.0.0.1", agent.port) for agent in agents], token)
+    try:
+        return coordinator, await coordinator.run(plan, processes_per_agent)
+    finally:
+        for agent in agents:
+            await agent.stop()
+
+def test_parse_agent_address():
+    assert parse_agent_address("10.0.0.5:9000") == ("10.0.0.5", 9000)
+    assert parse_agent_address("[::1]:9000") == ("::1", 9000)
+    assert parse_agent_address("loadnode") == ("loadnode", load_agent.DEFAULT_AGENT_PORT)
+
+def test_is_loopback():
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+    assert not is_loopback("0.0.0.0") and not is_loopback("") and not is_loopback("10.1.2.3")
+
+def test_agent_refuses_public_bind_without_token():
+    with pytest.raises(ValueError):
+        LoadAgent("0.0.0.0", 0)
+    assert LoadAgent("0.0.0.0", 0, token="secret").token == "secret"
+
+def test_distributed_run_merges_agent_stats(http_server):
+    agents = [LoadAgent("127.0.0.1", 0, token="secret") for _ in range(2)]
+    coordinator, stats = asyncio.run(_run_with_agents(_plan(f"{http_server}/echo"), agents, "secret"))
+    assert stats.requests == 4
+    assert stats.status_counts == {"200": 4}
+    assert coordinator.errors == {}
+
+def test_wrong_token_is_reported_per_agent(http_server):
+    agents = [LoadAgent("127.0.0.1", 0, token="secret")]
+    with pytest.raises(RuntimeError, match="Invalid agent token"):
+        asyncio.run(_run_with_agents(_plan(f"{http_server}/echo"), agents, "wrong"))
+
+def test_local_file_references(tmp_path):
+    body = tmp_path / "body.txt"
+    body.write_text("payload")
+    assert local_file_references(_plan(f"-d @{body} http://x.test")) == [str(body)]
+    assert local_file_references(_plan(f"-F f=@{body} http://x.test")) == [str(body)]
+    assert local_file_references(_plan("http://x.test")) == []
+
+def test_remote_plans_may_not_read_agent_files(http_server, tmp_path, monkeypatch):
+    body = tmp_path / "secret.txt"
+    body.write_text("do not send")
+    agent = LoadAgent("127.0.0.1", 0, token="secret")
+    monkeypatch.setattr(load_agent, "is_loopback", lambda host: False)
+    with pytest.raises(RuntimeError, match="cannot reference local files"):
+        asyncio.run(_run_with_agents(_plan(f"-T {body} {http_server}/echo"), [agent], "secret"))
+
+def test_malformed_agent_messages_only_fail_that_agent(http_server):
+    async def _bad_agent(reader, writer):
+        writer.write(json_codec.dumps_bytes({"type": "hello"}) + b"\n")
+        await reader.readline()
+        writer.write(b"[1, 2, 3]\n")
+        await writer.drain()
+        writer.close()
+
+    async def _run():
+        server = await asyncio.start_server(_bad_agent, "127.0.0.1", 0)
+        good = LoadAgent("127.0.0.1", 0)
+        await good.start()
+        addresses = [("127.0.0.1", server.sockets[0].getsockname()[1]), ("127.0.0.1", good.port)]
+        coordinator = AgentCoordinator(addresses)
+        try:
+            return coordinator, await coordinator.run(_plan(f"{http_server}/echo"))
+        finally:
+            server.close()
+            await good.stop()
+
+    coordinator, stats = asyncio.run(_run())
+    assert stats.requests == 2
+    assert "Malformed" in coordinator.errors[0]
+
+def test_tls_files_and_proxies_are_refused_for_remote_plans(tmp_path):
+    key = tmp_path / "client.key"
+    key.write_text("secret")
+    assert local_file_references(_plan(f"--cacert {key} -E {key} --key {key} http://x.test")) == [str(key)] * 3
+    with pytest.raises(ValueError, match="local files"):
+        check_remote_plan(_plan(f"--cacert {key} http://x.test"))
+    with pytest.raises(ValueError, match="proxy"):
+        check_remote_plan(_plan("-x http://proxy.test:3128 http://x.test"))
+    check_remote_plan(_plan("http://x.test"))
+
+def test_remote_curl_commands_are_checked_before_parsing(tmp_path, monkeypatch):
+    body = tmp_path / "secret.txt"
+    body.write_text("do not read")
+    parsed = []
+    monkeypatch.setattr(load_agent, "is_loopback", lambda host: False)
+    monkeypatch.setattr(load_agent, "plan_from_message", lambda message: parsed.append(message))
+
+    async def _run(command):
+        agent = LoadAgent("127.0.0.1", 0, token="secret")
+        await agent.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", agent.port)
+        try:
+            await reader.readline()
+            writer.write(json_codec.dumps_bytes({"type": "plan", "curl_command": command, "token": "secret"}) + b"\n")
+            await writer.drain()
+            return json_codec.loads(await reader.readline())
+        finally:
+            writer.close()
+            await agent.stop()
+
+    for command in (f"curl --data-urlencode n@{body} http://x.test", f"curl -d @{body} http://x.test"):
+        reply = asyncio.run(_run(command))
+        assert reply["type"] == "error" and "local files" in reply["message"]
+    assert parsed == []
+
+def test_requested_processes_are_capped_at_the_cpu_count(http_server, monkeypatch):
+    used = []
+
+    def _run_plan(plan, processes, on_progress, interval):
+        used.append(processes)
+        return load_agent.run_load_test_sync(plan)
+
+    monkeypatch.setattr(load_agent, "_run_plan", _run_plan)
+    monkeypatch.setattr(load_agent.os, "cpu_count", lambda: 2)
+    agent = LoadAgent("127.0.0.1", 0)
+    asyncio.run(_run_with_agents(_plan(f"{http_server}/echo"), [agent], processes_per_agent=10_000))
+    assert used == [2]
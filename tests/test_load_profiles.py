@@ -0,0 +1,58 @@
+from itertools import islice
+
+import pytest
+
+from load_profiles import LoadProfile, ProfileStage
+from load_windows import WindowedStats
+
+def test_constant_schedule():
+    offsets = list(LoadProfile.constant(10, 2).schedule())
+    assert len(offsets) == 20
+    assert offsets[:3] == pytest.approx([0.0, 0.1, 0.2])
+
+def test_ramp_schedule_follows_the_rate_integral():
+    profile = LoadProfile.ramp(0, 100, 10)
+    offsets = list(profile.schedule())
+    assert len(offsets) == 500
+    assert offsets == sorted(offsets) and offsets[-1] < 10
+    # Half the area of a linear ramp lies in its last 30% of the time
+    assert sum(1 for offset in offsets if offset < 10 / 2 ** 0.5) == pytest.approx(250, abs=1)
+    assert profile.rate_at(5) == 50 and profile.rate_at(11) == 0
+
+def test_steps_soak_and_scaling():
+    steps = LoadProfile.steps([10, 20], 5)
+    assert steps.total_duration == 10 and steps.peak_rate == 20
+    assert len(list(steps.schedule())) == 150
+    soak = LoadProfile.soak(50, 3600, ramp_up=60)
+    assert soak.stages[0] == ProfileStage(60, 0.0, 50)
+    assert list(islice(soak.schedule(), 1)) == [0.0]
+    assert LoadProfile.steps([10, 20], 5).scaled(0.5).peak_rate == 10
+
+def test_profiles_from_dicts():
+    assert LoadProfile.from_dict({"type": "steps", "rates": [1, 2], "step_duration": 3}) == LoadProfile.steps([1, 2], 3)
+    profile = LoadProfile.ramp(1, 5, 10, hold=2)
+    assert LoadProfile.from_dict(profile.to_dict()) == profile
+    with pytest.raises(ValueError):
+        LoadProfile.from_dict({"type": "sine"})
+    with pytest.raises(ValueError):
+        LoadProfile([])
+    with pytest.raises(ValueError):
+        LoadProfile([ProfileStage(0, 10)])
+
+def test_windows_keep_a_fixed_number_of_seconds():
+    stats = WindowedStats(capacity=3)
+    for second in range(6):
+        stats.record(second, 1000 * (second + 1), size_bytes=10)
+    stats.record(1, 5000)   # Already fell out of the buffer
+    assert [window.second for window in stats.windows()] == [3, 4, 5]
+    assert stats.rolling(2)['rps'] == 1.0
+    assert [point['p50_ms'] for point in stats.series()] == pytest.approx([4, 5, 6], rel=0.01)
+
+def test_windows_merge_and_round_trip():
+    first, second = WindowedStats(), WindowedStats()
+    first.record(0, 1000)
+    second.record(0, 2000, error=True)
+    second.record(1, 3000)
+    merged = WindowedStats.from_dict(first.merge(second).to_dict())
+    assert [(w.second, w.requests, w.errors) for w in merged.windows()] == [(0, 2, 1), (1, 1, 0)]
+    assert merged.rolling(10)['error_rate'] == pytest.approx(1 / 3)
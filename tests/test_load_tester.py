@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+import load_tester
+from api_analyzer import LatencySLO, analyze_run_health
+from curl_parser import parse_curl_command
+from load_tester import MAX_QUEUED_PER_WORKER, LoadPlan, LoadStats, run_load_test_sync
+from response_model import ExecutionResult, ResponseTiming
+
+def _plan(url: str, **options) -> LoadPlan:
+    return LoadPlan(request_data=parse_curl_command(f"curl {url}"), **options)
+
+def test_plan_needs_an_end():
+    with pytest.raises(ValueError):
+        run_load_test_sync(_plan("http://x.test", duration=None))
+
+def test_plan_round_trips_and_splits():
+    plan = _plan("http://x.test", concurrency=5, total_requests=11, rate=10.0, variables={"a": "1"})
+    assert LoadPlan.from_dict(plan.to_dict()) == plan
+    shares = plan.split(2)
+    assert [share.concurrency for share in shares] == [3, 2]
+    assert sum(share.total_requests for share in shares) == 11
+    assert sum(share.rate for share in shares) == pytest.approx(10.0)
+
+def test_closed_loop_sends_total_requests(http_server):
+    stats = run_load_test_sync(_plan(f"{http_server}/echo", concurrency=3, total_requests=9, duration=None))
+    summary = stats.summary()
+    assert summary["requests"] == 9
+    assert summary["status_counts"] == {"200": 9}
+    assert summary["corrected_latency_ms"] is None
+
+def test_open_loop_records_corrected_latency(http_server):
+    stats = run_load_test_sync(_plan(f"{http_server}/echo", concurrency=2, rate=50.0, duration=0.2))
+    assert stats.requests == 10
+    assert stats.corrected_latency.total_count == 10
+    assert stats.dropped == 0
+
+def test_open_loop_drops_sends_past_the_in_flight_cap(http_server):
+    # 200 req/s against a 200 ms endpoint with one worker: almost everything is over the cap
+    stats = run_load_test_sync(_plan(f"{http_server}/slow", concurrency=1, rate=200.0, total_requests=40))
+    assert stats.dropped > 0
+    assert stats.requests + stats.dropped == 40
+    assert stats.requests >= MAX_QUEUED_PER_WORKER
+
+def test_dropped_sends_count_as_failures(monkeypatch):
+    def _slow_execute(request_data, environment="default"):
+        time.sleep(0.1)
+        return ExecutionResult(200, 0, True, ResponseTiming(total_time=100_000_000))
+
+    monkeypatch.setattr(load_tester, "execute_request", _slow_execute)
+    stats = run_load_test_sync(_plan("http://x.test", concurrency=1, rate=200.0, total_requests=40))
+    summary = stats.summary()
+    assert summary["errors"] == 0 and summary["dropped"] > 0
+    assert summary["error_rate"] == pytest.approx(summary["dropped"] / 40)
+    assert summary["last_10s"]["errors"] == summary["dropped"]
+
+    health = analyze_run_health(summary, LatencySLO(99, 10_000, 0.01), offered_rate=200.0)
+    assert health["reliability"]["status"] == "poor" and not health["meets_slo"]
+    assert "dropped" in health["reliability"]["message"]
+
+def test_stats_merge_and_round_trip():
+    first, second = LoadStats(), LoadStats()
+    first.record_error(TimeoutError())
+    second.record_error(ConnectionError())
+    second.record_dropped()
+    merged = LoadStats.from_dict(first.merge(second).to_dict())
+    assert merged.requests == 2 and merged.errors == 2 and merged.dropped == 1
+    assert merged.error_types == {"TimeoutError": 1, "ConnectionError": 1}
@@ -0,0 +1,26 @@
+from curl_parser import parse_curl_command
+from load_tester import LoadPlan, LoadStats
+from load_workers import merge_stats, record_worker_failures, run_multiprocess
+
+def test_merge_stats_returns_a_new_object():
+    first, second = LoadStats(), LoadStats()
+    first.record_error(TimeoutError())
+    merged = merge_stats([first, second])
+    assert merged is not first and merged.errors == 1 and first.errors == 1
+
+def test_worker_failures_keep_their_message():
+    stats = LoadStats()
+    record_worker_failures(stats, ["OSError: too many open files"] * 2 + ["KeyError: 'url'"])
+    assert stats.error_types == {
+        "WorkerFailure: OSError: too many open files": 2,
+        "WorkerFailure: KeyError: 'url'": 1,
+    }
+
+def test_workers_split_the_budget_and_merge(http_server):
+    plan = LoadPlan(request_data=parse_curl_command(f"curl {http_server}/echo"), concurrency=4,
+                    total_requests=20, duration=None)
+    snapshots = []
+    stats = run_multiprocess(plan, processes=2, on_progress=snapshots.append, snapshot_interval=0.05)
+    assert stats.requests == 20
+    assert stats.status_counts == {"200": 20}
+    assert stats.latency.total_count == 20
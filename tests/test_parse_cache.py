@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from parse_cache import ParseCache
+
+def test_repeated_commands_hit_the_cache():
+    cache = ParseCache()
+    first = cache.parse("curl  http://a.test/x")
+    assert cache.parse("curl http://a.test/x") is first
+    assert cache.analyze("curl http://a.test/x") is cache.analyze("curl http://a.test/x")
+    stats = cache.stats()
+    assert stats["misses"] == 2 and stats["hits"] == 4
+    assert stats["entries"] == 2
+
+def test_parse_errors_are_not_cached():
+    cache = ParseCache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.parse("wget http://a.test")
+    assert cache.stats()["entries"] == 0 and cache.stats()["misses"] == 2
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ParseCache(max_entries=2)
+    cache.parse("curl http://a.test/1")
+    cache.parse("curl http://a.test/2")
+    cache.parse("curl http://a.test/1")
+    cache.parse("curl http://a.test/3")
+    assert cache.stats()["evictions"] == 1
+    cache.parse("curl http://a.test/1")
+    assert cache.stats()["hits"] == 2
+
+def test_file_backed_requests_are_recomputed_when_the_file_changes(tmp_path):
+    body = tmp_path / "body.json"
+    body.write_text('{"a": 1}')
+    cache = ParseCache()
+    command = f"curl --data-binary @{body} http://a.test"
+    first = cache.parse(command)
+    assert cache.parse(command) is first
+
+    body.write_text('{"a": 22}')
+    stat = os.stat(body)
+    os.utime(body, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = cache.parse(command)
+    assert second is not first
+    assert cache.stats()["stale"] == 1
+    assert cache.parse(command) is second
+
+def test_clear_empties_the_cache():
+    cache = ParseCache()
+    cache.parse("curl http://a.test")
+    cache.clear()
+    assert cache.stats()["entries"] == 0
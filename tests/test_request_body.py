@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from compiled_request import CompiledRequest
+from curl_parser import parse_curl_command
+from request_body import FileBody, body_source
+
+@pytest.fixture
+def body_file(tmp_path):
+    path = tmp_path / "body.txt"
+    path.write_bytes(b"line one\r\nline two\n")
+    return path
+
+def test_file_body_strips_newlines_lazily(body_file):
+    body = FileBody(str(body_file), strip_newlines=True, chunk_size=4)
+    assert body.file_size == 19
+    assert len(body) == 16
+    assert b"".join(body) == b"line oneline two"
+    assert body.head(6) == b"line o"
+    assert FileBody.from_dict(body.to_dict()).strip_newlines
+
+def test_empty_file_is_still_a_body(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    assert FileBody(str(path))
+    assert FileBody(str(path)).head(10) == b""
+
+def test_read_all_refuses_large_files(body_file):
+    with pytest.raises(ValueError):
+        FileBody(str(body_file)).read_all(max_bytes=4)
+
+def test_data_file_reference_is_not_read(body_file):
+    request = parse_curl_command(f"curl -d @{body_file} http://x.test")
+    assert request["data"] is None
+    assert body_source(request).path == str(body_file)
+
+def test_mixed_data_parts_inline_the_file(body_file):
+    request = parse_curl_command(f"curl -d a=1 -d @{body_file} http://x.test")
+    assert request["data"] == "a=1&line oneline two"
+    assert request["options"]["data_files"] == [str(body_file)]
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://x.test/up/", "http://x.test/up/body.txt"),
+    ("http://x.test/up/?x=1", "http://x.test/up/body.txt?x=1"),
+    ("http://x.test/up/#frag", "http://x.test/up/body.txt#frag"),
+    ("http://x.test", "http://x.test/body.txt"),
+    ("http://x.test/up/name.bin?x=1", "http://x.test/up/name.bin?x=1"),
+])
+def test_upload_to_a_directory_url_appends_the_file_name(body_file, url, expected):
+    request = parse_curl_command(f"curl -T {body_file} '{url}'")
+    assert request["method"] == "PUT"
+    assert request["url"] == expected
+
+def test_upload_streams_the_file(body_file, http_server):
+    request = parse_curl_command(f"curl -T {body_file} '{http_server}/up/?x=1'")
+    echoed = json.loads(CompiledRequest(request).send().content)
+    assert echoed["method"] == "PUT"
+    assert echoed["path"] == "/up/body.txt?x=1"
+    assert echoed["body"] == "line one\r\nline two\n"
+
+def test_missing_or_stdin_files_are_rejected():
+    for command in ("curl -d @/nonexistent/file http://x.test", "curl -T - http://x.test"):
+        with pytest.raises(ValueError):
+            parse_curl_command(command)
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from response_body import BodyTooLarge, ResponseBody, TransferTimeout, paced_chunks
+
+class FakeResponse:
+    """Stands in for a streamed requests.Response."""
+
+    def __init__(self, chunks, fail_after=None, delay=0.0):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.delay = delay
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for index, chunk in enumerate(self.chunks):
+            if index == self.fail_after:
+                raise ConnectionError("connection reset")
+            time.sleep(self.delay)
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+def test_small_body_stays_in_memory():
+    body = ResponseBody.download(FakeResponse([b"ab", b"cd"]))
+    assert body.read() == b"abcd" and not body.spilled
+    assert body.stats()["size_bytes"] == 4
+    assert bytes(body.detach()) == b"abcd"
+
+def test_large_body_spills_to_disk():
+    body = ResponseBody.download(FakeResponse([b"x" * 10] * 5), spool_threshold=25)
+    assert body.spilled
+    assert b"".join(body.iter_chunks(7)) == b"x" * 50
+    assert body.read(3) == b"xxx"
+    body.close()
+
+def test_truncation_closes_the_response():
+    response = FakeResponse([b"x" * 10] * 5)
+    body = ResponseBody.download(response, max_bytes=25)
+    assert body.truncated and body.size == 25 and response.closed
+
+    with pytest.raises(BodyTooLarge):
+        ResponseBody.download(FakeResponse([b"x" * 10] * 5), max_bytes=25, truncate=False)
+
+def test_failed_read_closes_the_spill_file_and_the_response(monkeypatch):
+    created = []
+    original = ResponseBody.close
+
+    def _track_close(self):
+        created.append(self._file)
+        original(self)
+
+    monkeypatch.setattr(ResponseBody, "close", _track_close)
+    response = FakeResponse([b"x" * 10] * 5, fail_after=3)
+    with pytest.raises(ConnectionError):
+        ResponseBody.download(response, spool_threshold=15)
+    assert response.closed
+    assert created and created[0].closed
+
+def test_deadline_raises_transfer_timeout_and_closes():
+    response = FakeResponse([b"x"] * 3)
+    with pytest.raises(TransferTimeout):
+        ResponseBody.download(response, deadline_ns=time.perf_counter_ns() - 1)
+    assert response.closed
+
+def test_rate_limit_paces_the_transfer():
+    start = time.perf_counter()
+    received = b"".join(paced_chunks(FakeResponse([b"x" * 1024] * 4), 1024, rate_limit=20 * 1024))
+    assert len(received) == 4096
+    assert time.perf_counter() - start >= 0.15
+
+def test_low_speed_aborts_a_slow_transfer():
+    response = FakeResponse([b"x"] * 10, delay=0.02)
+    with pytest.raises(TransferTimeout, match="too slow"):
+        b"".join(paced_chunks(response, low_speed=(1000, 0.05)))
+    assert response.closed
+    fast = FakeResponse([b"x" * 1000] * 10, delay=0.01)
+    assert len(b"".join(paced_chunks(fast, low_speed=(1000, 0.05)))) == 10_000
@@ -0,0 +1,68 @@
+import json
+
+from response_model import RETAINED_PREVIEW_BYTES, ResponseResult, ResponseTiming
+
+def _result(raw: bytes, content_type: str = "application/json") -> ResponseResult:
+    return ResponseResult(
+        status_code=200, reason="OK", headers={"Content-Type": content_type}, content_type=content_type,
+        encoding="utf-8", raw_bytes=raw, size_bytes=len(raw), body={"size": len(raw), "preview_only": False},
+        timing=ResponseTiming(total_time=2_500_000), server_time_ns=0, performance={}, redirect_count=0,
+        final_url="http://x.test", cookies={}, security_analysis={}
+    )
+
+def test_timing_from_phases_keeps_integer_nanoseconds():
+    timing = ResponseTiming.from_phases({"dns_lookup": 1_500_000, "tcp_connect": 2_000_000}, total_time=9_000_000)
+    assert timing.dns_lookup == 1_500_000 and timing.total_time == 9_000_000
+    assert timing.tls_handshake is None
+    assert timing.ms("dns_lookup") == 1.5 and timing.ms("tls_handshake") == 0
+    assert timing.to_dict()["tcp_connect"] == 2_000_000
+
+def test_to_dict_is_json_serializable():
+    data = _result(b'{"a": 1}').to_dict()
+    assert "raw_bytes" not in data and "_views" not in data
+    assert data["text"] == '{"a": 1}'
+    assert data["timing"]["total_time"] == 2_500_000
+    json.dumps(data)
+
+def test_views_are_memoized():
+    result = _result(b'{"b": 1, "a": [1, 2]}')
+    assert result.is_json and result.is_success
+    assert result.json is result.json
+    assert result.content == {"b": 1, "a": [1, 2]}
+    assert result.total_ms == 2.5
+
+def test_xml_views():
+    result = _result(b"<root><item/><item/></root>", "application/xml")
+    assert result.is_xml
+    assert result.xml_tree.tag == "root"
+    assert result.xml_stats["element_count"] == 3
+
+def test_retained_keeps_small_bodies_whole():
+    result = _result(b'{"a": 1}')
+    kept = result.retained()
+    assert kept.raw_bytes == result.raw_bytes
+    assert not kept.body["preview_only"]
+    assert kept.json == {"a": 1}
+
+def test_retained_cuts_large_bodies_to_a_preview():
+    raw = b'{"data": "' + b"x" * (RETAINED_PREVIEW_BYTES * 4) + b'"}'
+    result = _result(bytearray(raw))
+    kept = result.retained()
+    assert len(kept.raw_bytes) == RETAINED_PREVIEW_BYTES
+    assert isinstance(kept.raw_bytes, bytes)
+    assert kept.body["preview_only"] and kept.size_bytes == len(raw)
+    assert kept.pretty_text == kept.text
+    assert not result.body["preview_only"]
+
+def test_body_is_not_parsed_until_asked_for():
+    result = _result(b'{"a": 1}')
+    assert result._views == {}
+    assert result.is_success and result.total_ms == 2.5
+    assert result._views == {}
+    assert list(result.iter_pretty_lines()) == ["{", '  "a": 1', "}"]
+    assert "json" not in result._views
+
+def test_invalid_json_falls_back_to_text():
+    result = _result(b'{"a": ')
+    assert result.pretty_text == '{"a": '
+    assert result.content == '{"a": '
@@ -0,0 +1,81 @@
+import pytest
+
+import saturation_finder
+from api_analyzer import LatencySLO, analyze_run_health
+from curl_parser import parse_curl_command
+from load_tester import LoadPlan, LoadStats
+from response_model import ExecutionResult, ResponseTiming
+from saturation_finder import find_saturation
+
+KNEE_RATE = 100.0
+
+class _FakeStats:
+    """Summary of a target that meets a 200ms p99 up to KNEE_RATE req/s and collapses after."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    def summary(self):
+        latency = 50.0 if self.rate <= KNEE_RATE else 900.0
+        return {
+            'latency_ms': {'p50': latency, 'p99': latency},
+            'corrected_latency_ms': {'p50': latency, 'p99': latency},
+            'error_rate': 0.0,
+            'throughput_rps': self.rate,
+        }
+
+@pytest.fixture
+def plans(monkeypatch):
+    seen = []
+
+    def _run(plan):
+        seen.append(plan)
+        return _FakeStats(plan.rate)
+
+    monkeypatch.setattr(saturation_finder, "run_load_test_sync", _run)
+    return seen
+
+def _base_plan() -> LoadPlan:
+    return LoadPlan(request_data=parse_curl_command("curl http://x.test"), total_requests=5)
+
+def test_search_brackets_the_knee(plans):
+    slo = LatencySLO(percentile=99, max_latency_ms=200)
+    steps = []
+    result = find_saturation(_base_plan(), slo, start_rate=10, step_duration=1, search_steps=10, on_step=steps.append)
+    assert result['max_sustainable_rate'] <= KNEE_RATE < result['knee_rate']
+    assert result['knee_rate'] - result['max_sustainable_rate'] <= max(1.0, KNEE_RATE * 0.02)
+    assert [step['rate'] for step in steps[:5]] == [10, 20, 40, 80, 160]
+    assert all(plan.duration == 1 and plan.total_requests is None for plan in plans)
+    assert [point['rate'] for point in result['curve']] == sorted(point['rate'] for point in result['curve'])
+
+def test_reaching_max_rate_without_a_knee(plans):
+    result = find_saturation(_base_plan(), LatencySLO(max_latency_ms=200), start_rate=10, max_rate=50, step_duration=1)
+    assert result['reached_max_rate'] and result['knee_rate'] is None
+    assert result['max_sustainable_rate'] == 50
+
+def test_invalid_search_parameters():
+    with pytest.raises(ValueError):
+        find_saturation(_base_plan(), LatencySLO(), start_rate=0)
+    with pytest.raises(ValueError):
+        find_saturation(_base_plan(), LatencySLO(), growth=1)
+
+def test_run_health_checks_throughput_against_the_offered_rate():
+    summary = _FakeStats(50).summary()
+    assert analyze_run_health(summary, LatencySLO(max_latency_ms=200), offered_rate=50)['meets_slo']
+    assert not analyze_run_health(summary, LatencySLO(max_latency_ms=200), offered_rate=100)['meets_slo']
+    with pytest.raises(ValueError):
+        analyze_run_health(summary, LatencySLO(percentile=95))
+
+def test_dropped_sends_fail_a_step(monkeypatch):
+    def _run(plan):
+        stats = LoadStats()
+        for _ in range(int(plan.rate)):
+            stats.record_result(ExecutionResult(200, 0, True, ResponseTiming(total_time=5_000_000)), 5_000_000)
+        if plan.rate > KNEE_RATE:
+            stats.record_dropped()   # Latency and throughput still look fine
+        stats.elapsed = 1.0
+        return stats
+
+    monkeypatch.setattr(saturation_finder, "run_load_test_sync", _run)
+    result = find_saturation(_base_plan(), LatencySLO(max_latency_ms=200), start_rate=10, step_duration=1)
+    assert result['max_sustainable_rate'] <= KNEE_RATE < result['knee_rate']
@@ -0,0 +1,57 @@
+import socket
+import threading
+
+from connection_pool import ConnectionPoolManager
+from timing_engine import (
+    ConnectionOverrides, PhaseTimer, connection_overrides, current_timer, keepalive_options,
+    parse_resolve, record_phases
+)
+
+def test_phase_timer_accumulates():
+    timer = PhaseTimer()
+    timer.add("dns_lookup", 1_000_000)
+    timer.add("dns_lookup", 500_000)
+    timer.add("tcp_connect", -5)
+    assert timer.phases == {"dns_lookup": 1_500_000, "tcp_connect": 0}
+    assert timer.as_ms()["dns_lookup"] == 1.5
+    assert timer.connection_reused
+
+def test_timers_are_per_thread():
+    seen = []
+    with record_phases() as timer:
+        thread = threading.Thread(target=lambda: seen.append(current_timer()))
+        thread.start()
+        thread.join()
+        assert current_timer() is timer
+    assert seen == [None]
+    assert current_timer() is None
+
+def test_parse_resolve():
+    assert parse_resolve(["Example.com:443:127.0.0.1, 127.0.0.2", "[::1]:80:[::1]"]) == {
+        ("example.com", 443): ["127.0.0.1", "127.0.0.2"],
+        ("::1", 80): ["::1"],
+    }
+
+def test_keepalive_options():
+    assert keepalive_options(None) == []
+    assert keepalive_options(None, disabled=True) == [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 0)]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in keepalive_options(30)
+
+def test_phases_are_recorded_for_new_and_reused_connections(http_server):
+    session = ConnectionPoolManager().acquire(http_server).session
+    with record_phases() as first:
+        session.get(f"{http_server}/echo").content
+    assert first.new_connections == 1
+    assert first.phases["tcp_connect"] > 0 and first.phases["time_to_first_byte"] > 0
+    with record_phases() as second:
+        session.get(f"{http_server}/echo").content
+    assert second.connection_reused and "tcp_connect" not in second.phases
+
+def test_resolve_pins_the_address(http_server):
+    port = int(http_server.rsplit(":", 1)[1])
+    session = ConnectionPoolManager().acquire(f"http://pinned.invalid:{port}", variant="pinned").session
+    overrides = ConnectionOverrides(parse_resolve([f"pinned.invalid:{port}:127.0.0.1"]))
+    with record_phases(), connection_overrides(overrides):
+        response = session.get(f"http://pinned.invalid:{port}/echo")
+    assert response.status_code == 200
+    assert response.json()["headers"]["Host"] == f"pinned.invalid:{port}"
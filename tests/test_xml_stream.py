@@ -0,0 +1,48 @@
+import xml.etree.ElementTree as ElementTree
+import xml.sax
+
+import pytest
+
+from xml_stream import analyze_xml, iter_pretty_xml, looks_like_xml
+
+DOCUMENT = (b'<?xml version="1.0"?><!-- feed --><ns:feed xmlns:ns="urn:x" xmlns="urn:d">'
+            b'<item id="1" kind="a &amp; b">one</item><item id="2"/><group><item>two</item></group></ns:feed>')
+
+def test_looks_like_xml():
+    assert looks_like_xml(b"\xef\xbb\xbf<?xml version='1.0'?><a/>")
+    assert looks_like_xml("  <root/>")
+    assert not looks_like_xml(b"<!DOCTYPE html><html></html>")
+    assert not looks_like_xml(b'{"a": 1}')
+
+def test_iter_pretty_xml_indents_elements():
+    assert list(iter_pretty_xml(DOCUMENT)) == [
+        '<?xml version="1.0" ?>',
+        "<!-- feed -->",
+        '<ns:feed xmlns:ns="urn:x" xmlns="urn:d">',
+        '  <item id="1" kind="a &amp; b">one</item>',
+        '  <item id="2"/>',
+        "  <group>",
+        "    <item>two</item>",
+        "  </group>",
+        "</ns:feed>",
+    ]
+
+def test_iter_pretty_xml_is_independent_of_chunk_size():
+    assert list(iter_pretty_xml(DOCUMENT, chunk_size=7)) == list(iter_pretty_xml(DOCUMENT))
+
+def test_iter_pretty_xml_rejects_malformed_documents():
+    with pytest.raises(xml.sax.SAXParseException):
+        list(iter_pretty_xml(b"<a><b></a>"))
+
+def test_analyze_xml_counts_in_one_pass():
+    stats = analyze_xml(DOCUMENT, chunk_size=5)
+    assert stats["root"] == "{urn:x}feed"
+    assert stats["element_count"] == 5
+    assert stats["max_depth"] == 3
+    assert stats["attribute_count"] == 3
+    assert stats["text_chars"] == 6
+    assert stats["namespaces"] == {"ns": "urn:x", "(default)": "urn:d"}
+
+def test_analyze_xml_rejects_malformed_documents():
+    with pytest.raises(ElementTree.ParseError):
+        analyze_xml(b"<a><b></a>")
@@ -0,0 +1,314 @@
+import ipaddress
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from dns_cache import get_dns_cache
+
+PHASES = (
+    "dns_lookup",
+    "tcp_connect",
+    "tls_handshake",
+    "request_write",
+    "time_to_first_byte",
+    "content_transfer",
+)
+
+class PhaseTimer:
+    """
+    Collects per-phase durations (in nanoseconds) for a single analyzed request.
+    Durations accumulate, so a request that follows redirects reports the sum over all hops.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, int] = {}
+        self.new_connections = 0
+        self.dns_cached = False
+
+    def add(self, phase: str, duration_ns: int):
+        self.phases[phase] = self.phases.get(phase, 0) + max(0, duration_ns)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block as the given phase."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter_ns() - start)
+
+    @property
+    def connection_reused(self) -> bool:
+        return self.new_connections == 0
+
+    def as_ms(self) -> Dict[str, float]:
+        """Phase durations converted to milliseconds."""
+        return {phase: ns / 1_000_000 for phase, ns in self.phases.items()}
+
+_local = threading.local()
+
+def current_timer() -> Optional[PhaseTimer]:
+    """Return the timer recording for the current thread, if any."""
+    return getattr(_local, "timer", None)
+
+@contextmanager
+def record_phases() -> Iterator[PhaseTimer]:
+    """Record connection lifecycle phases for requests issued by this thread."""
+    previous = current_timer()
+    timer = PhaseTimer()
+    _local.timer = timer
+    try:
+        yield timer
+    finally:
+        _local.timer = previous
+
+class ConnectionOverrides:
+    """
+    Per-request connection settings: pinned addresses (curl --resolve), substituted
+    targets (--connect-to), the address family (-4/-6), the local address (--interface)
+    and extra socket options.
+    """
+    __slots__ = ("resolve", "socket_options", "connect_to", "family", "source_address")
+
+    def __init__(self, resolve: Optional[Dict[Tuple[str, int], List[str]]] = None,
+                 socket_options: Optional[List[tuple]] = None,
+                 connect_to: Optional[Dict[Tuple[str, int], Tuple[str, int]]] = None,
+                 family: Optional[int] = None,
+                 source_address: Optional[Tuple[str, int]] = None):
+        self.resolve = resolve or {}
+        self.socket_options = socket_options or []
+        self.connect_to = connect_to or {}
+        self.family = family
+        self.source_address = source_address
+
+    def target(self, host: str, port: int) -> Tuple[str, int]:
+        """Where to connect for ``host:port``; an empty host or port 0 in an entry matches any."""
+        for key in ((host, port), (host, 0), ("", port), ("", 0)):
+            if key in self.connect_to:
+                to_host, to_port = self.connect_to[key]
+                return to_host or host, to_port or port
+        return host, port
+
+def current_overrides() -> Optional[ConnectionOverrides]:
+    """Return the connection overrides active on the current thread, if any."""
+    return getattr(_local, "overrides", None)
+
+@contextmanager
+def connection_overrides(overrides: Optional[ConnectionOverrides]) -> Iterator[None]:
+    """Apply connection overrides to connections opened by this thread."""
+    previous = current_overrides()
+    _local.overrides = overrides
+    try:
+        yield
+    finally:
+        _local.overrides = previous
+
+def parse_resolve(entries: Iterable[str]) -> Dict[Tuple[str, int], List[str]]:
+    """Parse curl ``--resolve host:port:address[,address]`` entries."""
+    pinned = {}
+    for entry in entries:
+        if entry.startswith("["):
+            # Bracketed IPv6 host: [::1]:443:address
+            host, _, rest = entry[1:].partition("]:")
+            port, _, addresses = rest.partition(":")
+        else:
+            host, port, addresses = entry.split(":", 2)
+        pinned[(host.lower(), int(port))] = [
+            address.strip().strip("[]") for address in addresses.split(",") if address.strip()
+        ]
+    return pinned
+
+def _split_host(text: str) -> Tuple[str, str]:
+    """Split ``host:rest``, where the host may be a bracketed IPv6 address."""
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]:")
+    else:
+        host, _, rest = text.partition(":")
+    return host, rest
+
+def parse_connect_to(entries: Iterable[str]) -> Dict[Tuple[str, int], Tuple[str, int]]:
+    """
+    Parse curl ``--connect-to host:port:connect_host:connect_port`` entries. Empty fields
+    are wildcards on the left and keep the original host or port on the right.
+    """
+    targets = {}
+    for entry in entries:
+        host, rest = _split_host(entry)
+        port, _, rest = rest.partition(":")
+        to_host, to_port = _split_host(rest)
+        try:
+            targets[(host.lower(), int(port or 0))] = (to_host, int(to_port or 0))
+        except ValueError:
+            raise ValueError(f"Invalid --connect-to entry: {entry}")
+    return targets
+
+def interface_options(interface: Optional[str]) -> Tuple[Optional[Tuple[str, int]], List[tuple]]:
+    """
+    Source address, or device binding socket options, for curl ``--interface``: an IP
+    address (``host!`` names are resolved when binding) or a network interface name.
+    """
+    if not interface:
+        return None, []
+    name = interface.partition("!")[2] if interface.startswith(("if!", "host!")) else interface
+    address = name.strip("[]")
+    try:
+        ipaddress.ip_address(address)
+        return (address, 0), []
+    except ValueError:
+        pass
+    if interface.startswith("host!"):
+        return (address, 0), []
+    if not hasattr(socket, "SO_BINDTODEVICE"):
+        raise ValueError(f"Binding to interface '{name}' is not supported on this platform")
+    return None, [(socket.SOL_SOCKET, socket.SO_BINDTODEVICE, name.encode())]
+
+def keepalive_options(idle_seconds: Optional[int], disabled: bool = False) -> List[tuple]:
+    """Socket options for TCP keepalive probes (curl --keepalive-time / --no-keepalive)."""
+    if disabled:
+        return [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 0)]
+    if idle_seconds is None:
+        return []
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    idle = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+    if idle is not None:
+        options.append((socket.IPPROTO_TCP, idle, idle_seconds))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle_seconds))
+    return options
+
+def _pinned_addrinfo(addresses: List[str], port: int) -> List[Tuple]:
+    infos = []
+    for address in addresses:
+        infos.extend(socket.getaddrinfo(address, port, type=socket.SOCK_STREAM, flags=socket.AI_NUMERICHOST))
+    return infos
+
+def _connect_first(addresses: List[Tuple], timeout, source_address, socket_options) -> socket.socket:
+    """Connect to the first reachable address, mirroring urllib3's create_connection."""
+    err = None
+    for af, socktype, proto, _, sockaddr in addresses:
+        sock = None
+        try:
+            sock = socket.socket(af, socktype, proto)
+            for opt in socket_options or []:
+                sock.setsockopt(*opt)
+            sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            err = e
+            if sock is not None:
+                sock.close()
+    if err is not None:
+        raise err
+    raise OSError("getaddrinfo returns an empty list")
+
+class TimedConnectionMixin:
+    """
+    Splits urllib3's connection setup into separately timed DNS, TCP and TLS phases and
+    records request write and time-to-first-byte for every request on the connection.
+    Name resolution goes through the shared DNS cache, so it happens (and is timed) once,
+    unless the active ConnectionOverrides pin the host to fixed addresses.
+    """
+
+    _connect_ns = 0
+    _socket_ns = 0
+    _write_done_ns = 0
+
+    def _new_conn(self) -> socket.socket:
+        timer = current_timer()
+        overrides = current_overrides()
+        host, port = self._dns_host.strip("[]").lower(), self.port
+        family, source_address = allowed_gai_family(), self.source_address
+        socket_options = list(self.socket_options or [])
+        if overrides:
+            host, port = overrides.target(host, port)
+            family = overrides.family or family
+            source_address = overrides.source_address or source_address
+            socket_options += overrides.socket_options
+        pinned = overrides.resolve.get((host.lower(), port)) if overrides else None
+        start = time.perf_counter_ns()
+        try:
+            if pinned:
+                addresses, cached = _pinned_addrinfo(pinned, port), True
+            else:
+                addresses, cached = get_dns_cache().lookup(host, port, family)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter_ns()
+        try:
+            sock = _connect_first(addresses, self.timeout, source_address, socket_options)
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+        connected = time.perf_counter_ns()
+
+        self._socket_ns = connected - start
+        if timer is not None:
+            timer.add("dns_lookup", resolved - start)
+            timer.dns_cached = cached
+            timer.add("tcp_connect", connected - resolved)
+            timer.new_connections += 1
+        return sock
+
+    def connect(self) -> None:
+        self._socket_ns = 0
+        start = time.perf_counter_ns()
+        super().connect()
+        self._connect_ns = time.perf_counter_ns() - start
+        timer = current_timer()
+        if timer is not None and isinstance(self, HTTPSConnection):
+            timer.add("tls_handshake", self._connect_ns - self._socket_ns)
+
+    def request(self, method, url, body=None, headers=None, **kwargs) -> None:
+        # Plain HTTP connects lazily inside request(); keep that out of the write phase
+        self._connect_ns = 0
+        start = time.perf_counter_ns()
+        super().request(method, url, body=body, headers=headers, **kwargs)
+        self._write_done_ns = time.perf_counter_ns()
+        timer = current_timer()
+        if timer is not None:
+            timer.add("request_write", self._write_done_ns - start - self._connect_ns)
+
+    def getresponse(self):
+        response = super().getresponse()
+        timer = current_timer()
+        if timer is not None and self._write_done_ns:
+            timer.add("time_to_first_byte", time.perf_counter_ns() - self._write_done_ns)
+        return response
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+TIMED_POOL_CLASSES = {
+    "http": TimedHTTPConnectionPool,
+    "https": TimedHTTPSConnectionPool,
+}
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report phase timings to the active PhaseTimer."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
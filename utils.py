@@ -1,21 +1,25 @@
-import json
-import xml.dom.minidom
-from typing import Union, Any, Dict
+import json_codec
+import xml_stream
+from header_rules import RESPONSE, SECURITY, get_analysis_cache, get_rule_set
+from typing import Union, Any, Dict, Optional
 
 def format_data(data: Any, content_type: str) -> str:
     """
     Format data based on content type with enhanced formatting.
+    Analyzed responses are formatted from their memoized views instead of being re-parsed.
     """
+    if hasattr(data, 'pretty_text'):
+        return data.pretty_text
     if isinstance(data, str):
         if 'application/json' in content_type:
             try:
-                parsed = json.loads(data)
-                return json.dumps(parsed, indent=2, sort_keys=True)
+                parsed = json_codec.loads(data)
+                return json_codec.dumps(parsed, indent=True, sort_keys=True)
             except:
                 return data
         elif 'application/xml' in content_type or 'text/xml' in content_type:
             try:
-                return xml.dom.minidom.parseString(data).toprettyxml(indent="  ")
+                return "\n".join(xml_stream.iter_pretty_xml(data.encode()))
             except:
                 return data
         elif 'text/html' in content_type:
@@ -26,14 +30,19 @@ def format_data(data: Any, content_type: str) -> str:
                 return data
         return data
     elif isinstance(data, (dict, list)):
-        return json.dumps(data, indent=2, sort_keys=True)
+        return json_codec.dumps(data, indent=True, sort_keys=True)
     return str(data)
 
 def calculate_size(content: bytes) -> str:
     """
     Calculate human-readable size of content.
     """
-    size_bytes = len(content)
+    return format_size(len(content))
+
+def format_size(size_bytes: float) -> str:
+    """
+    Format a byte count as a human-readable size.
+    """
     for unit in ['B', 'KB', 'MB', 'GB']:
         if size_bytes < 1024:
             return f"{size_bytes:.2f} {unit}"
@@ -42,34 +51,19 @@ def calculate_size(content: bytes) -> str:
 
 def analyze_security_headers(headers: Dict[str, str]) -> Dict[str, Dict[str, Union[bool, str]]]:
     """
-    Analyze security-related headers in the response.
+    Analyze security-related headers in the response, whatever their capitalization.
+    Results are memoized per header set and shared, so treat them as read-only.
+    """
+    return get_analysis_cache().analyze("response_security", headers, _evaluate_security_headers)
+
+def _evaluate_security_headers(headers: Dict[str, str]) -> Dict[str, Dict[str, Union[bool, str]]]:
+    evaluation = get_rule_set().evaluate(headers, RESPONSE)
+    return {result['label']: result for result in evaluation.group(SECURITY).values()}
+
+def format_duration(duration_ns: Optional[int]) -> Optional[str]:
+    """
+    Format a nanosecond duration as milliseconds for display.
     """
-    security_headers = {
-        'Content-Security-Policy': {
-            'present': False,
-            'description': 'Helps prevent XSS attacks'
-        },
-        'X-Content-Type-Options': {
-            'present': False,
-            'description': 'Prevents MIME-type sniffing'
-        },
-        'X-Frame-Options': {
-            'present': False,
-            'description': 'Prevents clickjacking attacks'
-        },
-        'Strict-Transport-Security': {
-            'present': False,
-            'description': 'Enforces HTTPS connections'
-        },
-        'X-XSS-Protection': {
-            'present': False,
-            'description': 'Provides XSS filtering'
-        }
-    }
-    
-    for header in security_headers:
-        if header in headers:
-            security_headers[header]['present'] = True
-            security_headers[header]['value'] = headers[header]
-            
-    return security_headers
+    if duration_ns is None:
+        return None
+    return f"{duration_ns / 1_000_000:.2f}ms"
@@ -0,0 +1,149 @@
+import re
+import xml.sax
+import xml.sax.handler
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Dict, Iterator, List, Optional, Union
+from xml.sax.saxutils import escape, quoteattr
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 512
+
+XMLInput = Union[bytes, bytearray, memoryview]
+
+_XML_START = re.compile(rb'\s*(?:<\?xml|<!DOCTYPE|<!--|<[A-Za-z_])')
+_HTML_START = re.compile(rb'\s*(?:<!DOCTYPE\s+html|<html)', re.IGNORECASE)
+
+def looks_like_xml(data: Union[str, XMLInput]) -> bool:
+    """Tell XML from other bodies by its leading bytes, without parsing it."""
+    head = data[:SNIFF_BYTES]
+    if isinstance(head, str):
+        head = head.encode("utf-8", errors="replace")
+    head = bytes(head).removeprefix(b"\xef\xbb\xbf")
+    return bool(_XML_START.match(head)) and not _HTML_START.match(head)
+
+def _chunks(data: XMLInput, chunk_size: int) -> Iterator[bytes]:
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size].tobytes()
+
+class _PrettyPrinter(xml.sax.handler.ContentHandler, xml.sax.handler.LexicalHandler):
+    """SAX handler that turns parse events into indented lines."""
+
+    def __init__(self, indent: int):
+        super().__init__()
+        self.pad = " " * indent
+        self.lines: List[str] = []
+        self.depth = 0
+        self._pending: Optional[str] = None   # Start tag not yet known to have children
+        self._text: List[str] = []
+
+    def _take_text(self) -> str:
+        text = "".join(self._text).strip()
+        self._text = []
+        return text
+
+    def _open_pending(self):
+        if self._pending is not None:
+            self.lines.append(self.pad * (self.depth - 1) + self._pending)
+            self._pending = None
+
+    def _flush(self):
+        text = self._take_text()
+        self._open_pending()
+        if text:
+            self.lines.append(self.pad * self.depth + escape(text))
+
+    def startElement(self, name, attrs):
+        self._flush()
+        attributes = "".join(f" {key}={quoteattr(value)}" for key, value in attrs.items())
+        self._pending = f"<{name}{attributes}>"
+        self.depth += 1
+
+    def endElement(self, name):
+        text = self._take_text()
+        self.depth -= 1
+        if self._pending is not None:
+            closing = f"{escape(text)}</{name}>" if text else None
+            line = self._pending + closing if closing else self._pending[:-1] + "/>"
+            self.lines.append(self.pad * self.depth + line)
+            self._pending = None
+        else:
+            if text:
+                self.lines.append(self.pad * (self.depth + 1) + escape(text))
+            self.lines.append(self.pad * self.depth + f"</{name}>")
+
+    def characters(self, content):
+        self._text.append(content)
+
+    def processingInstruction(self, target, data):
+        self._flush()
+        self.lines.append(self.pad * self.depth + f"<?{target} {data}?>")
+
+    def comment(self, content):
+        self._flush()
+        self.lines.append(self.pad * self.depth + f"<!--{content}-->")
+
+def iter_pretty_xml(data: XMLInput, indent: int = 2,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Pretty-print XML incrementally: the body is fed to a SAX parser chunk by chunk and
+    lines are yielded as they are produced, without building a DOM. Raises
+    xml.sax.SAXParseException when the document is not well-formed.
+    """
+    printer = _PrettyPrinter(indent)
+    parser = xml.sax.make_parser()
+    parser.setFeature(xml.sax.handler.feature_namespaces, False)
+    parser.setFeature(xml.sax.handler.feature_external_ges, False)
+    parser.setContentHandler(printer)
+    parser.setProperty(xml.sax.handler.property_lexical_handler, printer)
+
+    yield '<?xml version="1.0" ?>'
+    for chunk in _chunks(data, chunk_size):
+        parser.feed(chunk)
+        lines, printer.lines = printer.lines, []
+        yield from lines
+    parser.close()
+    yield from printer.lines
+
+def analyze_xml(data: XMLInput, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Element count, depth, attributes and namespaces of an XML document in one streaming
+    pass. Finished elements are dropped as the parse goes, so memory stays flat.
+    Raises xml.etree.ElementTree.ParseError when the document is not well-formed.
+    """
+    parser = ElementTree.XMLPullParser(events=("start", "end", "start-ns"))
+    stack: List[ElementTree.Element] = []
+    stats = {
+        'root': None,
+        'element_count': 0,
+        'max_depth': 0,
+        'attribute_count': 0,
+        'text_chars': 0,
+        'namespaces': {}
+    }
+
+    def _consume():
+        for event, item in parser.read_events():
+            if event == "start-ns":
+                prefix, uri = item
+                stats['namespaces'][prefix or "(default)"] = uri
+            elif event == "start":
+                if stats['root'] is None:
+                    stats['root'] = item.tag
+                stack.append(item)
+                stats['element_count'] += 1
+                stats['attribute_count'] += len(item.attrib)
+                stats['max_depth'] = max(stats['max_depth'], len(stack))
+            else:
+                stats['text_chars'] += len((item.text or "").strip())
+                stack.pop()
+                if stack and len(stack[-1]) and stack[-1][-1] is item:
+                    del stack[-1][-1]
+                item.clear()
+
+    for chunk in _chunks(data, chunk_size):
+        parser.feed(chunk)
+        _consume()
+    parser.close()
+    _consume()
+    return stats